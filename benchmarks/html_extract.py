@@ -0,0 +1,64 @@
+"""Benchmark `extract_html` against the regex stripper it replaced.
+
+Run from the repository root::
+
+    python -m benchmarks.html_extract [--repeat N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import timeit
+from html import unescape
+from typing import Callable, Dict
+
+from src.collect.html_extract import extract_html
+
+
+def legacy_extract(html: str) -> tuple[str, str]:
+    """The previous `_strip_tags` + `_extract_title` pair (five regex passes)."""
+
+    text = re.sub(r"<script[\s\S]*?</script>", "", html, flags=re.IGNORECASE)
+    text = re.sub(r"<style[\s\S]*?</style>", "", text, flags=re.IGNORECASE)
+    text = re.sub(r"<[^>]+>", " ", text)
+    text = re.sub(r"\s+", " ", text)
+    match = re.search(r"<title>(.*?)</title>", html, flags=re.IGNORECASE | re.DOTALL)
+    return (unescape(match.group(1)).strip() if match else ""), unescape(text).strip()
+
+
+def product_page(paragraphs: int = 400) -> str:
+    body = "".join(
+        f'<div class="item"><h2>Spec {idx}</h2><p>Battery &amp; display details for model {idx}.</p>'
+        f'<a href="https://example.com/p/{idx}#reviews">reviews</a></div>'
+        for idx in range(paragraphs)
+    )
+    scripts = "<script>var data = {a: 1, b: '<b>'};</script>" * 20
+    return f"<html><head><title>Product</title><style>p {{ color: red }}</style>{scripts}</head><body>{body}</body></html>"
+
+
+def unclosed_scripts(count: int = 2000) -> str:
+    # Every "<script" makes the lazy legacy pattern scan to the end of the page.
+    return "<title>Broken</title>" + "<script>x " * count
+
+
+PAGES: Dict[str, Callable[[], str]] = {"product_page": product_page, "unclosed_scripts": unclosed_scripts}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20, help="Extractions per timing")
+    args = parser.parse_args()
+
+    for name, build in PAGES.items():
+        html = build()
+        legacy = min(timeit.repeat(lambda: legacy_extract(html), number=args.repeat, repeat=3)) / args.repeat
+        current = min(timeit.repeat(lambda: extract_html(html), number=args.repeat, repeat=3)) / args.repeat
+        print(
+            f"{name:18} {len(html) / 1024:8.1f} KiB  legacy {legacy * 1000:8.2f} ms  "
+            f"extract_html {current * 1000:8.2f} ms  x{legacy / current:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
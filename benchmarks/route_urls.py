@@ -0,0 +1,79 @@
+"""Benchmark `route_urls_by_channel` on large channel domain lists.
+
+Run from the repository root::
+
+    python -m benchmarks.route_urls [--urls N] [--channels N] [--domains N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Dict, List, Sequence
+
+from src.collect.channel_fetchers import ChannelFetcher, route_urls_by_channel
+
+
+def legacy_route(urls: Sequence[str], fetchers: Sequence[ChannelFetcher]) -> Dict[str, List[str]]:
+    """The previous per-URL scan over every domain of every fetcher."""
+
+    mapping: Dict[str, List[str]] = {fetcher.name: [] for fetcher in fetchers}
+    default_fetcher = next((f for f in fetchers if f.is_default), fetchers[-1])
+    for url in urls:
+        target = next((f for f in fetchers if f.matches(url)), default_fetcher)
+        mapping[target.name].append(url)
+    return mapping
+
+
+def build_fetchers(channels: int, domains: int, rng: random.Random) -> List[ChannelFetcher]:
+    fetchers = [
+        ChannelFetcher(
+            name=f"channel{idx}",
+            domains=tuple(f"site{idx}-{rng.randrange(10**6)}.com" for _ in range(domains)) + (f"kw{idx}",),
+        )
+        for idx in range(channels)
+    ]
+    fetchers.append(ChannelFetcher(name="general", domains=(), is_default=True))
+    return fetchers
+
+
+def build_urls(count: int, fetchers: Sequence[ChannelFetcher], rng: random.Random) -> List[str]:
+    known = [domain for fetcher in fetchers for domain in fetcher.domains]
+    urls = []
+    for idx in range(count):
+        host = f"www.{rng.choice(known)}" if idx % 2 else f"host{idx}.example.org"
+        urls.append(f"https://{host}/item/{idx}?ref=seed")
+    return urls
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--urls", type=int, default=1_000_000, help="Seed URLs to route")
+    parser.add_argument("--channels", type=int, default=300, help="Channel fetchers")
+    parser.add_argument("--domains", type=int, default=200, help="Domains per channel")
+    parser.add_argument("--legacy-sample", type=int, default=200, help="URLs timed with the old scan")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    fetchers = build_fetchers(args.channels, args.domains, rng)
+    urls = build_urls(args.urls, fetchers, rng)
+
+    started = time.perf_counter()
+    routed = route_urls_by_channel(urls, fetchers)
+    compiled = time.perf_counter() - started
+
+    sample = urls[: args.legacy_sample]
+    started = time.perf_counter()
+    legacy = legacy_route(sample, fetchers)
+    per_url = (time.perf_counter() - started) / max(1, len(sample))
+    assert legacy == route_urls_by_channel(sample, fetchers)
+
+    matched = len(urls) - len(routed["general"])
+    print(f"{len(urls)} URLs, {args.channels} channels x {args.domains + 1} domains, {matched} matched")
+    print(f"compiled matcher  {compiled:8.2f} s")
+    print(f"legacy scan       {per_url * len(urls):8.2f} s (extrapolated from {len(sample)} URLs)")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,19 +3,26 @@ from __future__ import annotations
 import argparse
 from pathlib import Path
 
+from src.collect.adaptive import AimdSettings
+from src.collect.fetch_strategy import FETCH_ENGINES, FetchStrategy
 from src.pipeline.scheduler import build_runner
 from src.pipeline.runtime import (
     _prepare_keywords,
     _print_json,
     build_fetch_strategy,
     run_discover,
+    run_compact,
     run_fetch,
+    run_migrate,
     run_normalize,
     run_pipeline,
     run_report,
+    run_show,
     run_summarize,
 )
-from src.storage.data_store import DataStore
+from src.storage.blob_store import CODECS
+from src.storage.data_store import COLLECTIONS, STORAGE_ENGINES, open_data_store
+from src.storage.retention import RetentionPolicy
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -29,27 +36,54 @@ def build_parser() -> argparse.ArgumentParser:
     discover_parser.add_argument("--product-type", dest="product_type", help="Product type (e.g., consumer, software, b2b)")
 
     fetch_parser = subparsers.add_parser("fetch", help="Fetch URLs and store raw documents")
-    fetch_parser.add_argument("urls", nargs="+", help="URLs to fetch")
+    fetch_parser.add_argument("urls", nargs="*", help="URLs to fetch (optional with --resume)")
     fetch_parser.add_argument("--product-type", dest="product_type", help="Product type for strategy tuning")
     fetch_parser.add_argument("--user-agent", dest="user_agent", help="Custom User-Agent header")
     fetch_parser.add_argument("--timeout", type=float, help="Request timeout in seconds")
     fetch_parser.add_argument("--max-retries", type=int, help="Maximum retry attempts")
-    fetch_parser.add_argument("--delay", type=float, help="Delay between retries in seconds")
+    fetch_parser.add_argument("--delay", type=float, help="Minimum seconds between requests to one host")
+    fetch_parser.add_argument("--retry-budget", dest="retry_budget", type=int, help="Maximum retries across the whole run")
     fetch_parser.add_argument("--concurrency", type=int, default=1, help="Parallel fetch worker count")
+    fetch_parser.add_argument("--adaptive-concurrency", dest="adaptive_concurrency", action="store_true", help="Tune each channel's in-flight requests by AIMD, capped by --concurrency")
+    fetch_parser.add_argument("--fetch-engine", dest="fetch_engine", choices=FETCH_ENGINES, help="Fetch with a thread pool (default) or one asyncio loop with keep-alive connection pools")
+    fetch_parser.add_argument("--offline", action="store_true", help="Serve pages only from the on-disk response cache")
+    fetch_parser.add_argument("--resume", action="store_true", help="Finish the URLs left over by an interrupted fetch")
+    fetch_parser.add_argument("--refetch-after", dest="refetch_after", type=float, help="Skip URLs stored less than this many hours ago")
+    fetch_parser.add_argument("--blob-codec", dest="blob_codec", choices=sorted(CODECS), help="Store document bodies as compressed, content-addressed blobs")
 
     normalize_parser = subparsers.add_parser("normalize", help="Normalize stored raw documents")
     normalize_parser.add_argument("--data-dir", type=Path, default=Path("data"), help="Data directory")
+    normalize_parser.add_argument("--engine", choices=STORAGE_ENGINES, help="Storage engine (default: detected from data dir)")
+    normalize_parser.add_argument("--blob-codec", dest="blob_codec", choices=sorted(CODECS), help="Store document bodies as compressed, content-addressed blobs")
 
     summarize_parser = subparsers.add_parser("summarize", help="Summarize stored documents")
     summarize_parser.add_argument("--data-dir", type=Path, default=Path("data"), help="Data directory")
+    summarize_parser.add_argument("--engine", choices=STORAGE_ENGINES, help="Storage engine (default: detected from data dir)")
     summarize_parser.add_argument("--use-llm", action="store_true", help="Use LLM summarizer with fallback to basic")
     summarize_parser.add_argument("--llm-model", dest="llm_model", help="LLM model name for summarization")
 
     report_parser = subparsers.add_parser("report", help="Generate a Markdown report from collected data")
     report_parser.add_argument("--data-dir", type=Path, default=Path("data"), help="Data directory")
+    report_parser.add_argument("--engine", choices=STORAGE_ENGINES, help="Storage engine (default: detected from data dir)")
     report_parser.add_argument("--output", type=Path, default=Path("data/report.md"), help="Report output path")
     report_parser.add_argument("--title", type=str, default="Product Research Report", help="Report title")
 
+    migrate_parser = subparsers.add_parser("migrate", help="Migrate JSONL files in a data dir to the SQLite engine")
+    migrate_parser.add_argument("--data-dir", type=Path, default=Path("data"), help="Data directory")
+
+    show_parser = subparsers.add_parser("show", help="Print stored records for specific URLs")
+    show_parser.add_argument("urls", nargs="+", help="URLs to look up")
+    show_parser.add_argument("--data-dir", type=Path, default=Path("data"), help="Data directory")
+    show_parser.add_argument("--collection", choices=sorted(COLLECTIONS), default="normalized", help="Collection to read")
+
+    compact_parser = subparsers.add_parser("compact", help="Merge segments, drop superseded rows and rebuild indexes")
+    compact_parser.add_argument("--data-dir", type=Path, default=Path("data"), help="Data directory")
+    compact_parser.add_argument("--segmented", action="store_true", help="Convert single-file collections to segments")
+    compact_parser.add_argument("--segment-bytes", dest="segment_bytes", type=int, help="Maximum bytes per segment")
+    compact_parser.add_argument("--max-age-days", dest="max_age_days", type=float, help="Evict rows older than this many days")
+    compact_parser.add_argument("--max-docs-per-channel", dest="max_docs_per_channel", type=int, help="Keep only the newest documents of each channel")
+    compact_parser.add_argument("--max-bytes", dest="max_bytes", type=int, help="Keep only the newest rows that fit in this many bytes per collection")
+
     pipeline_parser = subparsers.add_parser("pipeline", help="Run discovery, fetch, and summarize")
     pipeline_parser.add_argument("--keywords", nargs="*", help="Keywords for discovery")
     pipeline_parser.add_argument("--keyword-brief", dest="keyword_brief", help="Optional brief to generate keywords via LLM")
@@ -58,8 +92,15 @@ def build_parser() -> argparse.ArgumentParser:
     pipeline_parser.add_argument("--user-agent", dest="user_agent", help="Custom User-Agent header")
     pipeline_parser.add_argument("--timeout", type=float, help="Request timeout in seconds")
     pipeline_parser.add_argument("--max-retries", type=int, help="Maximum retry attempts")
-    pipeline_parser.add_argument("--delay", type=float, help="Delay between retries in seconds")
+    pipeline_parser.add_argument("--delay", type=float, help="Minimum seconds between requests to one host")
+    pipeline_parser.add_argument("--retry-budget", dest="retry_budget", type=int, help="Maximum retries across the whole run")
     pipeline_parser.add_argument("--concurrency", type=int, default=1, help="Parallel fetch worker count")
+    pipeline_parser.add_argument("--adaptive-concurrency", dest="adaptive_concurrency", action="store_true", help="Tune each channel's in-flight requests by AIMD, capped by --concurrency")
+    pipeline_parser.add_argument("--fetch-engine", dest="fetch_engine", choices=FETCH_ENGINES, help="Fetch with a thread pool (default) or one asyncio loop with keep-alive connection pools")
+    pipeline_parser.add_argument("--offline", action="store_true", help="Serve pages only from the on-disk response cache")
+    pipeline_parser.add_argument("--resume", action="store_true", help="Finish an interrupted fetch instead of discovering again")
+    pipeline_parser.add_argument("--refetch-after", dest="refetch_after", type=float, help="Skip URLs stored less than this many hours ago")
+    pipeline_parser.add_argument("--blob-codec", dest="blob_codec", choices=sorted(CODECS), help="Store document bodies as compressed, content-addressed blobs")
     pipeline_parser.add_argument("--use-llm", action="store_true", help="Use LLM summarizer with fallback to basic")
     pipeline_parser.add_argument("--llm-model", dest="llm_model", help="LLM model name for keyword generation and summarization")
 
@@ -77,7 +118,20 @@ def main() -> None:
     parser = build_parser()
     args = parser.parse_args()
     data_dir = getattr(args, "data_dir", Path("data"))
-    store = DataStore(data_dir=data_dir)
+    if args.command == "migrate":
+        run_migrate(data_dir)
+        return
+    store = open_data_store(
+        data_dir,
+        engine=getattr(args, "engine", None),
+        blob_codec=getattr(args, "blob_codec", None),
+        segment_max_bytes=getattr(args, "segment_bytes", None),
+        retention=RetentionPolicy(
+            max_age_days=getattr(args, "max_age_days", None),
+            max_docs_per_channel=getattr(args, "max_docs_per_channel", None),
+            max_bytes=getattr(args, "max_bytes", None),
+        ),
+    )
     strategy = None
     if hasattr(args, "product_type"):
         strategy = build_fetch_strategy(
@@ -86,6 +140,8 @@ def main() -> None:
             getattr(args, "timeout", None),
             getattr(args, "max_retries", None),
             getattr(args, "delay", None),
+            getattr(args, "fetch_engine", None),
+            getattr(args, "retry_budget", None),
         )
 
     if args.command == "discover":
@@ -96,6 +152,8 @@ def main() -> None:
             return
         run_discover(prepared_keywords, args.product_type)
     elif args.command == "fetch":
+        if not args.urls and not args.resume:
+            parser.error("fetch needs URLs unless --resume is given")
         fetch_strategy = strategy or FetchStrategy()
         run_fetch(
             args.urls,
@@ -103,11 +161,19 @@ def main() -> None:
             fetch_strategy,
             product_type=args.product_type,
             concurrency=args.concurrency,
+            offline=args.offline,
+            resume=args.resume,
+            refetch_after_hours=args.refetch_after,
+            adaptive=AimdSettings() if args.adaptive_concurrency else None,
         )
     elif args.command == "normalize":
         run_normalize(store)
     elif args.command == "summarize":
         run_summarize(store, use_llm=args.use_llm, llm_model=getattr(args, "llm_model", None))
+    elif args.command == "show":
+        run_show(store, args.urls, args.collection)
+    elif args.command == "compact":
+        run_compact(store, segmented=args.segmented)
     elif args.command == "report":
         run_report(store, args.title, args.output)
     elif args.command == "pipeline":
@@ -122,6 +188,10 @@ def main() -> None:
             keyword_brief=getattr(args, "keyword_brief", None),
             llm_model=getattr(args, "llm_model", None),
             use_llm=args.use_llm,
+            offline=args.offline,
+            resume=args.resume,
+            refetch_after_hours=args.refetch_after,
+            adaptive=AimdSettings() if args.adaptive_concurrency else None,
         )
     elif args.command == "schedule":
         config_path = args.config
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import threading
+import time
+import urllib.error
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Callable, Deque, Dict, List, Sequence
+
+# Limit changes kept per channel for the run summary; the oldest are dropped.
+TRACE_LENGTH = 100
+
+
+def is_congestion(error: BaseException) -> bool:
+    """Whether ``error`` says the server is overloaded: a timeout, ``429`` or ``5xx``."""
+
+    if isinstance(error, urllib.error.HTTPError):
+        return error.code == 429 or error.code >= 500
+    if isinstance(error, urllib.error.URLError):
+        return isinstance(error.reason, TimeoutError)
+    return isinstance(error, TimeoutError)
+
+
+@dataclass(frozen=True)
+class AimdSettings:
+    """Tuning of the per-channel AIMD (additive increase, multiplicative decrease) limit.
+
+    Each channel starts with ``initial`` requests in flight. Every healthy
+    completion (answered within ``max_latency`` seconds while at most
+    ``max_error_rate`` of the last ``window`` requests failed) raises the limit
+    by ``increase / limit``, i.e. by ``increase`` per round of requests. A
+    timeout, ``429`` or ``5xx`` multiplies it by ``decrease``, once per burst:
+    failures of requests sent before the last cut do not cut again. The limit
+    stays within ``minimum`` and ``maximum`` (by default the run's
+    concurrency).
+    """
+
+    initial: int = 2
+    minimum: int = 1
+    maximum: int | None = None
+    increase: float = 1.0
+    decrease: float = 0.5
+    max_latency: float = 10.0
+    max_error_rate: float = 0.2
+    window: int = 20
+
+
+class _ChannelLimit:
+    def __init__(self, settings: AimdSettings, ceiling: int) -> None:
+        self.settings = settings
+        self.ceiling = max(settings.minimum, ceiling)
+        self.limit = float(min(max(settings.initial, settings.minimum), self.ceiling))
+        self.in_flight = 0
+        self.last_cut = float("-inf")
+        self.outcomes: Deque[bool] = deque(maxlen=max(1, settings.window))
+        self.trace: Deque[Dict[str, object]] = deque(maxlen=TRACE_LENGTH)
+
+    def complete(self, started: float, now: float, latency: float | None, failed: bool, congested: bool) -> str | None:
+        """Adjust the limit for one finished request; return why it moved, if it did."""
+
+        settings = self.settings
+        if congested:
+            self.outcomes.append(True)
+            if started < self.last_cut:
+                return None
+            self.last_cut = now
+            self.limit = max(float(settings.minimum), self.limit * settings.decrease)
+            return "congestion"
+        if latency is None and not failed:
+            return None  # served without a request (cache hit): says nothing about the server
+        self.outcomes.append(failed)
+        error_rate = sum(self.outcomes) / len(self.outcomes)
+        if failed or latency is None or latency > settings.max_latency or error_rate > settings.max_error_rate:
+            return None
+        self.limit = min(float(self.ceiling), self.limit + settings.increase / self.limit)
+        return "increase"
+
+
+class AdaptiveConcurrency:
+    """Per-channel in-flight limits for `fetch_jobs`, adjusted by AIMD as results arrive.
+
+    Pass one instance to a fetch run; its `summary` reports the settings and
+    the trace of limits each channel went through. Thread-safe.
+    """
+
+    def __init__(self, settings: AimdSettings | None = None, clock: Callable[[], float] = time.monotonic) -> None:
+        self.settings = settings or AimdSettings()
+        self._clock = clock
+        self._started = clock()
+        self._lock = threading.Lock()
+        self._channels: Dict[str, _ChannelLimit] = {}
+
+    def dispatcher(self, groups: Sequence[str], order: Sequence[int], concurrency: int) -> "JobDispatcher":
+        """Hand out the job positions in ``order`` within the limit of each job's group."""
+
+        return JobDispatcher(self, groups, order, self.settings.maximum or concurrency)
+
+    def now(self) -> float:
+        return self._clock()
+
+    def _channel(self, name: str, ceiling: int) -> _ChannelLimit:
+        channel = self._channels.get(name)
+        if channel is None:
+            channel = self._channels[name] = _ChannelLimit(self.settings, ceiling)
+            self._record(name, channel, "start")
+        return channel
+
+    def try_acquire(self, name: str, ceiling: int) -> bool:
+        with self._lock:
+            channel = self._channel(name, ceiling)
+            if channel.in_flight >= int(channel.limit):
+                return False
+            channel.in_flight += 1
+            return True
+
+    def release(self, name: str, started: float, latency: float | None, failed: bool, congested: bool) -> None:
+        with self._lock:
+            channel = self._channels[name]
+            channel.in_flight -= 1
+            before = int(channel.limit)
+            reason = channel.complete(started, self._clock(), latency, failed, congested)
+            if reason is not None and int(channel.limit) != before:
+                self._record(name, channel, reason)
+
+    def _record(self, name: str, channel: _ChannelLimit, reason: str) -> None:
+        channel.trace.append(
+            {"at": round(self._clock() - self._started, 3), "limit": int(channel.limit), "reason": reason}
+        )
+
+    def limits(self) -> Dict[str, int]:
+        with self._lock:
+            return {name: int(channel.limit) for name, channel in self._channels.items()}
+
+    def summary(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "settings": asdict(self.settings),
+                "channels": {
+                    name: {"limit": int(channel.limit), "trace": list(channel.trace)}
+                    for name, channel in sorted(self._channels.items())
+                },
+            }
+
+
+class JobDispatcher:
+    """Round-robin over groups of job positions, skipping groups at their limit.
+
+    `take` blocks (threads) and `take_nowait` returns `BUSY` (coroutines)
+    while every group with work left is at its limit; both return None once
+    nothing is left to hand out. Each taken job must be passed to `finish`.
+    """
+
+    BUSY = -1
+
+    def __init__(
+        self,
+        controller: AdaptiveConcurrency,
+        groups: Sequence[str],
+        order: Sequence[int],
+        ceiling: int,
+    ) -> None:
+        self.controller = controller
+        self.groups = groups
+        self.ceiling = max(1, ceiling)
+        self._queues: Dict[str, Deque[int]] = {}
+        for position in order:
+            self._queues.setdefault(groups[position], deque()).append(position)
+        self._names: List[str] = list(self._queues)
+        self._cursor = 0
+        self._started: Dict[int, float] = {}
+        self._ready = threading.Condition()
+
+    def take_nowait(self) -> int | None:
+        with self._ready:
+            return self._take()
+
+    def take(self) -> int | None:
+        with self._ready:
+            position = self._take()
+            while position == self.BUSY:
+                self._ready.wait()
+                position = self._take()
+            return position
+
+    def _take(self) -> int | None:
+        busy = False
+        for offset in range(len(self._names)):
+            name = self._names[(self._cursor + offset) % len(self._names)]
+            queue = self._queues[name]
+            if not queue:
+                continue
+            if not self.controller.try_acquire(name, self.ceiling):
+                busy = True
+                continue
+            self._cursor = (self._cursor + offset + 1) % len(self._names)
+            position = queue.popleft()
+            self._started[position] = self.controller.now()
+            return position
+        return self.BUSY if busy else None
+
+    def finish(self, position: int, latency: float | None, failed: bool, congested: bool) -> None:
+        with self._ready:
+            started = self._started.pop(position)
+        self.controller.release(self.groups[position], started, latency, failed, congested)
+        with self._ready:
+            self._ready.notify_all()
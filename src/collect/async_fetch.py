@@ -0,0 +1,291 @@
+from __future__ import annotations
+
+import asyncio
+import socket
+import ssl
+import time
+import urllib.error
+from collections import deque
+from dataclasses import dataclass
+from email.message import Message
+from typing import Deque, Dict, Mapping, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+from src.collect.body_limits import CHUNK_SIZE, NO_LIMITS, BodyBuffer, BodyLimits, ResponseRejected
+from src.collect.content_encoding import ACCEPT_ENCODING, ContentDecoder
+
+# Redirect statuses followed like `urllib.request` does, with its hop limit.
+_REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+MAX_REDIRECTS = 10
+DEFAULT_CONNECTIONS_PER_HOST = 8
+
+PoolKey = Tuple[str, str, int]
+_Stream = Tuple[asyncio.StreamReader, asyncio.StreamWriter]
+# status, reason, headers, decoded body, body bytes on the wire
+_Response = Tuple[int, str, Message, bytes, int]
+# Seconds per request phase ("dns", "connect", "ttfb", "body"), summed over redirects.
+Timings = Optional[Dict[str, float]]
+
+
+def _add_timing(timings: Timings, phase: str, started: float) -> None:
+    if timings is not None:
+        timings[phase] = timings.get(phase, 0.0) + time.monotonic() - started
+
+
+@dataclass
+class HttpResponse:
+    url: str
+    status: int
+    headers: Message
+    body: bytes
+    # Body bytes received before Content-Encoding was decoded.
+    wire_bytes: int = 0
+
+    @property
+    def text(self) -> str:
+        return self.body.decode(self.headers.get_content_charset() or "utf-8", errors="ignore")
+
+
+class _ConnectionReset(Exception):
+    """A pooled keep-alive connection was closed by the server before responding."""
+
+
+class AsyncHttpClient:
+    """Minimal HTTP/1.1 client for the asyncio fetch engine.
+
+    Connections are pooled per ``(scheme, host, port)`` and kept alive between
+    requests, so a crawl pays the TCP/TLS handshake once per connection rather
+    than once per URL; every TLS connection shares one `ssl.SSLContext`. At most
+    ``max_connections_per_host`` requests are in flight to the same host.
+    Final responses other than 2xx raise `urllib.error.HTTPError`, like
+    `urllib.request.urlopen`, so both engines fail the same way. With
+    `BodyLimits` a 2xx body is checked before it is read and read in chunks,
+    dropping the connection when the read is cut short. Pass a ``timings``
+    dict to `fetch` to get the seconds spent resolving, connecting, waiting
+    for the first byte and reading the body; a reused connection adds no
+    DNS or connect time.
+    """
+
+    def __init__(self, max_connections_per_host: int = DEFAULT_CONNECTIONS_PER_HOST) -> None:
+        self.max_connections_per_host = max(1, max_connections_per_host)
+        self._ssl_context = ssl.create_default_context()
+        self._idle: Dict[PoolKey, Deque[_Stream]] = {}
+        self._slots: Dict[PoolKey, asyncio.Semaphore] = {}
+        self.connections_opened = 0
+
+    async def __aenter__(self) -> "AsyncHttpClient":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        for streams in self._idle.values():
+            while streams:
+                _, writer = streams.popleft()
+                writer.close()
+        self._idle.clear()
+
+    async def fetch(
+        self,
+        url: str,
+        headers: Mapping[str, str],
+        timeout: float,
+        limits: BodyLimits | None = None,
+        timings: Timings = None,
+    ) -> HttpResponse:
+        """GET ``url``, following redirects, and return the final response.
+
+        ``timeout`` bounds connecting and each exchange, not the wait for a free
+        connection slot to the host.
+        """
+
+        return await self._fetch(url, headers, timeout, limits, timings)
+
+    async def _fetch(
+        self,
+        url: str,
+        headers: Mapping[str, str],
+        timeout: float,
+        limits: BodyLimits | None,
+        timings: Timings = None,
+    ) -> HttpResponse:
+        for _ in range(MAX_REDIRECTS + 1):
+            status, reason, response_headers, body, wire_bytes = await self._get(
+                url, headers, timeout, limits, timings
+            )
+            location = response_headers.get("location")
+            if status in _REDIRECT_STATUSES and location:
+                url = urljoin(url, location)
+                continue
+            # Like urlopen, anything but a 2xx final response is an error (304 included).
+            if not 200 <= status < 300:
+                raise urllib.error.HTTPError(url, status, reason, response_headers, None)
+            return HttpResponse(url, status, response_headers, body, wire_bytes)
+        raise urllib.error.HTTPError(url, status, "Too many redirects", response_headers, None)
+
+    async def _get(
+        self,
+        url: str,
+        headers: Mapping[str, str],
+        timeout: float,
+        limits: BodyLimits | None = None,
+        timings: Timings = None,
+    ) -> _Response:
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"Unsupported URL: {url}")
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        key = (parts.scheme, parts.hostname, port)
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        host = parts.hostname if parts.port is None else f"{parts.hostname}:{parts.port}"
+        request = _encode_request(target, host, headers)
+
+        slots = self._slots.setdefault(key, asyncio.Semaphore(self.max_connections_per_host))
+        # The timeout starts once a slot is free: requests queued behind the
+        # host's connection cap must not time out before they are sent.
+        async with slots:
+            while True:
+                stream, reused = await asyncio.wait_for(self._connection(key, timings), timeout)
+                try:
+                    response, keep_alive = await asyncio.wait_for(_exchange(stream, request, limits, timings), timeout)
+                except _ConnectionReset:
+                    stream[1].close()
+                    if reused:
+                        continue  # stale idle connection: retry on a fresh one
+                    raise ConnectionResetError(f"Connection closed by {parts.hostname}")
+                except BaseException:
+                    stream[1].close()
+                    raise
+                if keep_alive:
+                    self._idle.setdefault(key, deque()).append(stream)
+                else:
+                    stream[1].close()
+                return response
+
+    async def _connection(self, key: PoolKey, timings: Timings = None) -> Tuple[_Stream, bool]:
+        idle = self._idle.get(key)
+        while idle:
+            reader, writer = idle.pop()
+            if not reader.at_eof() and not writer.is_closing():
+                return (reader, writer), True
+            writer.close()
+        scheme, hostname, port = key
+        context = self._ssl_context if scheme == "https" else None
+        if timings is None:
+            stream = await asyncio.open_connection(hostname, port, ssl=context)
+        else:
+            stream = await self._open_timed(hostname, port, context, timings)
+        self.connections_opened += 1
+        return stream, False
+
+    async def _open_timed(
+        self, hostname: str, port: int, context: ssl.SSLContext | None, timings: Dict[str, float]
+    ) -> _Stream:
+        """`asyncio.open_connection`, with name resolution timed apart from connecting."""
+
+        started = time.monotonic()
+        addresses = await asyncio.get_running_loop().getaddrinfo(hostname, port, type=socket.SOCK_STREAM)
+        _add_timing(timings, "dns", started)
+        started = time.monotonic()
+        error: OSError | None = None
+        try:
+            # Try each resolved address in turn, as `open_connection` does for a host name.
+            for *_, address in addresses:
+                try:
+                    return await asyncio.open_connection(
+                        address[0], address[1], ssl=context, server_hostname=hostname if context else None
+                    )
+                except OSError as exc:
+                    error = exc
+            raise error or OSError(f"No addresses for {hostname}")
+        finally:
+            _add_timing(timings, "connect", started)
+
+
+def _encode_request(target: str, host: str, headers: Mapping[str, str]) -> bytes:
+    lines = [f"GET {target} HTTP/1.1", f"Host: {host}"]
+    merged = {"Accept-Encoding": ACCEPT_ENCODING, "Connection": "keep-alive", **headers}
+    lines.extend(f"{name}: {value}" for name, value in merged.items())
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+async def _exchange(
+    stream: _Stream, request: bytes, limits: BodyLimits | None = None, timings: Timings = None
+) -> Tuple[_Response, bool]:
+    reader, writer = stream
+    started = time.monotonic()
+    writer.write(request)
+    await writer.drain()
+    status_line = await reader.readline()
+    if not status_line:
+        raise _ConnectionReset()
+    _add_timing(timings, "ttfb", started)
+    version, status, reason = _parse_status_line(status_line)
+    headers = Message()
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip()] = value.strip()
+
+    connection = (headers.get("connection") or "").lower()
+    keep_alive = connection != "close" and (version != "HTTP/1.0" or connection == "keep-alive")
+    if status < 200 or status in (204, 304):
+        return (status, reason, headers, b"", 0), keep_alive
+    if limits is None or not 200 <= status < 300:
+        limits = NO_LIMITS
+    try:
+        # Raising here leaves the body unread; the caller closes the connection.
+        limits.check_headers(headers)
+        buffer = limits.buffer()
+        decoder = ContentDecoder(headers.get("content-encoding"), limits.max_bytes)
+        started = time.monotonic()
+        complete = await _read_body(reader, headers, buffer, decoder)
+    except ResponseRejected as exc:
+        exc.status = status
+        raise
+    _add_timing(timings, "body", started)
+    return (status, reason, headers, buffer.getvalue(), decoder.wire_bytes), keep_alive and complete
+
+
+async def _read_body(
+    reader: asyncio.StreamReader, headers: Message, buffer: BodyBuffer, decoder: ContentDecoder
+) -> bool:
+    """Stream the decoded body into ``buffer``; return False unless the connection can be reused."""
+
+    if "chunked" in (headers.get("transfer-encoding") or "").lower():
+        while True:
+            size = int((await reader.readline()).split(b";", 1)[0].strip() or b"0", 16)
+            if size == 0:
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                buffer.feed(decoder.flush())
+                return True
+            chunk = await reader.readexactly(size)
+            await reader.readline()
+            if buffer.feed(decoder.decode(chunk)):
+                return False
+    length = headers.get("content-length")
+    remaining = int(length) if length is not None else None
+    while remaining is None or remaining > 0:
+        chunk = await reader.read(CHUNK_SIZE if remaining is None else min(CHUNK_SIZE, remaining))
+        if not chunk:
+            if remaining:
+                raise asyncio.IncompleteReadError(b"", remaining)
+            buffer.feed(decoder.flush())
+            return False
+        if remaining is not None:
+            remaining -= len(chunk)
+        if buffer.feed(decoder.decode(chunk)):
+            return False
+    buffer.feed(decoder.flush())
+    return True
+
+
+def _parse_status_line(line: bytes) -> Tuple[str, int, str]:
+    parts = line.decode("latin-1").strip().split(" ", 2)
+    if len(parts) < 2 or not parts[0].startswith("HTTP/"):
+        raise ValueError(f"Malformed status line: {line!r}")
+    return parts[0], int(parts[1]), parts[2] if len(parts) > 2 else ""
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Mapping, Sequence
+
+CHUNK_SIZE = 64 * 1024
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml", "text/plain")
+_HEAD_END = b"</head>"
+
+
+class ResponseRejected(Exception):
+    """A response was refused by `BodyLimits`; retrying will not help."""
+
+    # HTTP status of the refused response, set by fetchers that read it themselves.
+    status: int | None = None
+
+
+@dataclass(frozen=True)
+class BodyLimits:
+    """What a fetcher is willing to download for one page.
+
+    ``content_types`` lists the accepted media types (an empty tuple accepts
+    any); ``max_bytes`` caps the body. Both are checked against the response
+    headers before any of the body is read, and ``max_bytes`` again while
+    reading bodies of unknown length. With ``preview_bytes`` the read stops
+    that many bytes after ``</head>``, for callers that only need the title
+    and the start of the page.
+    """
+
+    max_bytes: int | None = DEFAULT_MAX_BYTES
+    content_types: Sequence[str] = HTML_CONTENT_TYPES
+    preview_bytes: int | None = None
+
+    def check_headers(self, headers: Mapping[str, str]) -> None:
+        content_type = (headers.get("Content-Type") or "").split(";", 1)[0].strip().lower()
+        if content_type and self.content_types and content_type not in self.content_types:
+            raise ResponseRejected(f"Content-Type {content_type} is not accepted")
+        length = headers.get("Content-Length")
+        if self.max_bytes is not None and length and length.strip().isdigit() and int(length) > self.max_bytes:
+            raise ResponseRejected(f"Content-Length {length} exceeds {self.max_bytes} bytes")
+
+    def buffer(self) -> "BodyBuffer":
+        return BodyBuffer(self)
+
+
+# Reads any body in full, e.g. error pages, search results and API responses.
+NO_LIMITS = BodyLimits(max_bytes=None, content_types=())
+
+
+class BodyBuffer:
+    """Accumulates body chunks under a `BodyLimits`."""
+
+    def __init__(self, limits: BodyLimits) -> None:
+        self.limits = limits
+        self.size = 0
+        self._chunks: List[bytes] = []
+        self._tail = b""
+        self._stop_at: int | None = None
+
+    def feed(self, chunk: bytes) -> bool:
+        """Add ``chunk``; return True once enough of the body has been read."""
+
+        if self._stop_at is None and self.limits.preview_bytes is not None:
+            window = (self._tail + chunk).lower()
+            found = window.find(_HEAD_END)
+            if found >= 0:
+                head_end = self.size - len(self._tail) + found + len(_HEAD_END)
+                self._stop_at = head_end + self.limits.preview_bytes
+            self._tail = window[-(len(_HEAD_END) - 1) :]
+        self.size += len(chunk)
+        self._chunks.append(chunk)
+        if self._stop_at is not None and self.size >= self._stop_at:
+            return True
+        if self.limits.max_bytes is not None and self.size > self.limits.max_bytes:
+            raise ResponseRejected(f"Body exceeds {self.limits.max_bytes} bytes")
+        return False
+
+    def getvalue(self) -> bytes:
+        body = b"".join(self._chunks)
+        return body if self._stop_at is None else body[: self._stop_at]
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from typing import Iterable, List
+from urllib.parse import unquote, urlsplit, urlunsplit
+
+# Query parameters that only identify a campaign or click, never the page itself.
+TRACKING_PARAMS = frozenset(
+    {
+        "gclid",
+        "dclid",
+        "fbclid",
+        "msclkid",
+        "yclid",
+        "igshid",
+        "mc_cid",
+        "mc_eid",
+        "_hsenc",
+        "_hsmi",
+        "_ga",
+        "spm",
+        "scm",
+        "ref_",
+    }
+)
+TRACKING_PREFIXES = ("utm_", "pd_rd_", "pf_rd_")
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def canonicalize_url(url: str) -> str:
+    """One spelling per page for ``http(s)`` URLs, so each is fetched and stored once.
+
+    Scheme and host are lower-cased, default ports dropped, the fragment and
+    tracking parameters (``utm_*``, ``gclid``, ``fbclid``, ``spm`` ...)
+    removed and a trailing slash stripped from non-root paths (an empty path
+    becomes ``/``). The remaining query is kept byte for byte and in order.
+    Other URLs, and ones that do not parse, come back unchanged.
+    """
+
+    stripped = url.strip()
+    try:
+        parts = urlsplit(stripped)
+        port = parts.port
+    except ValueError:
+        return url
+    scheme = parts.scheme.lower()
+    if scheme not in _DEFAULT_PORTS or not parts.hostname:
+        return url
+
+    host = parts.hostname
+    if ":" in host:
+        host = f"[{host}]"
+    if port is not None and port != _DEFAULT_PORTS[scheme]:
+        host = f"{host}:{port}"
+    userinfo = parts.netloc.rpartition("@")[0]
+    netloc = f"{userinfo}@{host}" if userinfo else host
+
+    path = parts.path or "/"
+    if len(path) > 1:
+        path = path.rstrip("/") or "/"
+    query = "&".join(pair for pair in parts.query.split("&") if pair and not _is_tracking(pair))
+    return urlunsplit((scheme, netloc, path, query, ""))
+
+
+def canonicalize_urls(urls: Iterable[str]) -> List[str]:
+    """Canonical forms of ``urls`` in first-seen order, without duplicates."""
+
+    return list(dict.fromkeys(canonicalize_url(url) for url in urls))
+
+
+def _is_tracking(pair: str) -> bool:
+    name = unquote(pair.partition("=")[0]).lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict, Iterable, List, Sequence
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 from urllib.parse import urlparse
 
+from src.collect.canonical_url import canonicalize_urls
+from src.collect.domain_matcher import DomainMatcher, netloc_of
 from src.collect.fetch_strategy import FetchStrategy, get_fetch_strategy
-from src.collect.web_scraper import fetch_documents
+from src.collect.web_scraper import FetchContext, FetchJob, fetch_jobs
 from src.storage.data_store import RawDocument
 
 
@@ -23,7 +26,19 @@ class ChannelFetcher:
         return any(domain in netloc for domain in self.domains)
 
     def choose_strategy(self, fallback: FetchStrategy) -> FetchStrategy:
-        return self.default_strategy or fallback
+        if self.default_strategy is None:
+            return fallback
+        # Channel defaults tune timeouts and retries; the fetch engine and body
+        # limits are run-wide choices.
+        return replace(
+            self.default_strategy,
+            engine=fallback.engine,
+            max_connections_per_host=fallback.max_connections_per_host,
+            retry_budget=fallback.retry_budget,
+            max_bytes=fallback.max_bytes,
+            allowed_content_types=fallback.allowed_content_types,
+            preview_bytes=fallback.preview_bytes,
+        )
 
     def fetch(
         self,
@@ -32,23 +47,30 @@ class ChannelFetcher:
         concurrency: int = 1,
     ) -> List[RawDocument]:
         strategy = self.choose_strategy(fallback_strategy)
-        documents = fetch_documents(urls, strategy=strategy, concurrency=concurrency)
+        jobs = [(url, strategy) for url in urls]
+        documents = [doc for doc in fetch_jobs(jobs, strategy, concurrency, groups=[self.name] * len(jobs)) if doc]
         for doc in documents:
             doc.channel = self.name
         return documents
 
 
+# Response cache TTLs: prices move within the hour, docs and reports rarely change.
+MINUTE = 60.0
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+
+
 # Consumer hardware-oriented fetchers
 ECOMMERCE_FETCHER = ChannelFetcher(
     name="ecommerce",
     domains=("jd.com", "taobao.com", "tmall.com", "amazon.com"),
-    default_strategy=FetchStrategy(timeout=10.0, max_retries=2, per_request_delay=0.5),
+    default_strategy=FetchStrategy(timeout=10.0, max_retries=2, per_request_delay=0.5, cache_ttl=15 * MINUTE),
 )
 
 REVIEW_FETCHER = ChannelFetcher(
     name="reviews",
     domains=("zhihu.com", "weibo.com", "youtube.com", "bilibili.com"),
-    default_strategy=FetchStrategy(timeout=10.0, max_retries=1, per_request_delay=0.2),
+    default_strategy=FetchStrategy(timeout=10.0, max_retries=1, per_request_delay=0.2, cache_ttl=6 * HOUR),
 )
 
 
@@ -56,13 +78,13 @@ REVIEW_FETCHER = ChannelFetcher(
 DOCS_FETCHER = ChannelFetcher(
     name="docs",
     domains=("readthedocs.io", "docs", "manual", "developer"),
-    default_strategy=FetchStrategy(timeout=12.0, max_retries=2, per_request_delay=0.3),
+    default_strategy=FetchStrategy(timeout=12.0, max_retries=2, per_request_delay=0.3, cache_ttl=7 * DAY),
 )
 
 GITHUB_FETCHER = ChannelFetcher(
     name="github",
     domains=("github.com",),
-    default_strategy=FetchStrategy(timeout=12.0, max_retries=1, per_request_delay=0.2),
+    default_strategy=FetchStrategy(timeout=12.0, max_retries=1, per_request_delay=0.2, cache_ttl=DAY),
 )
 
 
@@ -70,13 +92,13 @@ GITHUB_FETCHER = ChannelFetcher(
 ANALYST_FETCHER = ChannelFetcher(
     name="analyst_reports",
     domains=("gartner.com", "forrester.com", "g2.com", "crunchbase.com"),
-    default_strategy=FetchStrategy(timeout=18.0, max_retries=3, per_request_delay=1.0),
+    default_strategy=FetchStrategy(timeout=18.0, max_retries=3, per_request_delay=1.0, cache_ttl=7 * DAY),
 )
 
 CASE_STUDY_FETCHER = ChannelFetcher(
     name="case_studies",
     domains=("case-study", "customers", "success-story", "whitepaper"),
-    default_strategy=FetchStrategy(timeout=15.0, max_retries=2, per_request_delay=0.8),
+    default_strategy=FetchStrategy(timeout=15.0, max_retries=2, per_request_delay=0.8, cache_ttl=7 * DAY),
 )
 
 
@@ -98,19 +120,32 @@ def get_fetchers_for_product_type(product_type: str | None) -> List[ChannelFetch
     return [GENERIC_FETCHER]
 
 
+@lru_cache(maxsize=32)
+def _compiled_matcher(patterns: Tuple[Tuple[str, ...], ...]) -> DomainMatcher:
+    return DomainMatcher(patterns)
+
+
 def route_urls_by_channel(urls: Iterable[str], fetchers: Sequence[ChannelFetcher]) -> Dict[str, List[str]]:
+    """Group ``urls`` by the first fetcher whose domains match (see `ChannelFetcher.matches`).
+
+    Matching runs on a `DomainMatcher` compiled once per set of domain lists,
+    so routing cost does not grow with the number of channels or domains.
+    """
+
     mapping: Dict[str, List[str]] = {fetcher.name: [] for fetcher in fetchers}
     default_fetcher = next((f for f in fetchers if f.is_default), fetchers[-1])
+    matcher = _compiled_matcher(tuple(tuple(fetcher.domains) for fetcher in fetchers))
+    targets = [mapping[fetcher.name] for fetcher in fetchers]
+    fallback = mapping[default_fetcher.name]
 
+    # Seed lists repeat hosts heavily; match each distinct host once.
+    by_host: Dict[str, int] = {}
     for url in urls:
-        matched = False
-        for fetcher in fetchers:
-            if fetcher.matches(url):
-                mapping[fetcher.name].append(url)
-                matched = True
-                break
-        if not matched:
-            mapping[default_fetcher.name].append(url)
+        host = netloc_of(url)
+        index = by_host.get(host)
+        if index is None:
+            index = by_host[host] = matcher.match(host)
+        (targets[index] if index >= 0 else fallback).append(url)
 
     return mapping
 
@@ -121,23 +156,44 @@ def collect_with_routing(
     base_strategy: FetchStrategy | None = None,
     fetchers: Sequence[ChannelFetcher] | None = None,
     concurrency: int = 1,
+    context: FetchContext | None = None,
+    on_document: Callable[[str, Optional[RawDocument]], None] | None = None,
 ) -> List[RawDocument]:
     """Dispatch URLs to channel fetchers and collect documents.
 
-    The function keeps behavior offline-friendly: individual fetch failures are
-    handled inside `fetch_documents`, and channel metadata is attached to
-    returned documents to aid downstream normalization/analytics.
+    All channels share one `fetch_jobs` pool; ``on_document`` receives each result as it completes.
     """
 
     strategy = base_strategy or get_fetch_strategy(product_type)
     fetcher_list = list(fetchers or get_fetchers_for_product_type(product_type))
-    routing = route_urls_by_channel(urls, fetcher_list)
+    routing = route_urls_by_channel(canonicalize_urls(urls), fetcher_list)
 
-    collected: list[RawDocument] = []
+    jobs: list[FetchJob] = []
+    channels: list[str] = []
     for fetcher in fetcher_list:
-        channel_urls = routing.get(fetcher.name, [])
-        if not channel_urls:
-            continue
-        collected.extend(fetcher.fetch(channel_urls, strategy, concurrency=concurrency))
-
+        channel_strategy = fetcher.choose_strategy(strategy)
+        for url in routing.get(fetcher.name, []):
+            jobs.append((url, channel_strategy))
+            channels.append(fetcher.name)
+    if not jobs:
+        return []
+
+    def on_result(position: int, doc: Optional[RawDocument]) -> None:
+        if doc:
+            doc.channel = channels[position]
+        on_document(jobs[position][0], doc)
+
+    documents = fetch_jobs(
+        jobs,
+        strategy=strategy,
+        concurrency=concurrency,
+        context=context or FetchContext(),
+        on_result=on_result if on_document is not None else None,
+        groups=channels,
+    )
+    collected: list[RawDocument] = []
+    for doc, channel in zip(documents, channels):
+        if doc:
+            doc.channel = channel
+            collected.append(doc)
     return collected
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+import urllib.error
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from src.collect.body_limits import ResponseRejected
+from src.collect.politeness import host_of
+
+BREAKERS_FILENAME = "circuit_breakers.json"
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_COOLDOWN = 300.0
+# Statuses that say the host itself is down or refusing us, not that one page is missing.
+HOST_FAILURE_STATUSES = frozenset({403, 429})
+
+
+def is_host_failure(error: BaseException) -> bool:
+    """Whether a failed attempt counts against its host (network errors, timeouts, 403/429, 5xx).
+
+    Only errors from talking to the host count: a request that never left
+    the client (a bad URL, a wait for one of our own connection slots) says
+    nothing about the host.
+    """
+
+    if isinstance(error, ResponseRejected):
+        return False
+    if isinstance(error, urllib.error.HTTPError):
+        return error.code >= 500 or error.code in HOST_FAILURE_STATUSES
+    # OSError covers URLError, timeouts and resets; EOFError a connection closed mid-body.
+    return isinstance(error, (OSError, EOFError))
+
+
+class CircuitBreaker:
+    """Per-host circuit breakers shared by every fetch of a run, persisted in the data dir.
+
+    A host's breaker opens after ``failure_threshold`` consecutive failed
+    attempts (see `is_host_failure`); while open, `allow` turns its URLs away
+    at once instead of spending timeouts and retries on them. After
+    ``cooldown`` seconds one request is let through as a probe (half-open): a
+    success closes the breaker, a failure opens it for another cooldown. Any
+    answer that is not a host failure, a 404 included, proves the host is up.
+    Times are wall-clock so an open breaker carries over to the next run.
+    """
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        cooldown: float = DEFAULT_COOLDOWN,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = path
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown = cooldown
+        self.skipped = 0
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._dirty = False
+        # Host -> {"failures": consecutive failures, "opened_at": time or None}.
+        self._hosts: Dict[str, Dict[str, float | None]] = {}
+        # Host -> when its half-open probe was let through.
+        self._probing: Dict[str, float] = {}
+        if path is not None:
+            try:
+                self._hosts = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                self._hosts = {}
+
+    @classmethod
+    def for_data_dir(cls, data_dir: Path) -> "CircuitBreaker":
+        return cls(Path(data_dir) / BREAKERS_FILENAME)
+
+    def allow(self, url: str) -> bool:
+        """Whether a request to the host of ``url`` may be sent now."""
+
+        host = host_of(url)
+        with self._lock:
+            entry = self._hosts.get(host)
+            opened_at = entry.get("opened_at") if entry else None
+            if opened_at is None:
+                return True
+            now = self._clock()
+            probe = self._probing.get(host)
+            # A probe that never reported back (e.g. its run was interrupted) is given up after a cooldown.
+            if now - opened_at >= self.cooldown and (probe is None or now - probe >= self.cooldown):
+                self._probing[host] = now
+                return True
+            self.skipped += 1
+            return False
+
+    def record_success(self, url: str) -> None:
+        host = host_of(url)
+        with self._lock:
+            self._probing.pop(host, None)
+            if self._hosts.pop(host, None) is not None:
+                self._dirty = True
+
+    def record_failure(self, url: str) -> None:
+        host = host_of(url)
+        with self._lock:
+            entry = self._hosts.setdefault(host, {"failures": 0, "opened_at": None})
+            entry["failures"] = (entry["failures"] or 0) + 1
+            if self._probing.pop(host, None) is not None or entry["failures"] >= self.failure_threshold:
+                entry["opened_at"] = self._clock()
+            self._dirty = True
+
+    def record(self, url: str, error: BaseException | None) -> None:
+        """Count the outcome of one attempt: None for an answer, else the error it raised."""
+
+        if error is not None and is_host_failure(error):
+            self.record_failure(url)
+        else:
+            self.record_success(url)
+
+    def open_hosts(self) -> List[str]:
+        with self._lock:
+            return sorted(host for host, entry in self._hosts.items() if entry.get("opened_at") is not None)
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(self.path.name + f".{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(self._hosts, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp_path, self.path)
+            self._dirty = False
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import threading
+import zlib
+from dataclasses import asdict, dataclass
+from typing import BinaryIO, Dict, List, Tuple
+
+from src.collect.body_limits import CHUNK_SIZE, NO_LIMITS, BodyLimits
+
+# Sent on every page, search and LLM request; both are decoded incrementally.
+ACCEPT_ENCODING = "gzip, deflate"
+
+
+class ContentDecoder:
+    """Incremental decoder for a ``Content-Encoding`` of gzip, deflate or identity.
+
+    Counts the bytes received on the wire and the bytes they decode to. With
+    ``max_bytes`` a chunk is inflated only up to one byte past that budget,
+    so a small compressed body cannot expand in memory before the caller's
+    `BodyBuffer` rejects it.
+    """
+
+    def __init__(self, content_encoding: str | None, max_bytes: int | None = None) -> None:
+        self.max_bytes = max_bytes
+        self.encoding = (content_encoding or "identity").strip().lower()
+        if self.encoding in ("gzip", "x-gzip"):
+            self._inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        elif self.encoding == "deflate":
+            self._inflater = None  # zlib-wrapped or raw, decided on the first bytes
+        elif self.encoding == "identity":
+            self._inflater = None
+        else:
+            raise ValueError(f"Unsupported Content-Encoding: {content_encoding}")
+        self.wire_bytes = 0
+        self.decoded_bytes = 0
+
+    def decode(self, chunk: bytes) -> bytes:
+        self.wire_bytes += len(chunk)
+        if self.encoding == "identity":
+            data = chunk
+        else:
+            if self._inflater is None:
+                # RFC 9110 deflate is zlib-wrapped, but many servers send raw deflate.
+                zlib_header = len(chunk) >= 2 and chunk[0] & 0x0F == 8 and (chunk[0] << 8 | chunk[1]) % 31 == 0
+                self._inflater = zlib.decompressobj(zlib.MAX_WBITS if zlib_header else -zlib.MAX_WBITS)
+            data = self._inflate(chunk)
+        self.decoded_bytes += len(data)
+        return data
+
+    def _inflate(self, chunk: bytes) -> bytes:
+        if self.max_bytes is None:
+            return self._inflater.decompress(chunk)
+        pieces: List[bytes] = []
+        budget = self.max_bytes - self.decoded_bytes + 1
+        while budget > 0:
+            piece = self._inflater.decompress(chunk, budget)
+            pieces.append(piece)
+            budget -= len(piece)
+            chunk = self._inflater.unconsumed_tail
+            if not chunk:
+                break
+        return b"".join(pieces)
+
+    def flush(self) -> bytes:
+        data = self._inflater.flush() if self._inflater is not None else b""
+        self.decoded_bytes += len(data)
+        return data
+
+
+@dataclass
+class TransferTotals:
+    requests: int = 0
+    wire_bytes: int = 0
+    decoded_bytes: int = 0
+
+
+class TransferStats:
+    """Bytes on the wire versus decoded bytes, per Content-Encoding and in total. Thread-safe.
+
+    Only running totals are kept, so memory does not grow with the number of requests.
+    """
+
+    def __init__(self) -> None:
+        self.encodings: Dict[str, TransferTotals] = {}
+        self._lock = threading.Lock()
+
+    def record(self, wire_bytes: int, decoded_bytes: int, encoding: str = "identity") -> None:
+        with self._lock:
+            totals = self.encodings.setdefault(encoding, TransferTotals())
+            totals.requests += 1
+            totals.wire_bytes += wire_bytes
+            totals.decoded_bytes += decoded_bytes
+
+    @property
+    def requests(self) -> int:
+        return sum(totals.requests for totals in self.encodings.values())
+
+    @property
+    def wire_bytes(self) -> int:
+        return sum(totals.wire_bytes for totals in self.encodings.values())
+
+    @property
+    def decoded_bytes(self) -> int:
+        return sum(totals.decoded_bytes for totals in self.encodings.values())
+
+    def summary(self) -> dict:
+        with self._lock:
+            encodings = {name: asdict(totals) for name, totals in sorted(self.encodings.items())}
+        return {
+            "requests": sum(totals["requests"] for totals in encodings.values()),
+            "wire_bytes": sum(totals["wire_bytes"] for totals in encodings.values()),
+            "decoded_bytes": sum(totals["decoded_bytes"] for totals in encodings.values()),
+            "encodings": encodings,
+        }
+
+
+def read_response(
+    response: BinaryIO, content_encoding: str | None, limits: BodyLimits = NO_LIMITS
+) -> Tuple[bytes, ContentDecoder]:
+    """Read and decode a urllib response body in chunks under ``limits``."""
+
+    decoder = ContentDecoder(content_encoding, limits.max_bytes)
+    buffer = limits.buffer()
+    while True:
+        chunk = response.read(CHUNK_SIZE)
+        if not chunk:
+            buffer.feed(decoder.flush())
+            break
+        if buffer.feed(decoder.decode(chunk)):
+            break
+    return buffer.getvalue(), decoder
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import re
+from collections import deque
+from typing import Dict, List, Sequence
+from urllib.parse import urlparse
+
+_NETLOC = re.compile(r"(?:[A-Za-z][A-Za-z0-9+.\-]*:)?//([^/?#]*)")
+_NO_MATCH = -1
+# Stand-in for "no channel" inside the automaton, so "lowest index" is a plain min().
+_UNMATCHED = float("inf")
+
+
+def netloc_of(url: str) -> str:
+    """Lower-cased ``urlparse(url).netloc``, without a full parse for plain URLs."""
+
+    match = _NETLOC.match(url)
+    if match is not None and url.isprintable() and not url[:1].isspace():
+        return match.group(1).lower()
+    return urlparse(url).netloc.lower()
+
+
+class DomainMatcher:
+    """Aho-Corasick automaton over the domain patterns of a list of channels.
+
+    ``patterns[i]`` are the domain fragments of channel ``i``; `match` returns
+    the lowest ``i`` with a fragment occurring anywhere in the host (the same
+    substring rule as `ChannelFetcher.matches`), or -1. One pass over the host
+    finds every fragment at once, so the cost per URL depends on the length of
+    the host, not on how many channels or domains are configured.
+    """
+
+    def __init__(self, patterns: Sequence[Sequence[str]]) -> None:
+        self._goto: List[Dict[str, int]] = [{}]
+        # Lowest channel index with a pattern ending at (or suffix-linked from) each state.
+        self._best: List[float] = [_UNMATCHED]
+        for index, domains in enumerate(patterns):
+            for domain in domains:
+                if domain:
+                    self._add(domain.lower(), index)
+        self._fail = self._link()
+        self._delta: List[Dict[str, int]] = [dict(edges) for edges in self._goto]
+
+    def _add(self, pattern: str, index: int) -> None:
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._best.append(_UNMATCHED)
+            state = next_state
+        self._best[state] = min(self._best[state], index)
+
+    def _link(self) -> List[int]:
+        fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fallback = fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                fail[child] = target if target != child else 0
+                self._best[child] = min(self._best[child], self._best[fail[child]])
+        return fail
+
+    def _step(self, state: int, char: str) -> int:
+        origin = state
+        while state and char not in self._goto[state]:
+            state = self._fail[state]
+        target = self._goto[state].get(char, 0)
+        # Remember the resolved transition so hot paths skip the failure chain.
+        self._delta[origin][char] = target
+        return target
+
+    def match(self, host: str) -> int:
+        delta, best = self._delta, self._best
+        state = 0
+        found = _UNMATCHED
+        for char in host:
+            next_state = delta[state].get(char)
+            state = self._step(state, char) if next_state is None else next_state
+            if best[state] < found:
+                found = best[state]
+                if found == 0:
+                    break
+        return found if found != _UNMATCHED else _NO_MATCH
+
+    def match_url(self, url: str) -> int:
+        return self.match(netloc_of(url))
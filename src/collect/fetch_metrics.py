@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import json
+import threading
+import urllib.error
+from array import array
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import IO, Dict, Iterable
+
+from src.collect.body_limits import ResponseRejected
+
+METRICS_FILENAME = "fetch_metrics.jsonl"
+# Request phases, in order. The thread engine cannot split DNS and connect out of `ttfb`.
+PHASES = ("dns", "connect", "ttfb", "body", "parse")
+PERCENTILES = (50, 95, 99)
+
+
+def failure_reason(error: BaseException) -> str:
+    """Short, countable label for why a fetch attempt failed."""
+
+    if isinstance(error, urllib.error.HTTPError):
+        return f"http_{error.code}"
+    if isinstance(error, ResponseRejected):
+        return "rejected"
+    if isinstance(error, urllib.error.URLError):
+        reason = error.reason
+        return failure_reason(reason) if isinstance(reason, BaseException) else "url_error"
+    if isinstance(error, TimeoutError):
+        return "timeout"
+    return type(error).__name__
+
+
+@dataclass
+class FetchRecord:
+    """Everything measured about fetching one URL."""
+
+    url: str
+    channel: str
+    ok: bool
+    # "network", "cache", "not_modified" or "circuit_open".
+    source: str = "network"
+    status: int | None = None
+    retries: int = 0
+    failure: str | None = None
+    wire_bytes: int = 0
+    decoded_bytes: int = 0
+    # Seconds from taking the job to handing back its result, waits and backoff included.
+    total: float = 0.0
+    # Seconds per phase (see `PHASES`), summed over attempts; absent phases were not measured.
+    phases: Dict[str, float] = field(default_factory=dict)
+
+
+class _ChannelStats:
+    def __init__(self) -> None:
+        self.requests = 0
+        self.documents = 0
+        self.retries = 0
+        self.wire_bytes = 0
+        self.decoded_bytes = 0
+        self.first_start: float | None = None
+        self.last_end = 0.0
+        self.statuses: Dict[str, int] = {}
+        self.failures: Dict[str, int] = {}
+        self.sources: Dict[str, int] = {}
+        # Compact float arrays keep memory low on runs over millions of URLs.
+        self.samples: Dict[str, array] = {name: array("d") for name in ("total",) + PHASES}
+
+    def add(self, record: FetchRecord, started: float, ended: float) -> None:
+        self.requests += 1
+        self.documents += record.ok
+        self.retries += record.retries
+        self.wire_bytes += record.wire_bytes
+        self.decoded_bytes += record.decoded_bytes
+        self.first_start = started if self.first_start is None else min(self.first_start, started)
+        self.last_end = max(self.last_end, ended)
+        _count(self.sources, record.source)
+        if record.status is not None:
+            _count(self.statuses, str(record.status))
+        if record.failure is not None:
+            _count(self.failures, record.failure)
+        if record.source == "network":
+            self.samples["total"].append(record.total)
+        for name, seconds in record.phases.items():
+            self.samples[name].append(seconds)
+
+    def summary(self) -> Dict[str, object]:
+        elapsed = self.last_end - (self.first_start or 0.0)
+        return {
+            "requests": self.requests,
+            "documents": self.documents,
+            "retries": self.retries,
+            "wire_bytes": self.wire_bytes,
+            "decoded_bytes": self.decoded_bytes,
+            "seconds": round(elapsed, 3),
+            "docs_per_sec": round(self.documents / elapsed, 2) if elapsed > 0 else None,
+            "bytes_per_sec": round(self.wire_bytes / elapsed, 1) if elapsed > 0 else None,
+            "sources": dict(sorted(self.sources.items())),
+            "statuses": dict(sorted(self.statuses.items())),
+            "failures": dict(sorted(self.failures.items())),
+            "latency": {name: percentiles(values) for name, values in self.samples.items() if values},
+        }
+
+
+def _count(counter: Dict[str, int], key: str) -> None:
+    counter[key] = counter.get(key, 0) + 1
+
+
+def percentiles(values: Iterable[float]) -> Dict[str, float]:
+    """Nearest-rank p50/p95/p99 of ``values``, in seconds rounded to the millisecond."""
+
+    ordered = sorted(values)
+    if not ordered:
+        return {}
+    return {
+        f"p{rank}": round(ordered[min(len(ordered) - 1, max(0, -(-rank * len(ordered) // 100) - 1))], 3)
+        for rank in PERCENTILES
+    }
+
+
+class FetchMetrics:
+    """Per-URL fetch records and per-channel aggregates for one run.
+
+    `record` is thread-safe. With ``path`` every `FetchRecord` is also
+    appended there as one JSON line (the file is truncated when the run
+    starts), so per-URL detail does not have to stay in memory; `summary`
+    reports request and document counts, statuses, failure reasons, p50/p95/
+    p99 of the total time and of each phase, and docs/sec and bytes/sec over
+    the time each channel was active.
+    """
+
+    def __init__(self, path: Path | None = None) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._channels: Dict[str, _ChannelStats] = {}
+        self._file: IO[str] | None = None
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = path.open("w", encoding="utf-8")
+
+    @classmethod
+    def for_data_dir(cls, data_dir: Path) -> "FetchMetrics":
+        return cls(Path(data_dir) / METRICS_FILENAME)
+
+    def record(self, record: FetchRecord, started: float, ended: float) -> None:
+        """Add one URL's ``record``; ``started``/``ended`` are `time.monotonic` readings around its job."""
+
+        line = json.dumps(asdict(record), ensure_ascii=False) + "\n" if self._file is not None else None
+        with self._lock:
+            self._channels.setdefault(record.channel, _ChannelStats()).add(record, started, ended)
+            if self._file is not None and line is not None:
+                self._file.write(line)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def summary(self) -> Dict[str, object]:
+        with self._lock:
+            channels = {name: stats.summary() for name, stats in sorted(self._channels.items())}
+        summary: Dict[str, object] = {"channels": channels}
+        if self.path is not None:
+            summary["records"] = str(self.path)
+        return summary
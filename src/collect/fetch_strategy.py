@@ -1,7 +1,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Dict
+from typing import Dict, Tuple
+
+from src.collect.body_limits import DEFAULT_MAX_BYTES, HTML_CONTENT_TYPES, BodyLimits
+from src.collect.retry import RetryPolicy
+
+# "thread": blocking urllib fetches on a thread pool; "async": one asyncio loop
+# with pooled keep-alive connections (see `src.collect.async_fetch`).
+FETCH_ENGINES = ("thread", "async")
 
 
 @dataclass
@@ -13,12 +20,28 @@ class FetchStrategy:
     max_retries: int = 1
     per_request_delay: float = 0.0
     headers: Dict[str, str] = field(default_factory=dict)
+    engine: str = "thread"
+    max_connections_per_host: int = 8
+    retry: RetryPolicy = field(default_factory=RetryPolicy)
+    # Retries allowed across a whole fetch run; None means unlimited.
+    retry_budget: int | None = None
+    # Seconds a cached response stays fresh (see `ResponseCache`); None disables reuse.
+    cache_ttl: float | None = 3600.0
+    # Responses larger than this or of another media type are aborted unread.
+    max_bytes: int | None = DEFAULT_MAX_BYTES
+    allowed_content_types: Tuple[str, ...] = HTML_CONTENT_TYPES
+    # Stop reading this many bytes after </head>; None reads the whole page.
+    preview_bytes: int | None = None
 
     def as_headers(self) -> Dict[str, str]:
         merged = {"User-Agent": self.user_agent}
         merged.update(self.headers)
         return merged
 
+    @property
+    def body_limits(self) -> BodyLimits:
+        return BodyLimits(self.max_bytes, self.allowed_content_types, self.preview_bytes)
+
 
 def get_fetch_strategy(product_type: str | None = None) -> FetchStrategy:
     """Return a strategy tuned for the given product type."""
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from html import unescape
+from typing import List
+from urllib.parse import urljoin
+
+_ATTRS = r"""(?:[^>"']++|"[^"]*+"|'[^']*+')*+"""
+# One match per markup construct; `re.split` hands back the text between them
+# plus three captures per match: the attributes of an <a> tag, "title" for an
+# opening <title> and "title" for a closing one. Each alternative either
+# matches at the current "<" or fails there without scanning past it, except
+# comments and script/style bodies, which run to their terminator or to the
+# end of the page in a single attempt. Quantifiers are possessive, so nothing
+# backtracks and the scan is linear in the page size.
+_TOKEN = re.compile(
+    rf"""
+    <(?:
+        a\b({_ATTRS})>?
+      | (title)\b{_ATTRS}>?
+      | /(title)\b[^>]*+>?
+      | !--.*?(?:-->|\Z)
+      | [!?][^>]*+>?
+      | script\b{_ATTRS}>?.*?(?:</script\b[^>]*+>|\Z)
+      | style\b{_ATTRS}>?.*?(?:</style\b[^>]*+>|\Z)
+      | /?[a-z][a-z0-9:-]*+{_ATTRS}>?
+    )
+    """,
+    re.IGNORECASE | re.DOTALL | re.VERBOSE,
+)
+_GROUPS = _TOKEN.groups + 1
+_HREF = re.compile(r"""\bhref\s*+=\s*+(?:"([^"]*+)"|'([^']*+)'|([^\s>"']++))""", re.IGNORECASE)
+
+
+@dataclass
+class HtmlExtract:
+    title: str = ""
+    text: str = ""
+    links: List[str] = field(default_factory=list)
+
+
+def extract_html(html: str, base_url: str | None = None) -> HtmlExtract:
+    """Title, visible text and ``http(s)`` links of ``html`` in one left-to-right scan.
+
+    Tags, comments and script/style bodies are dropped from the text,
+    whitespace is collapsed and entities are unescaped; the title is the text
+    of the first ``<title>`` element. Links are resolved against
+    ``base_url``, stripped of fragments and de-duplicated. Malformed markup
+    (unclosed comments, tags, quotes or scripts) cannot make the scan
+    superlinear.
+    """
+
+    pieces = _TOKEN.split(html)
+    texts = pieces[::_GROUPS]
+
+    links: dict[str, None] = {}
+    for attributes in filter(None, pieces[1::_GROUPS]):
+        href = _HREF.search(attributes)
+        if href:
+            _add_link(links, href.group(1) or href.group(2) or href.group(3) or "", base_url)
+
+    title = ""
+    opened = next((index for index, tag in enumerate(pieces[2::_GROUPS]) if tag), None)
+    if opened is not None:
+        closes = pieces[3::_GROUPS]
+        closed = next((index for index in range(opened, len(closes)) if closes[index]), None)
+        if closed is not None:
+            title = unescape(" ".join(texts[opened + 1 : closed + 1])).strip()
+
+    text = unescape(" ".join(" ".join(texts).split())).strip()
+    return HtmlExtract(title=title, text=text, links=list(links))
+
+
+def _add_link(links: dict[str, None], href: str, base_url: str | None) -> None:
+    url = unescape(href).strip().partition("#")[0]
+    if base_url and not url.startswith(("http://", "https://")):
+        url = urljoin(base_url, url)
+    if url.startswith(("http://", "https://")):
+        links[url] = None
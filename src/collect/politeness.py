@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, Dict, Iterable, List
+from urllib.parse import urlparse
+
+
+def host_of(url: str) -> str:
+    return (urlparse(url).hostname or "").lower()
+
+
+class HostRateLimiter:
+    """Per-host token buckets shared by every fetch worker of a run.
+
+    Each host refills one token every ``interval`` seconds (the strategy's
+    ``per_request_delay``) and holds at most ``burst`` tokens. `reserve` books
+    the next free slot for a host and returns how long the caller must wait
+    before sending, so workers sleep only for their own host while requests to
+    other hosts proceed. The limiter is thread-safe and works the same from
+    threads (`wait`) and coroutines (`reserve` + `asyncio.sleep`).
+    """
+
+    def __init__(self, burst: int = 1, clock: Callable[[], float] = time.monotonic) -> None:
+        self.burst = max(1, burst)
+        self._clock = clock
+        self._lock = threading.Lock()
+        # Host -> time at which its bucket would be empty again (GCRA form).
+        self._next_free: Dict[str, float] = {}
+        # Host -> time before which no request may be sent (server back-off).
+        self._deferred: Dict[str, float] = {}
+
+    def reserve(self, url: str, interval: float) -> float:
+        """Book a request slot for the host of ``url``; return seconds to wait."""
+
+        host = host_of(url)
+        with self._lock:
+            now = self._clock()
+            start = max(now, self._deferred.get(host, now))
+            if interval <= 0:
+                return start - now
+            next_free = max(self._next_free.get(host, start), start)
+            wait = max(start - now, next_free - (self.burst - 1) * interval - now)
+            self._next_free[host] = next_free + interval
+        return wait
+
+    def defer(self, url: str, seconds: float) -> None:
+        """Hold back every request to the host of ``url`` for ``seconds`` (e.g. ``Retry-After``)."""
+
+        host = host_of(url)
+        with self._lock:
+            until = self._clock() + seconds
+            self._deferred[host] = max(self._deferred.get(host, until), until)
+
+    def wait(self, url: str, interval: float) -> None:
+        delay = self.reserve(url, interval)
+        if delay > 0:
+            time.sleep(delay)
+
+
+def interleave_by_host(urls: Iterable[str]) -> List[int]:
+    """Positions of ``urls`` reordered round-robin across hosts.
+
+    Consecutive requests then go to different hosts whenever possible, so a
+    worker waiting on one host's rate limit does not hold up the others.
+    """
+
+    by_host: Dict[str, List[int]] = {}
+    for position, url in enumerate(urls):
+        by_host.setdefault(host_of(url), []).append(position)
+    queues = list(by_host.values())
+    order: list[int] = []
+    for depth in range(max((len(queue) for queue in queues), default=0)):
+        order.extend(queue[depth] for queue in queues if depth < len(queue))
+    return order
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Mapping
+
+CACHE_DIRNAME = "http_cache"
+INDEX_FILENAME = "index.json"
+DEFAULT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+
+def cache_key(url: str, headers: Mapping[str, str]) -> str:
+    """Key for ``url`` fetched with the channel's extra ``headers``.
+
+    Only the strategy's explicit headers (cookies, ``Accept-Language`` ...) take
+    part, since they can change the page served; the User-Agent does not, so
+    overriding it still replays earlier responses.
+    """
+
+    material = url + "\n" + "\n".join(f"{name.lower()}:{value}" for name, value in sorted(headers.items()))
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CachedResponse:
+    url: str
+    html: str
+    stored_at: float
+
+    @property
+    def fetched_at(self) -> str:
+        """``stored_at`` in the format of `utc_now_iso`."""
+
+        stamp = datetime.fromtimestamp(self.stored_at, timezone.utc).replace(tzinfo=None)
+        return stamp.isoformat() + "Z"
+
+
+class ResponseCache:
+    """Size-bounded on-disk cache of fetched pages.
+
+    Bodies live in ``<root>/<key[:2]>/<key>.html`` and an index records the URL,
+    size, store time and last use of each entry. `get` serves an entry while it
+    is younger than the caller's TTL (the channel strategy's ``cache_ttl``);
+    with ``offline=True`` any cached entry is served regardless of age and
+    fetchers never touch the network. When the bodies exceed ``max_bytes`` the
+    least recently used entries are evicted. Call `save` to persist the index.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+        offline: bool = False,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._dirty = False
+        try:
+            entries: Dict[str, Dict[str, object]] = json.loads((self.root / INDEX_FILENAME).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            entries = {}
+        # Least recently used first, so eviction pops from the front.
+        self._index: "OrderedDict[str, Dict[str, object]]" = OrderedDict(
+            sorted(entries.items(), key=lambda item: float(item[1]["used"]))
+        )
+        self._total = sum(int(entry["size"]) for entry in self._index.values())
+
+    @classmethod
+    def for_data_dir(
+        cls, data_dir: Path, max_bytes: int = DEFAULT_CACHE_MAX_BYTES, offline: bool = False
+    ) -> "ResponseCache":
+        return cls(Path(data_dir) / CACHE_DIRNAME, max_bytes=max_bytes, offline=offline)
+
+    def _body_path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.html"
+
+    def get(self, url: str, headers: Mapping[str, str], ttl: float | None) -> CachedResponse | None:
+        """Cached response for ``url`` if fresh within ``ttl`` seconds (any age offline)."""
+
+        key = cache_key(url, headers)
+        now = self._clock()
+        with self._lock:
+            entry = self._index.get(key)
+            fresh = entry is not None and (
+                self.offline or (ttl is not None and now - float(entry["stored_at"]) <= ttl)
+            )
+            if not fresh:
+                self.misses += 1
+                return None
+            try:
+                html = self._body_path(key).read_text(encoding="utf-8")
+            except OSError:
+                self._drop(key)
+                self.misses += 1
+                return None
+            entry["used"] = now
+            self._index.move_to_end(key)
+            self._dirty = True
+            self.hits += 1
+            return CachedResponse(url=url, html=html, stored_at=float(entry["stored_at"]))
+
+    def put(self, url: str, headers: Mapping[str, str], html: str) -> None:
+        key = cache_key(url, headers)
+        body = html.encode("utf-8")
+        if len(body) > self.max_bytes:
+            return
+        path = self._body_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(body)
+        os.replace(tmp_path, path)
+        now = self._clock()
+        with self._lock:
+            previous = self._index.get(key)
+            self._total += len(body) - (int(previous["size"]) if previous else 0)
+            self._index[key] = {"url": url, "size": len(body), "stored_at": now, "used": now}
+            self._index.move_to_end(key)
+            self._dirty = True
+            self._evict()
+
+    def _evict(self) -> None:
+        while self._total > self.max_bytes and self._index:
+            self._drop(next(iter(self._index)))
+
+    def _drop(self, key: str) -> None:
+        entry = self._index.pop(key, None)
+        if entry is None:
+            return
+        self._total -= int(entry["size"])
+        self._dirty = True
+        try:
+            self._body_path(key).unlink()
+        except FileNotFoundError:
+            pass
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            self.root.mkdir(parents=True, exist_ok=True)
+            index_path = self.root / INDEX_FILENAME
+            tmp_path = index_path.with_name(f"{INDEX_FILENAME}.{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(self._index, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp_path, index_path)
+            self._dirty = False
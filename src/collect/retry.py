@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import random
+import threading
+import urllib.error
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from src.collect.body_limits import ResponseRejected
+
+# 4xx statuses that may succeed when retried; every other 4xx is permanent.
+RETRYABLE_CLIENT_STATUSES = frozenset({408, 425, 429})
+
+
+@dataclass
+class RetryPolicy:
+    """How failed fetch attempts are retried.
+
+    Permanent client errors (4xx other than 408/425/429) and responses refused
+    by the strategy's body limits are never retried; anything else, including
+    network errors and 5xx, is. The n-th retry waits a random time in
+    ``[(1 - jitter) * cap, cap]`` with ``cap = min(max_delay, base_delay *
+    multiplier ** n)``; the politeness delay between requests is separate. A
+    ``Retry-After`` header defers the whole host for that long, and a retry is
+    abandoned when the server asks for more than ``max_retry_after`` seconds.
+    """
+
+    base_delay: float = 0.5
+    multiplier: float = 2.0
+    max_delay: float = 30.0
+    jitter: float = 1.0
+    max_retry_after: float = 120.0
+
+    def is_retryable(self, error: BaseException) -> bool:
+        if isinstance(error, ResponseRejected):
+            return False
+        if isinstance(error, urllib.error.HTTPError):
+            return error.code >= 500 or error.code in RETRYABLE_CLIENT_STATUSES
+        return True
+
+    def backoff(self, retry: int) -> float:
+        cap = min(self.max_delay, self.base_delay * self.multiplier**retry)
+        jitter = min(max(self.jitter, 0.0), 1.0)
+        return random.uniform(cap * (1 - jitter), cap)
+
+
+def retry_after_seconds(error: BaseException, now: datetime | None = None) -> float | None:
+    """Seconds requested by a ``Retry-After`` header on an HTTP error, if any."""
+
+    headers = getattr(error, "headers", None) if isinstance(error, urllib.error.HTTPError) else None
+    value = headers.get("Retry-After") if headers is not None else None
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - (now or datetime.now(timezone.utc))).total_seconds())
+
+
+class RetryBudget:
+    """Run-wide cap on retries, shared by every worker and channel of a fetch.
+
+    Once ``limit`` retries have been spent, failing requests give up at once
+    instead of tying up workers on a host that keeps failing. ``None`` means
+    unlimited (each request is still bounded by ``max_retries``).
+    """
+
+    def __init__(self, limit: int | None = None) -> None:
+        self.limit = limit
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> bool:
+        with self._lock:
+            if self.limit is not None and self.used >= self.limit:
+                return False
+            self.used += 1
+            return True
@@ -1,28 +1,31 @@
 from __future__ import annotations
 
 import json
-import re
 import urllib.parse
 import urllib.request
 from typing import Iterable, List, Sequence
 
 from src.collect.channels import DiscoveryChannel, get_channels_for_product_type
+from src.collect.content_encoding import ACCEPT_ENCODING, TransferStats, read_response
+from src.collect.html_extract import extract_html
 
 USER_AGENT = "product-researcher/0.1"
 SEARCH_ENGINE = "https://duckduckgo.com/html/?q={query}"
 
 
-def _http_get(url: str, timeout: float = 10.0) -> str:
-    request = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
+def _http_get(url: str, timeout: float = 10.0, transfer: TransferStats | None = None) -> str:
+    request = urllib.request.Request(url, headers={"User-Agent": USER_AGENT, "Accept-Encoding": ACCEPT_ENCODING})
     with urllib.request.urlopen(request, timeout=timeout) as response:  # noqa: S310
+        body, decoder = read_response(response, response.headers.get("Content-Encoding"))
+        if transfer is not None:
+            transfer.record(decoder.wire_bytes, decoder.decoded_bytes, decoder.encoding)
         charset = response.headers.get_content_charset() or "utf-8"
-        return response.read().decode(charset, errors="ignore")
+        return body.decode(charset, errors="ignore")
 
 
 def _parse_links(html: str, limit: int = 10) -> List[str]:
-    hrefs = re.findall(r'href="(http[^"#]+)"', html)
     filtered = []
-    for link in hrefs:
+    for link in extract_html(html).links:
         if any(domain in link for domain in ["duckduckgo.com", "google.com/url", "yahoo.com"]):
             continue
         filtered.append(link)
@@ -36,6 +39,7 @@ def discover_sources(
     product_type: str | None = None,
     limit_per_keyword: int = 5,
     limit_per_channel: int = 3,
+    transfer: TransferStats | None = None,
 ) -> List[str]:
     discovered: List[str] = []
     channels = get_channels_for_product_type(product_type)
@@ -45,7 +49,7 @@ def discover_sources(
             encoded_query = urllib.parse.quote(channel_query)
             url = SEARCH_ENGINE.format(query=encoded_query)
             try:
-                html = _http_get(url)
+                html = _http_get(url, transfer=transfer)
                 links = _parse_links(html, limit=min(limit_per_keyword, limit_per_channel))
                 discovered.extend(links)
             except Exception:  # pragma: no cover - network failures are handled silently
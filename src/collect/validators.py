@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Mapping
+
+from src.storage.data_store import utc_now_iso
+
+VALIDATORS_FILENAME = "http_validators.json"
+
+
+class ValidatorCache:
+    """Persisted ``ETag`` / ``Last-Modified`` validators per URL.
+
+    Fetchers send them back as ``If-None-Match`` / ``If-Modified-Since``; a
+    ``304 Not Modified`` answer means the stored document is still current, so
+    nothing is downloaded, parsed or stored. Each entry also keeps when the
+    URL was last answered (``200`` or ``304``) as `checked_at`, since an
+    unchanged page leaves its stored ``fetched_at`` as it was. The cache lives
+    in the data dir next to the documents it describes and is rewritten
+    atomically by `save`.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.not_modified = 0
+        self._lock = threading.Lock()
+        self._dirty = False
+        try:
+            self._entries: Dict[str, Dict[str, str]] = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self._entries = {}
+
+    @classmethod
+    def for_data_dir(cls, data_dir: Path) -> "ValidatorCache":
+        return cls(Path(data_dir) / VALIDATORS_FILENAME)
+
+    def request_headers(self, url: str) -> Dict[str, str]:
+        with self._lock:
+            entry = self._entries.get(url) or {}
+        headers: Dict[str, str] = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def checked_at(self, url: str) -> str | None:
+        """When ``url`` was last answered by its server, in the form `utc_now_iso` writes."""
+
+        with self._lock:
+            return (self._entries.get(url) or {}).get("checked_at")
+
+    def update(self, url: str, response_headers: Mapping[str, str]) -> None:
+        """Remember the validators of a full ``200`` response for ``url``."""
+
+        entry = {
+            key: value
+            for key, value in (
+                ("etag", response_headers.get("ETag")),
+                ("last_modified", response_headers.get("Last-Modified")),
+                ("checked_at", utc_now_iso()),
+            )
+            if value
+        }
+        with self._lock:
+            self._entries[url] = entry
+            self._dirty = True
+
+    def record_not_modified(self, url: str) -> None:
+        with self._lock:
+            self.not_modified += 1
+            self._entries.setdefault(url, {})["checked_at"] = utc_now_iso()
+            self._dirty = True
+
+    def forget(self, urls: Iterable[str]) -> None:
+        """Drop validators for ``urls``, e.g. when their documents are not stored."""
+
+        with self._lock:
+            for url in urls:
+                if self._entries.pop(url, None) is not None:
+                    self._dirty = True
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(self.path.name + f".{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(self._entries, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp_path, self.path)
+            self._dirty = False
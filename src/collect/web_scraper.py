@@ -1,76 +1,420 @@
 from __future__ import annotations
 
-import re
+import asyncio
 import time
+import urllib.error
 import urllib.request
 from concurrent.futures import ThreadPoolExecutor
-from html import unescape
-from typing import Iterable, List, Optional
+from dataclasses import dataclass, field, replace
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
+from src.collect.adaptive import AdaptiveConcurrency, JobDispatcher, is_congestion
+from src.collect.async_fetch import AsyncHttpClient
+from src.collect.body_limits import ResponseRejected
+from src.collect.circuit_breaker import CircuitBreaker
+from src.collect.content_encoding import ACCEPT_ENCODING, TransferStats, read_response
+from src.collect.fetch_metrics import FetchMetrics, FetchRecord, failure_reason
 from src.collect.fetch_strategy import FetchStrategy
+from src.collect.html_extract import extract_html
+from src.collect.politeness import HostRateLimiter, interleave_by_host
+from src.collect.response_cache import ResponseCache
+from src.collect.retry import RetryBudget, retry_after_seconds
+from src.collect.validators import ValidatorCache
 from src.storage.data_store import RawDocument, utc_now_iso
 
+FetchJob = Tuple[str, FetchStrategy]
+# Called with a job's position and its document (None if nothing was fetched).
+ResultCallback = Callable[[int, Optional[RawDocument]], None]
 
-def _fetch_html(url: str, strategy: FetchStrategy) -> str:
-    request = urllib.request.Request(url, headers=strategy.as_headers())
+
+@dataclass
+class FetchOutcome:
+    """How the fetch of one URL went, beyond the document it produced."""
+
+    # Exception of every failed attempt, in order.
+    errors: List[Exception] = field(default_factory=list)
+    # Seconds the last request took; rate-limit waits and backoff are excluded. None if nothing was sent.
+    latency: float | None = None
+    # "network", or "cache", "not_modified" or "circuit_open" when no page was downloaded.
+    source: str = "network"
+    # HTTP status of the last response, errors included.
+    status: int | None = None
+    attempts: int = 0
+    wire_bytes: int = 0
+    decoded_bytes: int = 0
+    # Seconds per phase ("dns", "connect", "ttfb", "body", "parse"), summed over attempts.
+    phases: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def congested(self) -> bool:
+        return any(is_congestion(error) for error in self.errors)
+
+    def timed(self, phase: str, started: float) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.0) + time.monotonic() - started
+
+    def failed_attempt(self, error: Exception, sent: float) -> None:
+        self.latency = time.monotonic() - sent
+        self.errors.append(error)
+        if isinstance(error, urllib.error.HTTPError):
+            self.status = error.code
+            if error.code == 304:
+                self.source = "not_modified"
+        elif isinstance(error, ResponseRejected) and error.status is not None:
+            self.status = error.status
+
+
+@dataclass
+class FetchContext:
+    """Collaborators shared by the fetches of a run; all but the per-host ``limiter`` are optional.
+
+    Pass one context to several calls to share its rate limits, retry budget,
+    caches, circuit breakers and metrics.
+    """
+
+    limiter: HostRateLimiter = field(default_factory=HostRateLimiter)
+    budget: RetryBudget | None = None
+    validators: ValidatorCache | None = None
+    cache: ResponseCache | None = None
+    transfer: TransferStats | None = None
+    breaker: CircuitBreaker | None = None
+    metrics: FetchMetrics | None = None
+    adaptive: AdaptiveConcurrency | None = None
+
+
+def _fetch_html(url: str, strategy: FetchStrategy, context: FetchContext, outcome: FetchOutcome) -> str:
+    headers = {"Accept-Encoding": ACCEPT_ENCODING, **strategy.as_headers()}
+    if context.validators is not None:
+        headers.update(context.validators.request_headers(url))
+    request = urllib.request.Request(url, headers=headers)
+    limits = strategy.body_limits
+    started = time.monotonic()
     with urllib.request.urlopen(request, timeout=strategy.timeout) as response:  # noqa: S310
+        # urllib resolves, connects and reads the headers in one call, so "ttfb" covers all three.
+        outcome.timed("ttfb", started)
+        outcome.status = response.status
+        limits.check_headers(response.headers)
+        started = time.monotonic()
+        body, decoder = read_response(response, response.headers.get("Content-Encoding"), limits)
+        outcome.timed("body", started)
+        outcome.wire_bytes += decoder.wire_bytes
+        outcome.decoded_bytes += decoder.decoded_bytes
+        if context.transfer is not None:
+            context.transfer.record(decoder.wire_bytes, decoder.decoded_bytes, decoder.encoding)
         charset = response.headers.get_content_charset() or "utf-8"
-        return response.read().decode(charset, errors="ignore")
+        html = body.decode(charset, errors="ignore")
+        if context.validators is not None:
+            context.validators.update(url, response.headers)
+        return html
+
+
+def _is_not_modified(error: Exception) -> bool:
+    return isinstance(error, urllib.error.HTTPError) and error.code == 304
+
+
+def _to_document(url: str, html: str, fetched_at: str | None = None) -> RawDocument:
+    extracted = extract_html(html)
+    return RawDocument(
+        url=url,
+        title=extracted.title or url,
+        content=extracted.text,
+        fetched_at=fetched_at or utc_now_iso(),
+    )
 
 
-def _strip_tags(html: str) -> str:
-    text = re.sub(r"<script[\s\S]*?</script>", "", html, flags=re.IGNORECASE)
-    text = re.sub(r"<style[\s\S]*?</style>", "", text, flags=re.IGNORECASE)
-    text = re.sub(r"<[^>]+>", " ", text)
-    text = re.sub(r"\s+", " ", text)
-    return unescape(text).strip()
+def _from_cache(url: str, strategy: FetchStrategy, cache: ResponseCache) -> Optional[RawDocument]:
+    cached = cache.get(url, strategy.headers, strategy.cache_ttl)
+    if cached is None:
+        return None
+    return _to_document(url, cached.html, cached.fetched_at)
+
 
+def _retry_delay(
+    url: str, attempt: int, error: Exception, strategy: FetchStrategy, context: FetchContext
+) -> float | None:
+    """Backoff before retrying ``url`` after ``error``, or None to give up."""
 
-def _extract_title(html: str) -> str:
-    match = re.search(r"<title>(.*?)</title>", html, flags=re.IGNORECASE | re.DOTALL)
-    if match:
-        return unescape(match.group(1)).strip()
-    return ""
+    policy = strategy.retry
+    if attempt >= strategy.max_retries or not policy.is_retryable(error):
+        return None
+    retry_after = retry_after_seconds(error)
+    if retry_after is not None and retry_after > policy.max_retry_after:
+        return None
+    if context.budget is not None and not context.budget.acquire():
+        return None
+    if retry_after is not None:
+        context.limiter.defer(url, retry_after)
+    return policy.backoff(attempt)
 
 
-def _fetch_single(url: str, strategy: FetchStrategy) -> Optional[RawDocument]:
+def _fetch_single(
+    url: str,
+    strategy: FetchStrategy,
+    context: FetchContext | None = None,
+    outcome: FetchOutcome | None = None,
+) -> Optional[RawDocument]:
+    context = context or FetchContext()
+    outcome = outcome or FetchOutcome()
+    cache, breaker, validators = context.cache, context.breaker, context.validators
+    if cache is not None:
+        document = _from_cache(url, strategy, cache)
+        if document is not None or cache.offline:
+            outcome.source = "cache"
+            return document
     try:
         html = None
         for attempt in range(strategy.max_retries + 1):
+            if breaker is not None and not breaker.allow(url):
+                outcome.source = "circuit_open"
+                return None
+            # Every attempt, retries included, takes a slot from the host's bucket, so
+            # `per_request_delay` spaces all requests to a host, not just retries.
+            context.limiter.wait(url, strategy.per_request_delay)
+            outcome.attempts += 1
+            sent = time.monotonic()
             try:
-                html = _fetch_html(url, strategy)
+                html = _fetch_html(url, strategy, context, outcome)
+                outcome.latency = time.monotonic() - sent
+                if breaker is not None:
+                    breaker.record(url, None)
                 break
-            except Exception:
-                if attempt >= strategy.max_retries:
+            except Exception as exc:
+                outcome.failed_attempt(exc, sent)
+                if breaker is not None:
+                    breaker.record(url, exc)
+                if validators is not None and _is_not_modified(exc):
+                    validators.record_not_modified(url)
+                    return None
+                delay = _retry_delay(url, attempt, exc, strategy, context)
+                if delay is None:
                     raise
-                time.sleep(strategy.per_request_delay)
+                time.sleep(delay)
 
         if html is None:
             return None
-        title = _extract_title(html) or url
-        content = _strip_tags(html)
-        return RawDocument(
-            url=url,
-            title=title,
-            content=content,
-            fetched_at=utc_now_iso(),
-        )
-    except Exception:  # pragma: no cover - network failures are handled silently
+        if cache is not None:
+            cache.put(url, strategy.headers, html)
+        started = time.monotonic()
+        document = _to_document(url, html)
+        outcome.timed("parse", started)
+        return document
+    except Exception as exc:  # pragma: no cover - network failures are handled silently
+        if exc not in outcome.errors:
+            outcome.errors.append(exc)
         return None
 
 
-def fetch_documents(
-    urls: Iterable[str],
+async def _fetch_single_async(
+    url: str,
+    strategy: FetchStrategy,
+    client: AsyncHttpClient,
+    context: FetchContext,
+    outcome: FetchOutcome,
+) -> Optional[RawDocument]:
+    cache, breaker, validators, transfer = context.cache, context.breaker, context.validators, context.transfer
+    if cache is not None:
+        document = _from_cache(url, strategy, cache)
+        if document is not None or cache.offline:
+            outcome.source = "cache"
+            return document
+    headers = strategy.as_headers()
+    if validators is not None:
+        headers.update(validators.request_headers(url))
+    try:
+        for attempt in range(strategy.max_retries + 1):
+            if breaker is not None and not breaker.allow(url):
+                outcome.source = "circuit_open"
+                return None
+            delay = context.limiter.reserve(url, strategy.per_request_delay)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            outcome.attempts += 1
+            sent = time.monotonic()
+            try:
+                response = await client.fetch(
+                    url, headers, strategy.timeout, strategy.body_limits, timings=outcome.phases
+                )
+                outcome.latency = time.monotonic() - sent
+                outcome.status = response.status
+                outcome.wire_bytes += response.wire_bytes
+                outcome.decoded_bytes += len(response.body)
+                if breaker is not None:
+                    breaker.record(url, None)
+                if transfer is not None:
+                    encoding = response.headers.get("Content-Encoding") or "identity"
+                    transfer.record(response.wire_bytes, len(response.body), encoding)
+                if validators is not None:
+                    validators.update(url, response.headers)
+                html = response.text
+                if cache is not None:
+                    cache.put(url, strategy.headers, html)
+                started = time.monotonic()
+                document = _to_document(url, html)
+                outcome.timed("parse", started)
+                return document
+            except Exception as exc:
+                outcome.failed_attempt(exc, sent)
+                if breaker is not None:
+                    breaker.record(url, exc)
+                if validators is not None and _is_not_modified(exc):
+                    validators.record_not_modified(url)
+                    return None
+                backoff = _retry_delay(url, attempt, exc, strategy, context)
+                if backoff is None:
+                    raise
+                await asyncio.sleep(backoff)
+    except Exception as exc:  # network failures are handled silently, as in `_fetch_single`
+        if exc not in outcome.errors:
+            outcome.errors.append(exc)
+        return None
+    return None
+
+
+def _failed(document: Optional[RawDocument], outcome: FetchOutcome) -> bool:
+    return document is None and bool(outcome.errors) and not _is_not_modified(outcome.errors[-1])
+
+
+def _fetch_record(
+    url: str,
+    channel: str,
+    document: Optional[RawDocument],
+    outcome: FetchOutcome,
+    total: float,
+) -> FetchRecord:
+    failure = None
+    if _failed(document, outcome):
+        failure = failure_reason(outcome.errors[-1])
+    elif document is None and outcome.source in ("cache", "circuit_open"):
+        failure = "not_cached" if outcome.source == "cache" else "circuit_open"
+    return FetchRecord(
+        url=url,
+        channel=channel or "general",
+        ok=document is not None,
+        source=outcome.source,
+        status=outcome.status,
+        retries=max(0, outcome.attempts - 1),
+        failure=failure,
+        wire_bytes=outcome.wire_bytes,
+        decoded_bytes=outcome.decoded_bytes,
+        total=round(total, 6),
+        phases={name: round(seconds, 6) for name, seconds in outcome.phases.items()},
+    )
+
+
+# Called with a job's position, its document, its outcome and when it started.
+_Settle = Callable[[int, Optional[RawDocument], FetchOutcome, float], None]
+
+
+async def _fetch_all_async(
+    jobs: Sequence[FetchJob],
+    strategy: FetchStrategy,
+    concurrency: int,
+    context: FetchContext,
+    settle: _Settle,
+    dispatcher: JobDispatcher | None = None,
+) -> None:
+    pending = iter(interleave_by_host(url for url, _ in jobs))
+    # Set whenever a job finishes, to wake workers waiting on a channel limit.
+    finished = asyncio.Event()
+
+    def next_position() -> int | None:
+        if dispatcher is None:
+            return next(pending, None)
+        return dispatcher.take_nowait()
+
+    async def worker(client: AsyncHttpClient) -> None:
+        while (position := next_position()) is not None:
+            if position == JobDispatcher.BUSY:
+                finished.clear()
+                await finished.wait()
+                continue
+            url, job_strategy = jobs[position]
+            outcome = FetchOutcome()
+            started = time.monotonic()
+            document = await _fetch_single_async(url, job_strategy, client, context, outcome)
+            settle(position, document, outcome, started)
+            finished.set()
+
+    async with AsyncHttpClient(strategy.max_connections_per_host) as client:
+        await asyncio.gather(*(worker(client) for _ in range(min(concurrency, len(jobs)))))
+
+
+def fetch_jobs(
+    jobs: Sequence[FetchJob],
     strategy: FetchStrategy | None = None,
     concurrency: int = 1,
-) -> List[RawDocument]:
+    context: FetchContext | None = None,
+    on_result: ResultCallback | None = None,
+    groups: Sequence[str] | None = None,
+) -> List[Optional[RawDocument]]:
+    """Fetch ``(url, strategy)`` jobs on one worker pool; results align with ``jobs``.
+
+    ``groups[i]`` names the channel of ``jobs[i]``; ``on_result`` receives each result as it completes.
+    """
+
     strategy = strategy or FetchStrategy()
+    context = context or FetchContext()
+    if context.budget is None:
+        context = replace(context, budget=RetryBudget(strategy.retry_budget))
     normalized_concurrency = max(1, concurrency)
+    groups = groups or [""] * len(jobs)
+
+    documents: list[Optional[RawDocument]] = []
+    if on_result is None:
+        documents = [None] * len(jobs)
+        on_result = documents.__setitem__
+
+    order = interleave_by_host(url for url, _ in jobs)
+    dispatcher = None
+    if context.adaptive is not None:
+        dispatcher = context.adaptive.dispatcher(groups, order, normalized_concurrency)
+    metrics = context.metrics
 
-    if normalized_concurrency == 1:
-        documents = [_fetch_single(url, strategy) for url in urls]
+    def settle(position: int, document: Optional[RawDocument], outcome: FetchOutcome, started: float) -> None:
+        if dispatcher is not None:
+            dispatcher.finish(position, outcome.latency, _failed(document, outcome), outcome.congested)
+        if metrics is not None:
+            ended = time.monotonic()
+            record = _fetch_record(jobs[position][0], groups[position], document, outcome, ended - started)
+            metrics.record(record, started, ended)
+        on_result(position, document)
+
+    if strategy.engine == "async":
+        asyncio.run(_fetch_all_async(jobs, strategy, normalized_concurrency, context, settle, dispatcher))
+        return documents
+
+    def fetch(position: int) -> None:
+        url, job_strategy = jobs[position]
+        outcome = FetchOutcome()
+        started = time.monotonic()
+        document = _fetch_single(url, job_strategy, context, outcome)
+        settle(position, document, outcome, started)
+
+    if dispatcher is not None:
+
+        def worker() -> None:
+            while (position := dispatcher.take()) is not None:
+                fetch(position)
+
+        with ThreadPoolExecutor(max_workers=normalized_concurrency) as executor:
+            for future in [executor.submit(worker) for _ in range(min(normalized_concurrency, len(jobs)))]:
+                future.result()
+    elif normalized_concurrency == 1:
+        for position in order:
+            fetch(position)
     else:
         with ThreadPoolExecutor(max_workers=normalized_concurrency) as executor:
-            documents = list(executor.map(lambda u: _fetch_single(u, strategy), urls))
+            list(executor.map(fetch, order))
+    return documents
+
 
+def fetch_documents(
+    urls: Iterable[str],
+    strategy: FetchStrategy | None = None,
+    concurrency: int = 1,
+    context: FetchContext | None = None,
+) -> List[RawDocument]:
+    """Fetch ``urls`` and return the documents that could be retrieved, in input order."""
+
+    strategy = strategy or FetchStrategy()
+    documents = fetch_jobs([(url, strategy) for url in urls], strategy, concurrency, context)
     return [doc for doc in documents if doc]
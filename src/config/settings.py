@@ -31,15 +31,37 @@ class TaskConfig:
     urls: List[str] = field(default_factory=list)
     product_type: str | None = None
     concurrency: int = 1
+    fetch_engine: str | None = None
+    retry_budget: int | None = None
     use_llm: bool = False
     llm_model: str | None = None
     data_dir: Optional[Path] = None
+    blob_codec: str | None = None
+    segment_max_bytes: int | None = None
+    compact_min_segments: int | None = None
+    retention_max_age_days: float | None = None
+    retention_max_docs_per_channel: int | None = None
+    retention_max_bytes: int | None = None
     report_output: Optional[Path] = None
     report_title: Optional[str] = None
     interval_minutes: int = 60
+    # Stored URLs are rechecked once last checked this long ago. None means one run
+    # interval, shortened so that pages the previous run checked are due at the next.
+    refetch_after_hours: float | None = None
+    # `AimdSettings` overrides; set (even empty) to tune concurrency per channel.
+    adaptive_concurrency: Dict[str, Any] | None = None
+
+    @property
+    def has_retention(self) -> bool:
+        return any(
+            limit is not None
+            for limit in (self.retention_max_age_days, self.retention_max_docs_per_channel, self.retention_max_bytes)
+        )
 
     @classmethod
     def from_dict(cls, name: str, data: Dict[str, Any], defaults: Dict[str, Any]) -> "TaskConfig":
+        refetch_after_hours = data.get("refetch_after_hours", defaults.get("refetch_after_hours"))
+        adaptive = data.get("adaptive_concurrency", defaults.get("adaptive_concurrency"))
         return cls(
             name=name,
             keywords=list(data.get("keywords") or []),
@@ -47,12 +69,30 @@ class TaskConfig:
             urls=list(data.get("urls") or []),
             product_type=data.get("product_type") or defaults.get("product_type"),
             concurrency=int(data.get("concurrency", defaults.get("concurrency", 1))),
+            fetch_engine=data.get("fetch_engine") or defaults.get("fetch_engine"),
+            retry_budget=int(data["retry_budget"]) if data.get("retry_budget") is not None else None,
             use_llm=bool(data.get("use_llm", defaults.get("use_llm", False))),
             llm_model=data.get("llm_model") or defaults.get("llm_model"),
             data_dir=Path(data["data_dir"]) if data.get("data_dir") else defaults.get("data_dir"),
+            blob_codec=data.get("blob_codec"),
+            segment_max_bytes=int(data["segment_max_bytes"]) if data.get("segment_max_bytes") else None,
+            compact_min_segments=int(data["compact_min_segments"]) if data.get("compact_min_segments") else None,
+            retention_max_age_days=(
+                float(data["retention_max_age_days"]) if data.get("retention_max_age_days") else None
+            ),
+            retention_max_docs_per_channel=(
+                int(data["retention_max_docs_per_channel"]) if data.get("retention_max_docs_per_channel") else None
+            ),
+            retention_max_bytes=int(data["retention_max_bytes"]) if data.get("retention_max_bytes") else None,
             report_output=Path(data["report_output"]) if data.get("report_output") else None,
             report_title=data.get("report_title"),
             interval_minutes=int(data.get("interval_minutes", defaults.get("interval_minutes", 60))),
+            refetch_after_hours=float(refetch_after_hours) if refetch_after_hours is not None else None,
+            adaptive_concurrency=(
+                (dict(adaptive) if isinstance(adaptive, dict) else {})
+                if adaptive is not None and adaptive is not False
+                else None
+            ),
         )
 
 
@@ -80,7 +120,10 @@ class AppConfig:
             "use_llm": raw.get("default_use_llm", False),
             "product_type": raw.get("default_product_type"),
             "concurrency": raw.get("default_concurrency", 1),
+            "fetch_engine": raw.get("default_fetch_engine"),
             "interval_minutes": raw.get("default_interval_minutes", 60),
+            "refetch_after_hours": raw.get("default_refetch_after_hours"),
+            "adaptive_concurrency": raw.get("default_adaptive_concurrency"),
         }
 
         tasks: list[TaskConfig] = []
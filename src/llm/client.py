@@ -6,6 +6,8 @@ import urllib.request
 from dataclasses import dataclass
 from typing import Any, Dict, Optional
 
+from src.collect.content_encoding import ACCEPT_ENCODING, TransferStats, read_response
+
 
 DEFAULT_MODEL = "gpt-4o-mini"
 
@@ -20,7 +22,8 @@ class LLMClient:
     """Lightweight OpenAI-compatible chat completion client.
 
     Uses urllib from the standard library to avoid extra dependencies and keeps the
-    surface small so it can be easily mocked in tests.
+    surface small so it can be easily mocked in tests. Responses are requested
+    compressed and their wire/decoded sizes collected in ``transfer``.
     """
 
     def __init__(
@@ -34,6 +37,7 @@ class LLMClient:
         self.base_url = (base_url or os.getenv("OPENAI_BASE_URL") or "https://api.openai.com/v1").rstrip("/")
         self.default_model = model
         self.timeout = timeout
+        self.transfer = TransferStats()
 
     def chat(
         self,
@@ -62,11 +66,14 @@ class LLMClient:
             headers={
                 "Content-Type": "application/json",
                 "Authorization": f"Bearer {self.api_key}",
+                "Accept-Encoding": ACCEPT_ENCODING,
             },
         )
         with urllib.request.urlopen(request, timeout=self.timeout) as response:  # noqa: S310
+            raw, decoder = read_response(response, response.headers.get("Content-Encoding"))
+            self.transfer.record(decoder.wire_bytes, decoder.decoded_bytes, decoder.encoding)
             charset = response.headers.get_content_charset() or "utf-8"
-            body = response.read().decode(charset)
+            body = raw.decode(charset)
         parsed = json.loads(body)
         return self._extract_content(parsed)
 
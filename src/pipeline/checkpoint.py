@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+from typing import IO, Iterable, List
+
+CHECKPOINT_FILENAME = "fetch_checkpoint.txt"
+DONE_SUFFIX = ".done"
+
+
+class FetchCheckpoint:
+    """On-disk record of a fetch run: every URL it was given and those it finished.
+
+    `start` writes the URL list once (atomically); `mark_done` appends each
+    finished URL to a side log and flushes it, so the cost per URL is one short
+    append no matter how long the run is. An interrupted run leaves both files
+    behind and `pending` returns exactly the URLs that still need work; a run
+    that completes calls `clear`.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.done_path = path.with_name(path.name + DONE_SUFFIX)
+        self._lock = threading.Lock()
+        self._done_file: IO[str] | None = None
+
+    @classmethod
+    def for_data_dir(cls, data_dir: Path) -> "FetchCheckpoint":
+        return cls(Path(data_dir) / CHECKPOINT_FILENAME)
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def start(self, urls: Iterable[str]) -> None:
+        """Begin a new run over ``urls``, discarding any previous checkpoint."""
+
+        self.close()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + f".{os.getpid()}.tmp")
+        with tmp_path.open("w", encoding="utf-8") as handle:
+            for url in urls:
+                handle.write(url + "\n")
+        self.done_path.unlink(missing_ok=True)
+        os.replace(tmp_path, self.path)
+
+    def finished(self) -> set[str]:
+        try:
+            with self.done_path.open(encoding="utf-8") as handle:
+                # Skip a last line torn by a crash: its prefix might be another URL.
+                return {line[:-1] for line in handle if line.endswith("\n")}
+        except FileNotFoundError:
+            return set()
+
+    def pending(self) -> List[str]:
+        """URLs of the checkpointed run that are not marked done, in their original order."""
+
+        finished = self.finished()
+        with self.path.open(encoding="utf-8") as handle:
+            return [url for url in (line.rstrip("\n") for line in handle) if url and url not in finished]
+
+    def mark_done(self, urls: Iterable[str]) -> None:
+        lines = "".join(url + "\n" for url in urls)
+        if not lines:
+            return
+        with self._lock:
+            if self._done_file is None:
+                self._done_file = self.done_path.open("a", encoding="utf-8")
+            self._done_file.write(lines)
+            self._done_file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._done_file is not None:
+                self._done_file.close()
+                self._done_file = None
+
+    def clear(self) -> None:
+        """Forget the run once every URL is done."""
+
+        self.close()
+        self.done_path.unlink(missing_ok=True)
+        self.path.unlink(missing_ok=True)
@@ -1,27 +1,55 @@
 from __future__ import annotations
 
+import itertools
 import json
+import math
+import threading
+from dataclasses import asdict
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Iterable, List
+from typing import Callable, Dict, Iterable, Iterator, List, TypeVar
 
 from src.analysis.report import build_report
+from src.collect.adaptive import AdaptiveConcurrency, AimdSettings
+from src.collect.canonical_url import canonicalize_urls
 from src.collect.channel_fetchers import collect_with_routing
+from src.collect.circuit_breaker import CircuitBreaker
+from src.collect.content_encoding import TransferStats
+from src.collect.fetch_metrics import FetchMetrics
 from src.collect.fetch_strategy import FetchStrategy, get_fetch_strategy
 from src.collect.keyword_generator import generate_keywords_from_brief
+from src.collect.response_cache import ResponseCache
 from src.collect.source_discovery import discover_sources
+from src.collect.validators import ValidatorCache
+from src.collect.web_scraper import FetchContext
+from src.llm.client import LLMClient
+from src.pipeline.checkpoint import FetchCheckpoint
 from src.pipeline.normalize import normalize_documents
-from src.storage.data_store import DataStore, NormalizedDocument
+from src.storage.data_store import DataStore, RawDocument, Summary, _batched
+from src.storage.sqlite_store import SQLITE_FILENAME, migrate_jsonl_to_sqlite
+from src.storage.writer import StoreWriter
 from src.summarize.basic import summarize_documents
 from src.summarize.llm import summarize_documents_llm
 
+T = TypeVar("T")
+U = TypeVar("U")
+
+# Documents handed to normalize/summarize per step, so runs stay at constant memory.
+STREAM_BATCH_SIZE = 200
+# Fetched documents handed to the store writer per write.
+FETCH_BATCH_SIZE = 50
+
 
 def _print_json(data: object) -> None:
     print(json.dumps(data, ensure_ascii=False, indent=2))
 
 
 def run_discover(keywords: List[str], product_type: str | None) -> List[str]:
-    sources = discover_sources(keywords, product_type=product_type)
-    _print_json({"keywords": keywords, "product_type": product_type, "sources": sources})
+    transfer = TransferStats()
+    sources = discover_sources(keywords, product_type=product_type, transfer=transfer)
+    _print_json(
+        {"keywords": keywords, "product_type": product_type, "sources": sources, "transfer": transfer.summary()}
+    )
     return sources
 
 
@@ -46,6 +74,8 @@ def build_fetch_strategy(
     timeout: float | None,
     max_retries: int | None,
     delay: float | None,
+    engine: str | None = None,
+    retry_budget: int | None = None,
 ) -> FetchStrategy:
     base = get_fetch_strategy(product_type)
     if user_agent:
@@ -56,6 +86,10 @@ def build_fetch_strategy(
         base.max_retries = max_retries
     if delay is not None:
         base.per_request_delay = delay
+    if engine:
+        base.engine = engine
+    if retry_budget is not None:
+        base.retry_budget = retry_budget
     return base
 
 
@@ -65,71 +99,191 @@ def run_fetch(
     strategy: FetchStrategy,
     product_type: str | None = None,
     concurrency: int = 1,
-) -> None:
-    documents = collect_with_routing(
-        urls,
-        product_type=product_type,
-        base_strategy=strategy,
-        concurrency=concurrency,
-    )
-    added = store.add_raw_documents(documents)
-    _print_json(
-        {
-            "fetched": len(documents),
-            "added": added,
-            "file": str(store.data_dir / "raw.jsonl"),
-            "channels": sorted({doc.channel or "general" for doc in documents}),
-            "concurrency": concurrency,
-        }
-    )
+    offline: bool = False,
+    resume: bool = False,
+    refetch_after_hours: float | None = None,
+    adaptive: AimdSettings | None = None,
+) -> Dict[str, object]:
+    """Fetch ``urls`` into ``store`` in checkpointed batches; return the printed run summary."""
+
+    checkpoint = FetchCheckpoint.for_data_dir(store.data_dir)
+    resuming = resume and checkpoint.exists()
+    skipped = 0
+    if resuming:
+        url_list = checkpoint.pending()
+        skipped = len(checkpoint.finished())
+    else:
+        url_list = canonicalize_urls(urls)
+    cache = ResponseCache.for_data_dir(store.data_dir, offline=offline)
+    validators = ValidatorCache.for_data_dir(store.data_dir)
+    transfer = TransferStats()
+    controller = AdaptiveConcurrency(adaptive) if adaptive is not None else None
+    breaker = CircuitBreaker.for_data_dir(store.data_dir)
+    metrics = FetchMetrics.for_data_dir(store.data_dir)
+    cutoff = _refetch_cutoff(refetch_after_hours)
+    wanted: list[str] = []
+    for batch in _batched(url_list, STREAM_BATCH_SIZE):
+        stored = store.get_many(batch, "raw")
+        # A 304 only means "unchanged" if we still hold the document it refers to.
+        validators.forget(url for url in batch if url not in stored)
+        wanted.extend(
+            url
+            for url in batch
+            if cutoff is None
+            or url not in stored
+            # Unchanged pages and 304s leave `fetched_at` as it was; the validators know when they were checked.
+            or max(stored[url].fetched_at, validators.checked_at(url) or "") < cutoff
+        )
+    fresh = len(url_list) - len(wanted)
+    url_list = wanted
+    if not resuming:
+        checkpoint.start(url_list)
+
+    lock = threading.Lock()
+    pending: list[RawDocument] = []
+    channels: set[str] = set()
+    fetched = 0
+    writer = StoreWriter(store, on_written=lambda _, docs: checkpoint.mark_done(doc.url for doc in docs))
+
+    def on_document(url: str, doc: RawDocument | None) -> None:
+        nonlocal fetched
+        if doc is None:
+            checkpoint.mark_done([url])
+            return
+        with lock:
+            fetched += 1
+            channels.add(doc.channel or "general")
+            pending.append(doc)
+            if len(pending) < FETCH_BATCH_SIZE:
+                return
+            batch = pending[:]
+            pending.clear()
+        writer.add_raw_documents(batch)
+
+    try:
+        collect_with_routing(
+            url_list,
+            product_type=product_type,
+            base_strategy=strategy,
+            concurrency=concurrency,
+            context=FetchContext(
+                validators=validators,
+                cache=cache,
+                transfer=transfer,
+                breaker=breaker,
+                metrics=metrics,
+                adaptive=controller,
+            ),
+            on_document=on_document,
+        )
+    finally:
+        validators.save()
+        cache.save()
+        breaker.save()
+        metrics.close()
+        # Whatever was fetched before an interruption is still stored and checkpointed.
+        try:
+            with lock:
+                writer.add_raw_documents(pending)
+        finally:
+            added = writer.close()["raw"]
+            checkpoint.close()
+    checkpoint.clear()
+    summary: Dict[str, object] = {
+        "fetched": fetched,
+        "fresh_skipped": fresh,
+        "unchanged": validators.not_modified,
+        "cache_hits": cache.hits,
+        "transfer": transfer.summary(),
+        "added": added,
+        "resumed_skipped": skipped,
+        "circuit_skipped": breaker.skipped,
+        "open_hosts": breaker.open_hosts(),
+        "metrics": metrics.summary(),
+        "file": str(store.raw_file),
+        "channels": sorted(channels),
+        "concurrency": concurrency,
+    }
+    if controller is not None:
+        summary["adaptive_concurrency"] = controller.summary()
+    _print_json(summary)
+    return summary
+
+
+def _refetch_cutoff(hours: float | None) -> str | None:
+    """Oldest ``fetched_at`` that still counts as fresh, in the ISO form `utc_now_iso` writes."""
+
+    if hours is None:
+        return None
+    if math.isinf(hours):
+        return ""
+    return (datetime.utcnow() - timedelta(hours=hours)).isoformat() + "Z"
+
+
+def _stream_in_batches(
+    items: Iterable[T],
+    transform: Callable[[List[T]], List[U]],
+    counter: Dict[str, int],
+    size: int | None = None,
+) -> Iterator[U]:
+    """Apply a list-based stage to ``items`` a batch at a time, counting outputs."""
+
+    for batch in _batched(items, size or STREAM_BATCH_SIZE):
+        results = transform(batch)
+        counter["count"] += len(results)
+        yield from results
 
 
-def run_normalize(store: DataStore) -> None:
-    raw_docs = store.load_raw_documents()
-    normalized = normalize_documents(raw_docs)
-    added = store.add_normalized_documents(normalized)
-    _print_json({"normalized": len(normalized), "added": added, "file": str(store.data_dir / 'normalized.jsonl')})
+def run_normalize(store: DataStore, since: str | None = None) -> None:
+    counter = {"count": 0}
+    raw_docs = store.iter_raw_documents(since=since)
+    added = store.add_normalized_documents(_stream_in_batches(raw_docs, normalize_documents, counter))
+    _print_json({"normalized": counter["count"], "added": added, "file": str(store.normalized_file)})
 
 
-def run_summarize(store: DataStore, *, use_llm: bool = False, llm_model: str | None = None) -> None:
-    docs = store.load_normalized_documents() or store.load_raw_documents()
+def run_summarize(
+    store: DataStore,
+    *,
+    use_llm: bool = False,
+    llm_model: str | None = None,
+    since: str | None = None,
+) -> None:
+    docs: Iterator = store.iter_normalized_documents(since=since)
+    first = next(docs, None)
+    source = "normalized"
+    if first is None:
+        docs = store.iter_raw_documents(since=since)
+        source = "raw"
+    else:
+        docs = itertools.chain([first], docs)
+
+    client: LLMClient | None = None
     if use_llm:
-        summaries = summarize_documents_llm(docs, model=llm_model, fallback_to_basic=True)
+        # One client per run, so its transfer totals cover just this run.
+        client = LLMClient()
+
+        def summarize(batch: List) -> List[Summary]:
+            return summarize_documents_llm(batch, client=client, model=llm_model, fallback_to_basic=True)
     else:
-        summaries = summarize_documents(docs)
-    added = store.add_summaries(summaries)
-    _print_json({
-        "summarized": len(summaries),
+        summarize = summarize_documents
+    counter = {"count": 0}
+    added = store.add_summaries(_stream_in_batches(docs, summarize, counter))
+    summary: Dict[str, object] = {
+        "summarized": counter["count"],
         "added": added,
-        "source": "normalized" if store.load_normalized_documents() else "raw",
-        "file": str(store.data_dir / 'summary.jsonl'),
+        "source": source,
+        "file": str(store.summary_file),
         "summarizer": "llm" if use_llm else "basic",
-    })
-
-
-def _raw_to_normalized(raw_docs: List) -> List[NormalizedDocument]:
-    normalized_docs: list[NormalizedDocument] = []
-    for doc in raw_docs:
-        normalized_docs.append(
-            NormalizedDocument(
-                url=getattr(doc, "url", ""),
-                title=getattr(doc, "title", ""),
-                content=getattr(doc, "content", ""),
-                fetched_at=getattr(doc, "fetched_at", ""),
-                channel=getattr(doc, "channel", None),
-                language=getattr(doc, "language", None),
-                source=getattr(doc, "source", None),
-                normalized_at=getattr(doc, "normalized_at", ""),
-            )
-        )
-    return normalized_docs
+    }
+    if client is not None:
+        summary["transfer"] = client.transfer.summary()
+    _print_json(summary)
 
 
 def run_report(store: DataStore, title: str, output: Path) -> None:
-    normalized_docs = store.load_normalized_documents()
-    raw_docs = store.load_raw_documents()
-    docs_for_report = normalized_docs or _raw_to_normalized(raw_docs)
-    summaries = store.load_summaries()
+    # Reports only read metadata, so blob-backed bodies are never inflated here.
+    docs_for_report = list(store.iter_normalized_documents()) or list(store.iter_raw_documents())
+    summaries = list(store.iter_summaries())
 
     if not docs_for_report:
         _print_json({"error": "No documents available to build a report."})
@@ -148,6 +302,29 @@ def run_report(store: DataStore, title: str, output: Path) -> None:
     )
 
 
+def run_migrate(data_dir: Path) -> None:
+    counts = migrate_jsonl_to_sqlite(data_dir)
+    _print_json({"migrated": counts, "engine": "sqlite", "file": str(data_dir / SQLITE_FILENAME)})
+
+
+def run_show(store: DataStore, urls: List[str], collection: str = "normalized") -> None:
+    found = store.get_many(urls, collection)
+    _print_json(
+        {
+            "collection": collection,
+            "documents": [asdict(record) for record in found.values()],
+            "missing": [url for url in urls if url not in found],
+        }
+    )
+
+
+def run_compact(store: DataStore, segmented: bool = False) -> None:
+    if not hasattr(store, "compact"):
+        _print_json({"error": f"Compaction is not supported by the {store.engine} engine."})
+        return
+    _print_json({"compacted": store.compact(segmented=segmented), "data_dir": str(store.data_dir)})
+
+
 def run_pipeline(
     keywords: List[str] | None,
     urls: List[str] | None,
@@ -158,15 +335,34 @@ def run_pipeline(
     keyword_brief: str | None = None,
     llm_model: str | None = None,
     use_llm: bool = False,
-) -> None:
+    since: str | None = None,
+    offline: bool = False,
+    resume: bool = False,
+    refetch_after_hours: float | None = None,
+    adaptive: AimdSettings | None = None,
+) -> Dict[str, object] | None:
+    """Run discover -> fetch -> normalize -> summarize; return the fetch summary."""
+
+    resuming = resume and FetchCheckpoint.for_data_dir(store.data_dir).exists()
     discovered: List[str] = []
-    if keywords or keyword_brief:
+    if (keywords or keyword_brief) and not offline and not resuming:
         prepared_keywords = _prepare_keywords(keywords, keyword_brief, llm_model)
         discovered = run_discover(prepared_keywords, product_type)
     combined_urls = list(dict.fromkeys((urls or []) + discovered))
-    if not combined_urls:
+    if not combined_urls and not resuming:
         _print_json({"error": "No URLs provided or discovered."})
-        return
-    run_fetch(combined_urls, store, strategy, product_type=product_type, concurrency=concurrency)
-    run_normalize(store)
-    run_summarize(store, use_llm=use_llm, llm_model=llm_model)
+        return None
+    fetched = run_fetch(
+        combined_urls,
+        store,
+        strategy,
+        product_type=product_type,
+        concurrency=concurrency,
+        offline=offline,
+        resume=resuming,
+        refetch_after_hours=refetch_after_hours,
+        adaptive=adaptive,
+    )
+    run_normalize(store, since=since)
+    run_summarize(store, use_llm=use_llm, llm_model=llm_model, since=since)
+    return fetched
@@ -1,14 +1,17 @@
 from __future__ import annotations
 
+import threading
 import time
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Callable, Dict, Optional
+from typing import Callable, Dict, List, Optional
 
+from src.collect.adaptive import AimdSettings
 from src.pipeline.runtime import build_fetch_strategy, run_pipeline, run_report
 from src.config.settings import AppConfig, TaskConfig
 from src.monitoring.monitor import PipelineMonitor, RunResult
-from src.storage.data_store import DataStore
+from src.storage.data_store import open_data_store
+from src.storage.retention import RetentionPolicy
 
 PipelineExecutor = Callable[[TaskConfig, AppConfig], Dict]
 ReportExecutor = Callable[[TaskConfig, AppConfig], Optional[Path]]
@@ -26,6 +29,11 @@ class ScheduledRunner:
         self.monitor = monitor
         self.pipeline_executor = pipeline_executor or self._run_pipeline_task
         self.report_executor = report_executor or self._run_report
+        # Start time of each task's last successful run; later runs only
+        # normalize/summarize documents fetched since then.
+        self.last_success: Dict[str, str] = {}
+        # When each task's last run ended; pages it checked are due again at the next run.
+        self.last_finished: Dict[str, datetime] = {}
 
     def run_once(self) -> None:
         for task in self.config.tasks:
@@ -40,16 +48,59 @@ class ScheduledRunner:
     ) -> None:
         next_run: Dict[str, datetime] = {task.name: datetime.utcnow() for task in self.config.tasks}
         cycles = 0
+        compactor: threading.Thread | None = None
         while True:
+            if compactor is not None:
+                compactor.join()
             now = datetime.utcnow()
+            executed: list[TaskConfig] = []
             for task in self.config.tasks:
                 if now >= next_run[task.name]:
                     self._execute(task)
+                    executed.append(task)
                     next_run[task.name] = now + timedelta(minutes=task.interval_minutes)
             cycles += 1
             if max_cycles is not None and cycles >= max_cycles:
                 break
+            # Compaction overlaps the idle sleep instead of delaying the next cycle.
+            compactor = threading.Thread(target=self.compact_data_dirs, args=(executed,), daemon=True)
+            compactor.start()
             sleep_fn(sleep_seconds)
+        if compactor is not None:
+            compactor.join()
+
+    def compact_data_dirs(self, tasks: List[TaskConfig]) -> None:
+        for task in tasks:
+            if not task.compact_min_segments and not task.has_retention:
+                continue
+            store = open_data_store(
+                task.data_dir or self.config.default_data_dir,
+                segment_max_bytes=task.segment_max_bytes,
+                retention=_retention_policy(task),
+            )
+            if not hasattr(store, "needs_compaction") or not store.needs_compaction(task.compact_min_segments):
+                continue
+            started = self.monitor.start()
+            detail: Dict[str, object] = {}
+            error: str | None = None
+            try:
+                detail = {"compacted": store.compact()}
+                status = "success"
+            except Exception as exc:  # pragma: no cover - surfaced via monitor output
+                status = "failed"
+                error = str(exc)
+            finished_at, duration = self.monitor.finish(started)
+            self.monitor.record(
+                RunResult(
+                    task=f"{task.name}:compact",
+                    status=status,
+                    started_at=started.isoformat() + "Z",
+                    finished_at=finished_at,
+                    duration_seconds=duration,
+                    detail=detail,
+                    error=error,
+                )
+            )
 
     def _execute(self, task: TaskConfig) -> None:
         started = self.monitor.start()
@@ -62,9 +113,11 @@ class ScheduledRunner:
                 if report_path:
                     detail["report_file"] = str(report_path)
             status = "success"
+            self.last_success[task.name] = started.isoformat() + "Z"
         except Exception as exc:  # pragma: no cover - tested via monitor output
             status = "failed"
             error = str(exc)
+        self.last_finished[task.name] = datetime.utcnow()
         finished_at, duration = self.monitor.finish(started)
         self.monitor.record(
             RunResult(
@@ -80,9 +133,18 @@ class ScheduledRunner:
 
     def _run_pipeline_task(self, task: TaskConfig, config: AppConfig) -> Dict:
         data_dir = task.data_dir or config.default_data_dir
-        store = DataStore(data_dir=data_dir)
-        strategy = build_fetch_strategy(task.product_type or config.default_product_type, None, None, None, None)
-        run_pipeline(
+        store = open_data_store(data_dir, blob_codec=task.blob_codec, segment_max_bytes=task.segment_max_bytes)
+        strategy = build_fetch_strategy(
+            task.product_type or config.default_product_type,
+            None,
+            None,
+            None,
+            None,
+            engine=task.fetch_engine,
+            retry_budget=task.retry_budget,
+        )
+        adaptive = AimdSettings(**task.adaptive_concurrency) if task.adaptive_concurrency is not None else None
+        fetched = run_pipeline(
             task.keywords,
             task.urls,
             task.product_type or config.default_product_type,
@@ -92,19 +154,38 @@ class ScheduledRunner:
             keyword_brief=task.keyword_brief,
             llm_model=task.llm_model or config.default_llm_model,
             use_llm=task.use_llm or config.default_use_llm,
+            since=self.last_success.get(task.name),
+            refetch_after_hours=self._refetch_window(task),
+            adaptive=adaptive,
         )
-        return {
+        detail: Dict[str, object] = {
             "data_dir": str(data_dir),
             "keywords": task.keywords,
             "urls": task.urls,
             "product_type": task.product_type or config.default_product_type,
         }
+        if fetched and "adaptive_concurrency" in fetched:
+            detail["adaptive_concurrency"] = fetched["adaptive_concurrency"]
+        if fetched and "metrics" in fetched:
+            detail["fetch_metrics"] = fetched["metrics"]
+        return detail
+
+    def _refetch_window(self, task: TaskConfig) -> float:
+        if task.refetch_after_hours is not None:
+            return task.refetch_after_hours
+        # The next run starts one interval after the previous one *started*, so
+        # a window of one interval would still hold pages checked late in it.
+        window = task.interval_minutes / 60
+        previous = self.last_finished.get(task.name)
+        if previous is not None:
+            window = min(window, (datetime.utcnow() - previous).total_seconds() / 3600)
+        return window
 
     def _run_report(self, task: TaskConfig, config: AppConfig) -> Optional[Path]:
         if not task.report_output:
             return None
         data_dir = task.data_dir or config.default_data_dir
-        store = DataStore(data_dir=data_dir)
+        store = open_data_store(data_dir)
         title = task.report_title or "产品研究报告"
         output = task.report_output
         output.parent.mkdir(parents=True, exist_ok=True)
@@ -112,6 +193,16 @@ class ScheduledRunner:
         return output
 
 
+def _retention_policy(task: TaskConfig) -> RetentionPolicy | None:
+    if not task.has_retention:
+        return None
+    return RetentionPolicy(
+        max_age_days=task.retention_max_age_days,
+        max_docs_per_channel=task.retention_max_docs_per_channel,
+        max_bytes=task.retention_max_bytes,
+    )
+
+
 def build_runner(config_path: Path, log_path: Optional[Path] = None) -> ScheduledRunner:
     config = AppConfig.load(config_path)
     log_dir = log_path.parent if log_path else config.log_dir
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import hashlib
+import lzma
+import os
+import threading
+import zlib
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Tuple
+
+BLOB_DIRNAME = "blobs"
+
+CODECS: Dict[str, Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]] = {
+    "zlib": (lambda data: zlib.compress(data, 6), zlib.decompress),
+    "lzma": (lzma.compress, lzma.decompress),
+}
+
+
+class BlobStore:
+    """Content-addressed, compressed storage for document bodies.
+
+    Each body is stored once under ``blobs/<aa>/<sha256>.<codec>`` and referred
+    to from JSONL rows as ``"<codec>:<sha256>"``, so mirrored or syndicated
+    pages that share a body share a single file.
+    """
+
+    def __init__(self, root: Path, codec: str = "zlib") -> None:
+        if codec not in CODECS:
+            raise ValueError(f"Unknown blob codec: {codec}")
+        self.root = root
+        self.codec = codec
+
+    def _path(self, digest: str, codec: str) -> Path:
+        return self.root / digest[:2] / f"{digest}.{codec}"
+
+    def put(self, text: str) -> str:
+        data = text.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest, self.codec)
+        try:
+            # A fresh mtime keeps a reused body out of a concurrent `remove_unreferenced`.
+            os.utime(path)
+        except FileNotFoundError:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            compress, _ = CODECS[self.codec]
+            tmp_path = path.with_name(path.name + f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(compress(data))
+            os.replace(tmp_path, path)
+        return f"{self.codec}:{digest}"
+
+    def get(self, ref: str) -> str:
+        codec, digest = ref.split(":", 1)
+        _, decompress = CODECS[codec]
+        return decompress(self._path(digest, codec).read_bytes()).decode("utf-8")
+
+    def remove_unreferenced(self, refs: Iterable[str], older_than: float) -> int:
+        """Delete blobs not in ``refs`` and last written before ``older_than``; return how many."""
+
+        keep = set(refs)
+        removed = 0
+        if not self.root.exists():
+            return 0
+        for path in self.root.glob("*/*"):
+            digest, _, codec = path.name.partition(".")
+            if codec not in CODECS or f"{codec}:{digest}" in keep:
+                continue
+            try:
+                if path.stat().st_mtime < older_than:
+                    path.unlink()
+                    removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
@@ -1,127 +1,508 @@
 from __future__ import annotations
 
 import json
-from dataclasses import asdict, dataclass
+import os
+import time
+from dataclasses import asdict
 from datetime import datetime
 from pathlib import Path
-from typing import Iterable, List
+from typing import Dict, Iterable, Iterator, List, Set, TypeVar
 
+from src.storage.blob_store import BLOB_DIRNAME, BlobStore
+from src.storage.locking import file_lock
+from src.storage.records import (
+    NormalizedDocument,
+    RawDocument,
+    Summary,
+    content_digest,
+    lazy_record,
+    unread_content_ref,
+)
+from src.storage.retention import RetentionPolicy, evicted_positions
+from src.storage.segments import DEFAULT_SEGMENT_BYTES, SegmentedLog, iter_lines, remove_segment_file
+from src.storage.url_index import UrlIndex, superseded_rows
+
+T = TypeVar("T")
 
 DEFAULT_DATA_DIR = Path("data")
+APPEND_BATCH_SIZE = 500
+# Collection name -> timestamp field used for segment time ranges.
+COLLECTIONS = {"raw": "fetched_at", "normalized": "fetched_at", "summary": "summarized_at"}
+
 
+class DataStore:
+    engine = "jsonl"
 
-@dataclass
-class RawDocument:
-    url: str
-    title: str
-    content: str
-    fetched_at: str
-    channel: str | None = None
+    def __init__(
+        self,
+        data_dir: Path = DEFAULT_DATA_DIR,
+        blob_codec: str | None = None,
+        segment_max_bytes: int | None = None,
+        segment_daily: bool = True,
+        retention: RetentionPolicy | None = None,
+    ) -> None:
+        """Open a JSONL data dir.
 
+        ``blob_codec`` ("zlib"/"lzma") stores new document bodies as blobs; rows
+        written that way keep only a ``content_ref`` and stay readable whatever
+        ``blob_codec`` later stores are opened with. ``segment_max_bytes`` lays
+        new collections out as rotating segments (see `SegmentedLog`); existing
+        single-file collections keep their layout until `compact` converts them.
+        ``retention`` limits what `compact` keeps.
+        """
 
-@dataclass
-class NormalizedDocument(RawDocument):
-    language: str | None = None
-    source: str | None = None
-    normalized_at: str = ""
+        self.data_dir = data_dir
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.blob_codec = blob_codec
+        self.blobs = BlobStore(self.data_dir / BLOB_DIRNAME, codec=blob_codec or "zlib")
+        self.segment_max_bytes = segment_max_bytes
+        self.segment_daily = segment_daily
+        self.retention = retention if retention is not None and retention.enabled else None
 
+    def _new_segment_log(self, name: str) -> SegmentedLog:
+        return SegmentedLog(
+            self.data_dir / name,
+            COLLECTIONS[name],
+            max_bytes=self.segment_max_bytes or DEFAULT_SEGMENT_BYTES,
+            daily=self.segment_daily,
+        )
 
-@dataclass
-class Summary:
-    url: str
-    bullet_points: List[str]
-    summarized_at: str
+    def _segment_log(self, name: str) -> SegmentedLog | None:
+        log = self._new_segment_log(name)
+        if log.exists() or (self.segment_max_bytes and not (self.data_dir / f"{name}.jsonl").exists()):
+            return log
+        return None
 
+    def _location(self, name: str) -> Path:
+        log = self._segment_log(name)
+        return log.directory if log else self.data_dir / f"{name}.jsonl"
 
-class DataStore:
-    def __init__(self, data_dir: Path = DEFAULT_DATA_DIR) -> None:
-        self.data_dir = data_dir
-        self.data_dir.mkdir(parents=True, exist_ok=True)
+    def _paths(self, name: str, since: str | None = None, until: str | None = None) -> List[Path]:
+        log = self._segment_log(name)
+        if log is None:
+            return [self.data_dir / f"{name}.jsonl"]
+        return log.paths(since, until)
 
     @property
     def raw_file(self) -> Path:
-        return self.data_dir / "raw.jsonl"
+        return self._location("raw")
 
     @property
     def summary_file(self) -> Path:
-        return self.data_dir / "summary.jsonl"
+        return self._location("summary")
 
     @property
     def normalized_file(self) -> Path:
-        return self.data_dir / "normalized.jsonl"
+        return self._location("normalized")
+
+    def _iter_lines(self, paths: Iterable[Path], skip: Dict[Path, Set[int]] | None = None) -> Iterator[bytes]:
+        for path in paths:
+            if not path.exists():
+                continue
+            stale = skip.get(path, ()) if skip else ()
+            offset = 0
+            with path.open("rb") as f:
+                for line in f:
+                    if line.strip() and offset not in stale:
+                        yield line
+                    offset += len(line)
+
+    def _iter_current(self, name: str, since: str | None, until: str | None) -> Iterator[bytes]:
+        """Lines of the latest version of every URL, from files overlapping ``[since, until)``."""
+
+        # Index sidecars are brought up to date under the writers' lock.
+        with self._lock(name):
+            stale = superseded_rows(self._paths(name))
+        return self._iter_lines(self._paths(name, since, until), stale)
+
+    def iter_raw_documents(
+        self,
+        *,
+        channel: str | None = None,
+        language: str | None = None,
+        since: str | None = None,
+        until: str | None = None,
+    ) -> Iterator[RawDocument]:
+        """Stream raw documents line by line, optionally filtered.
+
+        ``since``/``until`` bound ``fetched_at`` (inclusive/exclusive) and are
+        compared as ISO-8601 strings, matching how `utc_now_iso` writes them.
+        Segments whose time range falls outside the window are not opened.
+        """
+
+        for line in self._iter_current("raw", since, until):
+            doc = lazy_record(RawDocument, line, self.blobs)
+            if _record_matches(doc, channel, language, since, until):
+                yield doc
+
+    def iter_normalized_documents(
+        self,
+        *,
+        channel: str | None = None,
+        language: str | None = None,
+        since: str | None = None,
+        until: str | None = None,
+    ) -> Iterator[NormalizedDocument]:
+        for line in self._iter_current("normalized", since, until):
+            doc = lazy_record(NormalizedDocument, line, self.blobs)
+            if _record_matches(doc, channel, language, since, until):
+                yield doc
 
-    def _load_jsonl(self, path: Path) -> List[dict]:
-        if not path.exists():
-            return []
-        return [json.loads(line) for line in path.read_text().splitlines() if line.strip()]
+    def iter_summaries(self, *, since: str | None = None, until: str | None = None) -> Iterator[Summary]:
+        """Stream summaries, optionally bounded by ``summarized_at``."""
 
-    def _append_jsonl(self, path: Path, rows: Iterable[dict]) -> None:
-        with path.open("a", encoding="utf-8") as f:
-            for row in rows:
-                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        for line in self._iter_current("summary", since, until):
+            summary = lazy_record(Summary, line)
+            if since is None and until is None or _in_range(summary.summarized_at, since, until):
+                yield summary
+
+    def changed_since(self, since: str, collection: str = "normalized") -> Iterator[RawDocument | Summary]:
+        """Stream records that are new or whose content changed at or after ``since``.
+
+        Unchanged re-fetches write nothing (see `_append_new`), so the latest
+        version's timestamp is exactly when its content last changed, and
+        segments older than ``since`` are never opened.
+        """
+
+        if collection == "summary":
+            return self.iter_summaries(since=since)
+        if collection == "raw":
+            return self.iter_raw_documents(since=since)
+        return self.iter_normalized_documents(since=since)
 
     def load_raw_documents(self) -> List[RawDocument]:
-        documents: list[RawDocument] = []
-        for item in self._load_jsonl(self.raw_file):
-            documents.append(
-                RawDocument(
-                    url=item.get("url", ""),
-                    title=item.get("title", ""),
-                    content=item.get("content", ""),
-                    fetched_at=item.get("fetched_at", ""),
-                    channel=item.get("channel"),
-                )
-            )
-        return documents
+        return list(self.iter_raw_documents())
 
     def load_summaries(self) -> List[Summary]:
-        return [Summary(**item) for item in self._load_jsonl(self.summary_file)]
+        return list(self.iter_summaries())
 
     def load_normalized_documents(self) -> List[NormalizedDocument]:
-        documents: list[NormalizedDocument] = []
-        for item in self._load_jsonl(self.normalized_file):
-            documents.append(
-                NormalizedDocument(
-                    url=item.get("url", ""),
-                    title=item.get("title", ""),
-                    content=item.get("content", ""),
-                    fetched_at=item.get("fetched_at", ""),
-                    channel=item.get("channel"),
-                    language=item.get("language"),
-                    source=item.get("source"),
-                    normalized_at=item.get("normalized_at", ""),
-                )
-            )
-        return documents
-
-    def _existing_urls(self, path: Path) -> set[str]:
-        if not path.exists():
-            return set()
-        return {json.loads(line).get("url") for line in path.read_text().splitlines() if line.strip()}
-
-    def add_raw_documents(self, docs: Iterable[RawDocument]) -> int:
-        existing = self._existing_urls(self.raw_file)
-        new_docs = [doc for doc in docs if doc.url not in existing]
-        if not new_docs:
-            return 0
-        self._append_jsonl(self.raw_file, (asdict(doc) for doc in new_docs))
-        return len(new_docs)
-
-    def add_normalized_documents(self, docs: Iterable[NormalizedDocument]) -> int:
-        existing = self._existing_urls(self.normalized_file)
-        new_docs = [doc for doc in docs if doc.url not in existing]
-        if not new_docs:
-            return 0
-        self._append_jsonl(self.normalized_file, (asdict(doc) for doc in new_docs))
-        return len(new_docs)
-
-    def add_summaries(self, summaries: Iterable[Summary]) -> int:
-        existing = self._existing_urls(self.summary_file)
-        new_summaries = [summary for summary in summaries if summary.url not in existing]
-        if not new_summaries:
-            return 0
-        self._append_jsonl(self.summary_file, (asdict(summary) for summary in new_summaries))
-        return len(new_summaries)
+        return list(self.iter_normalized_documents())
+
+    def _serialize(self, record: RawDocument | Summary) -> dict:
+        ref = unread_content_ref(record, self.blobs)
+        if ref is not None:
+            # Body never read: carry the reference over instead of inflating it.
+            row = {name: getattr(record, name) for name in record.__dataclass_fields__ if name != "content"}
+            row["content_ref"] = ref
+            return row
+        row = asdict(record)
+        if self.blob_codec and isinstance(record, RawDocument):
+            row["content_ref"] = self.blobs.put(row.pop("content"))
+        return row
+
+    def _lock(self, name: str):
+        return file_lock(self.data_dir / f".{name}.lock")
+
+    def _append_new(
+        self,
+        name: str,
+        records: Iterable[RawDocument] | Iterable[Summary],
+        fsync: bool = False,
+    ) -> int:
+        """Upsert ``records``, consuming them lazily; return how many rows were written.
+
+        Every row carries a ``content_hash`` and a ``version``. A record whose
+        URL is unknown is stored as version 1; a known URL gets a new version
+        appended only when its hash differs from the latest stored one, and is
+        skipped otherwise. Older versions stay on disk until `compact`, but
+        readers only see the latest. Lookups go through each file's `UrlIndex`
+        sidecar, so a batch costs work proportional to its own size. The
+        lookup and the append run under the collection's advisory lock, so
+        concurrent writers on one data dir neither interleave rows nor race on
+        versions. ``fsync`` forces written files to disk before returning.
+        """
+
+        indexes: Dict[Path, UrlIndex] = {}
+        added = 0
+        for batch in _batched(records, APPEND_BATCH_SIZE):
+            with self._lock(name):
+                log = self._segment_log(name)
+                latest: Dict[str, dict] = {}
+                located: Dict[str, tuple[Path, int]] = {}
+                for path in reversed(self._paths(name)):
+                    remaining = {record.url for record in batch} - latest.keys()
+                    if not remaining:
+                        break
+                    index = indexes.setdefault(path, UrlIndex(path))
+                    for url, ((offset, _), row) in index.read_many(remaining).items():
+                        latest[url] = row
+                        located[url] = (path, offset)
+                rows: list[dict] = []
+                for record in batch:
+                    row = self._serialize(record)
+                    row["content_hash"] = _row_hash(row)
+                    previous = latest.get(record.url)
+                    if previous is not None:
+                        if _row_hash(previous) == row["content_hash"]:
+                            continue
+                        row["version"] = previous.get("version", 1) + 1
+                    else:
+                        row["version"] = 1
+                    latest[record.url] = row
+                    rows.append(row)
+                if not rows:
+                    continue
+
+                if log:
+                    path = log.active_path(rows[0].get(COLLECTIONS[name]) or "")
+                else:
+                    path = self.data_dir / f"{name}.jsonl"
+                entries: list[tuple[str, int, int]] = []
+                with path.open("ab") as f:
+                    start = f.tell()
+                    for row in rows:
+                        line = (json.dumps(row, ensure_ascii=False) + "\n").encode("utf-8")
+                        entries.append((row["url"], f.tell(), len(line)))
+                        f.write(line)
+                    written = f.tell() - start
+                    if fsync:
+                        f.flush()
+                        os.fsync(f.fileno())
+                indexes.setdefault(path, UrlIndex(path)).append(entries)
+                # Readers skip replaced rows by offset instead of scanning for repeated URLs.
+                superseded: Dict[Path, list[int]] = {}
+                for url, offset, _ in entries:
+                    if url in located:
+                        previous_path, previous_offset = located[url]
+                        superseded.setdefault(previous_path, []).append(previous_offset)
+                    located[url] = (path, offset)
+                for previous_path, offsets in superseded.items():
+                    indexes.setdefault(previous_path, UrlIndex(previous_path)).mark_superseded(offsets)
+                if log:
+                    log.record_append(path, rows, written)
+                added += len(entries)
+        return added
+
+    def add_raw_documents(self, docs: Iterable[RawDocument], fsync: bool = False) -> int:
+        return self._append_new("raw", docs, fsync)
+
+    def add_normalized_documents(self, docs: Iterable[NormalizedDocument], fsync: bool = False) -> int:
+        return self._append_new("normalized", docs, fsync)
+
+    def add_summaries(self, summaries: Iterable[Summary], fsync: bool = False) -> int:
+        return self._append_new("summary", summaries, fsync)
+
+    def _decode(self, collection: str, row: dict) -> RawDocument | Summary:
+        record_type = {"raw": RawDocument, "normalized": NormalizedDocument}.get(collection, Summary)
+        return lazy_record(record_type, row, self.blobs)
+
+    def get_many(self, urls: Iterable[str], collection: str = "normalized") -> Dict[str, RawDocument | Summary]:
+        """Fetch the latest stored record for each URL without scanning the collection.
+
+        Lookups go through each segment's `UrlIndex` (newest segment first) and
+        decode only the matching rows from a memory map. ``collection`` is one
+        of "raw", "normalized" or "summary"; unknown URLs are left out.
+        """
+
+        wanted = list(dict.fromkeys(urls))
+        remaining = set(wanted)
+        found: Dict[str, RawDocument | Summary] = {}
+        with self._lock(collection):
+            for path in reversed(self._paths(collection)):
+                if not remaining:
+                    break
+                if not path.exists():
+                    continue
+                for url, (_, row) in UrlIndex(path).read_many(remaining).items():
+                    found[url] = self._decode(collection, row)
+                    remaining.discard(url)
+        return {url: found[url] for url in wanted if url in found}
+
+    def get_document(self, url: str, collection: str = "normalized") -> RawDocument | Summary | None:
+        return self.get_many([url], collection).get(url)
+
+    def needs_compaction(self, min_segments: int | None = None) -> bool:
+        """Whether `compact` has work: too many segments, or rows the retention policy evicts."""
+
+        if min_segments and any(
+            len(log.segments()) >= min_segments
+            for log in (self._segment_log(name) for name in COLLECTIONS)
+            if log is not None
+        ):
+            return True
+        return self.retention is not None and any(self._retention_due(name) for name in COLLECTIONS)
+
+    def _retention_due(self, name: str) -> bool:
+        policy = self.retention
+        paths = [path for path in self._paths(name) if path.exists()]
+        if policy is None or not paths:
+            return False
+        if policy.max_bytes is not None and sum(path.stat().st_size for path in paths) > policy.max_bytes:
+            return True
+        time_field = COLLECTIONS[name]
+        cutoff = policy.cutoff()
+        log = self._segment_log(name)
+        if cutoff is not None and log is not None:
+            if any(segment["min_time"] and segment["min_time"] < cutoff for segment in log.segments()):
+                return True
+            cutoff = None
+        if cutoff is None and (policy.max_docs_per_channel is None or name == "summary"):
+            return False
+        record_type = {"raw": RawDocument, "normalized": NormalizedDocument}.get(name, Summary)
+        counts: Dict[str | None, int] = {}
+        for line in self._iter_current(name, None, None):
+            record = lazy_record(record_type, line)
+            value = getattr(record, time_field)
+            if cutoff is not None and value and value < cutoff:
+                return True
+            if policy.max_docs_per_channel is not None and name != "summary":
+                counts[record.channel] = counts.get(record.channel, 0) + 1
+                if counts[record.channel] > policy.max_docs_per_channel:
+                    return True
+        return False
+
+    def compact(self, *, segmented: bool = False) -> Dict[str, Dict[str, int]]:
+        """Rewrite every collection without superseded or expired rows and rebuild indexes.
+
+        When a URL appears more than once, its latest row wins; the store's
+        `RetentionPolicy`, if any, then evicts rows by age, per-channel count
+        and size. Segmented collections are merged into as few segments as
+        ``segment_max_bytes`` allows; single-file collections are rewritten in
+        place, or converted to the segmented layout when ``segmented`` is set.
+        Blobs that no remaining row refers to are deleted afterwards.
+        """
+
+        started = time.time()
+        results: Dict[str, Dict[str, int]] = {}
+        for name in COLLECTIONS:
+            with self._lock(name):
+                result = self._compact_collection(name, segmented)
+            if result is not None:
+                results[name] = result
+        if self.blobs.root.exists():
+            results["blobs"] = {"removed": self._remove_unreferenced_blobs(started)}
+        return results
+
+    def _remove_unreferenced_blobs(self, started: float) -> int:
+        """Delete bodies no stored row refers to any more; blobs written since ``started`` are kept."""
+
+        refs: Set[str] = set()
+        for name in COLLECTIONS:
+            with self._lock(name):
+                refs.update(row["content_ref"] for _, row in iter_lines(self._paths(name)) if "content_ref" in row)
+        return self.blobs.remove_unreferenced(refs, older_than=started)
+
+    def _compact_collection(self, name: str, segmented: bool) -> Dict[str, int] | None:
+        paths = [path for path in self._paths(name) if path.exists()]
+        if not paths:
+            return None
+        time_field = COLLECTIONS[name]
+        latest: Dict[str, int] = {}
+        stats: Dict[int, tuple] = {}
+        total = 0
+        for position, (line, row) in enumerate(iter_lines(paths)):
+            url = row.get("url", "")
+            if self.retention is not None:
+                stats.pop(latest.get(url, -1), None)
+                stats[position] = (position, row.get(time_field) or "", row.get("channel"), len(line))
+            latest[url] = position
+            total = position + 1
+        evicted: set[int] = set()
+        if self.retention is not None:
+            evicted = evicted_positions(stats.values(), self.retention, per_channel=name != "summary")
+        keep = set(latest.values()) - evicted
+        kept = ((line, row) for position, (line, row) in enumerate(iter_lines(paths)) if position in keep)
+
+        log = self._segment_log(name) or (self._new_segment_log(name) if segmented else None)
+        if log is not None:
+            legacy = self.data_dir / f"{name}.jsonl"
+            written = log.rewrite(kept)
+            if legacy in paths:
+                remove_segment_file(legacy)
+        else:
+            target = paths[0]
+            tmp_path = target.with_name(target.name + ".compact")
+            with tmp_path.open("wb") as f:
+                for line, _ in kept:
+                    f.write(line)
+            os.replace(tmp_path, target)
+            written = [target]
+        for path in written:
+            UrlIndex(path).rebuild()
+        return {
+            "rows_before": total,
+            "rows_after": len(keep),
+            "evicted": len(evicted),
+            "segments": len(written),
+        }
+
+
+def _batched(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    batch: list[T] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _row_hash(row: dict) -> str:
+    """Content hash of a stored row, derived for rows written before hashes were stored."""
+
+    if "content_hash" in row:
+        return row["content_hash"]
+    if "content_ref" in row:
+        return row["content_ref"].split(":", 1)[1]
+    if "content" in row:
+        return content_digest(row["content"])
+    return content_digest(json.dumps(row.get("bullet_points", []), ensure_ascii=False))
+
+
+def _in_range(value: str, since: str | None, until: str | None) -> bool:
+    if since is not None and value < since:
+        return False
+    if until is not None and value >= until:
+        return False
+    return True
+
+
+def _record_matches(
+    doc: RawDocument,
+    channel: str | None,
+    language: str | None,
+    since: str | None,
+    until: str | None,
+) -> bool:
+    if channel is not None and doc.channel != channel:
+        return False
+    if language is not None and getattr(doc, "language", None) != language:
+        return False
+    if since is None and until is None:
+        return True
+    return _in_range(doc.fetched_at, since, until)
+
+
+STORAGE_ENGINES = ("jsonl", "sqlite")
+
+
+def open_data_store(
+    data_dir: Path = DEFAULT_DATA_DIR,
+    engine: str | None = None,
+    blob_codec: str | None = None,
+    segment_max_bytes: int | None = None,
+    retention: RetentionPolicy | None = None,
+):
+    """Open the storage engine used by ``data_dir``.
+
+    Without an explicit ``engine`` the SQLite engine is picked when the data dir
+    already holds its database file (e.g. after `migrate_jsonl_to_sqlite`), and
+    the JSONL engine otherwise. ``blob_codec``, ``segment_max_bytes`` and
+    ``retention`` only apply to the JSONL engine.
+    """
+
+    from src.storage.sqlite_store import SQLITE_FILENAME, SQLiteDataStore
+
+    data_dir = Path(data_dir)
+    if engine is None:
+        engine = "sqlite" if (data_dir / SQLITE_FILENAME).exists() else "jsonl"
+    if engine == "sqlite":
+        return SQLiteDataStore(data_dir)
+    if engine == "jsonl":
+        return DataStore(data_dir, blob_codec=blob_codec, segment_max_bytes=segment_max_bytes, retention=retention)
+    raise ValueError(f"Unknown storage engine: {engine}")
 
 
 def utc_now_iso() -> str:
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import MISSING, dataclass, fields
+from typing import Any, Dict, List, Type, TypeVar
+
+R = TypeVar("R")
+
+_DECODER = json.JSONDecoder()
+_ABSENT = object()
+# Bytes decoded after a key on the first attempt to read its value.
+_VALUE_WINDOW = 256
+
+
+@dataclass(slots=True)
+class RawDocument:
+    url: str
+    title: str
+    content: str
+    fetched_at: str
+    channel: str | None = None
+
+
+@dataclass(slots=True)
+class NormalizedDocument(RawDocument):
+    language: str | None = None
+    source: str | None = None
+    normalized_at: str = ""
+
+
+@dataclass(slots=True)
+class Summary:
+    url: str
+    bullet_points: List[str]
+    summarized_at: str
+
+
+def _extract(source: bytes | Dict[str, Any], key: str) -> Any:
+    """Decode one top-level value from a stored row without parsing the rest.
+
+    Rows are written by `json.dumps` with its default separators, where an
+    unescaped ``"key": `` sequence can only be a key, so only a window of bytes
+    after the key is decoded, grown until the value parses. Rows in any other
+    layout fall back to a full parse.
+    """
+
+    if isinstance(source, dict):
+        return source.get(key, _ABSENT)
+    marker = b'"' + key.encode("utf-8") + b'": '
+    position = source.find(marker)
+    if position < 0:
+        return json.loads(source).get(key, _ABSENT)
+    start = position + len(marker)
+    window = _VALUE_WINDOW
+    while True:
+        chunk = source[start : start + window]
+        try:
+            # A multi-byte character cut at the window edge lies after any value
+            # that parses, so dropping it cannot change the result.
+            value, _ = _DECODER.raw_decode(chunk.decode("utf-8", errors="ignore"))
+            return value
+        except json.JSONDecodeError:
+            if start + window >= len(source):
+                raise
+            window *= 4
+
+
+class _LazyRecord:
+    """Mixin for record subclasses that decode fields from their row on first access."""
+
+    __slots__ = ()
+
+    def _load(self, name: str) -> Any:
+        value = _extract(self._source, name)
+        if value is _ABSENT and name == "content" and self._blobs is not None:
+            ref = _extract(self._source, "content_ref")
+            if ref is not _ABSENT:
+                return self._blobs.get(ref)
+        if value is _ABSENT:
+            default = self._defaults[name]
+            return default() if callable(default) else default
+        return value
+
+
+def _lazy_field(slot: Any) -> property:
+    def get(self: Any) -> Any:
+        try:
+            return slot.__get__(self, type(self))
+        except AttributeError:
+            value = self._load(slot.__name__)
+            slot.__set__(self, value)
+            return value
+
+    def set(self: Any, value: Any) -> None:
+        slot.__set__(self, value)
+
+    return property(get, set)
+
+
+def _lazy_type(base: type) -> type:
+    record_fields = fields(base)
+    namespace: Dict[str, Any] = {
+        "__slots__": ("_source", "_blobs"),
+        "__qualname__": base.__qualname__,
+        "__module__": base.__module__,
+        "_defaults": {
+            f.name: f.default if f.default is not MISSING else (list if f.name == "bullet_points" else "")
+            for f in record_fields
+        },
+    }
+    for f in record_fields:
+        namespace[f.name] = _lazy_field(getattr(base, f.name))
+
+    def __eq__(self: Any, other: object) -> bool:
+        if type(other) not in (base, type(self)):
+            return NotImplemented
+        return all(getattr(self, f.name) == getattr(other, f.name) for f in record_fields)
+
+    namespace["__eq__"] = __eq__
+    return type(f"Lazy{base.__name__}", (base, _LazyRecord), namespace)
+
+
+_CONTENT_SLOT = RawDocument.content
+_LAZY_TYPES = {record_type: _lazy_type(record_type) for record_type in (RawDocument, NormalizedDocument, Summary)}
+
+
+def lazy_record(record_type: Type[R], source: bytes | Dict[str, Any], blobs: Any = None) -> R:
+    """Wrap a stored row (raw JSON line or decoded dict) as a ``record_type`` instance.
+
+    The result is a slotted subclass of ``record_type`` with the same attribute
+    API; each field is decoded from ``source`` the first time it is read, so a
+    scan that only touches ``url`` and ``channel`` never decodes ``content``.
+    Blob-backed bodies (``content_ref``) are loaded from ``blobs`` the same way.
+    """
+
+    record = object.__new__(_LAZY_TYPES[record_type])
+    record._source = source
+    record._blobs = blobs
+    return record
+
+
+def unread_content_ref(record: object, blobs: Any) -> str | None:
+    """Return the blob reference of a lazy record whose body was never read."""
+
+    if not isinstance(record, _LazyRecord) or not isinstance(record, RawDocument) or record._blobs is not blobs:
+        return None
+    try:
+        _CONTENT_SLOT.__get__(record, type(record))
+    except AttributeError:
+        ref = _extract(record._source, "content_ref")
+        return None if ref is _ABSENT else ref
+    return None
+
+
+def content_digest(text: str) -> str:
+    """SHA-256 of ``text``; for bodies this equals the digest of their blob reference."""
+
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def record_hash(record: RawDocument | Summary) -> str:
+    """Hash of the part of a record whose change makes it a new version."""
+
+    if isinstance(record, Summary):
+        return content_digest(json.dumps(record.bullet_points, ensure_ascii=False))
+    return content_digest(record.content)
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Set, Tuple
+
+# (position in the collection, timestamp, channel, row bytes) of a stored row.
+RetentionEntry = Tuple[int, str, str | None, int]
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """Limits applied when a collection is compacted.
+
+    ``max_age_days`` drops rows whose timestamp (``fetched_at`` or
+    ``summarized_at``) is older than the cutoff, ``max_docs_per_channel`` keeps
+    the newest documents of each channel, and ``max_bytes`` keeps the newest
+    rows of each collection that fit in that many bytes of JSONL.
+    """
+
+    max_age_days: float | None = None
+    max_docs_per_channel: int | None = None
+    max_bytes: int | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return any(limit is not None for limit in (self.max_age_days, self.max_docs_per_channel, self.max_bytes))
+
+    def cutoff(self, now: datetime | None = None) -> str | None:
+        """Oldest timestamp still retained, in the ISO form `utc_now_iso` writes."""
+
+        if self.max_age_days is None:
+            return None
+        return ((now or datetime.utcnow()) - timedelta(days=self.max_age_days)).isoformat() + "Z"
+
+
+def evicted_positions(
+    entries: Iterable[RetentionEntry],
+    policy: RetentionPolicy,
+    *,
+    per_channel: bool = True,
+    now: datetime | None = None,
+) -> Set[int]:
+    """Positions of the rows ``policy`` evicts; the newest rows are kept first."""
+
+    cutoff = policy.cutoff(now)
+    evicted: Set[int] = set()
+    kept: List[RetentionEntry] = []
+    # Newest first: by timestamp, then by append order for equal timestamps.
+    for entry in sorted(entries, key=lambda entry: (entry[1], entry[0]), reverse=True):
+        if cutoff is not None and entry[1] and entry[1] < cutoff:
+            evicted.add(entry[0])
+        else:
+            kept.append(entry)
+
+    if per_channel and policy.max_docs_per_channel is not None:
+        counts: Dict[str | None, int] = {}
+        survivors: List[RetentionEntry] = []
+        for entry in kept:
+            counts[entry[2]] = counts.get(entry[2], 0) + 1
+            if counts[entry[2]] > policy.max_docs_per_channel:
+                evicted.add(entry[0])
+            else:
+                survivors.append(entry)
+        kept = survivors
+
+    if policy.max_bytes is not None:
+        total = 0
+        for entry in kept:
+            total += entry[3]
+            if total > policy.max_bytes:
+                evicted.add(entry[0])
+    return evicted
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from src.storage.url_index import UrlIndex
+
+MANIFEST_FILENAME = "manifest.json"
+DEFAULT_SEGMENT_BYTES = 64 * 1024 * 1024
+
+
+def _write_json_atomic(path: Path, data: object) -> None:
+    tmp_path = path.with_name(path.name + f".{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp_path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def remove_segment_file(path: Path) -> None:
+    """Delete a JSONL file together with its `UrlIndex` sidecars."""
+
+    index = UrlIndex(path)
+    for candidate in (path, index.index_path, index.meta_path, index.stale_path):
+        candidate.unlink(missing_ok=True)
+
+
+class SegmentedLog:
+    """A JSONL collection split into rotating segment files.
+
+    ``manifest.json`` lists every segment in append order with its row/URL
+    counts, byte size and the ``[min_time, max_time]`` range of ``time_field``,
+    which lets readers skip segments outside a requested time window. Appends go
+    to the last segment until it reaches ``max_bytes`` or, with ``daily``, until
+    rows from a later UTC day arrive.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        time_field: str,
+        max_bytes: int = DEFAULT_SEGMENT_BYTES,
+        daily: bool = True,
+    ) -> None:
+        self.directory = directory
+        self.time_field = time_field
+        self.max_bytes = max(1, max_bytes)
+        self.daily = daily
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.directory / MANIFEST_FILENAME
+
+    def exists(self) -> bool:
+        return self.manifest_path.exists()
+
+    def load_manifest(self) -> Dict:
+        if not self.manifest_path.exists():
+            return {"time_field": self.time_field, "next_id": 1, "segments": []}
+        return json.loads(self.manifest_path.read_text(encoding="utf-8"))
+
+    def _save_manifest(self, manifest: Dict) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        _write_json_atomic(self.manifest_path, manifest)
+
+    def segments(self) -> List[Dict]:
+        return self.load_manifest()["segments"]
+
+    def paths(self, since: str | None = None, until: str | None = None) -> List[Path]:
+        """Segment files in append order, skipping those outside ``[since, until)``."""
+
+        selected: list[Path] = []
+        for segment in self.segments():
+            if segment["min_time"] is not None:
+                if since is not None and segment["max_time"] < since:
+                    continue
+                if until is not None and segment["min_time"] >= until:
+                    continue
+            selected.append(self.directory / segment["file"])
+        return selected
+
+    def _needs_rotation(self, segment: Dict, first_time: str) -> bool:
+        if segment["bytes"] >= self.max_bytes:
+            return True
+        if self.daily and segment["max_time"] and first_time[:10] > segment["max_time"][:10]:
+            return True
+        return False
+
+    @staticmethod
+    def _new_segment(manifest: Dict) -> Dict:
+        segment = {
+            "file": f"seg-{manifest['next_id']:06d}.jsonl",
+            "rows": 0,
+            "urls": 0,
+            "bytes": 0,
+            "min_time": None,
+            "max_time": None,
+        }
+        manifest["next_id"] += 1
+        manifest["segments"].append(segment)
+        return segment
+
+    def active_path(self, first_time: str = "") -> Path:
+        """Return the segment the next batch should be appended to, rotating if due."""
+
+        manifest = self.load_manifest()
+        segments = manifest["segments"]
+        if segments and not self._needs_rotation(segments[-1], first_time):
+            return self.directory / segments[-1]["file"]
+        segment = self._new_segment(manifest)
+        self._save_manifest(manifest)
+        return self.directory / segment["file"]
+
+    def record_append(self, path: Path, rows: List[Dict], size: int) -> None:
+        manifest = self.load_manifest()
+        for segment in manifest["segments"]:
+            if segment["file"] == path.name:
+                _update_stats(segment, rows, size, self.time_field)
+                break
+        self._save_manifest(manifest)
+
+    def rewrite(self, lines: Iterable[Tuple[bytes, Dict]]) -> List[Path]:
+        """Replace all segments with ``lines`` (raw row bytes plus decoded row).
+
+        New segments get fresh file names, the manifest is swapped atomically
+        and only then are the old files removed, so readers never observe a
+        half-written collection.
+        """
+
+        old_paths = self.paths()
+        manifest = self.load_manifest()
+        manifest["segments"] = []
+        written: list[Path] = []
+        handle = None
+        segment: Dict | None = None
+        try:
+            for line, row in lines:
+                time_value = row.get(self.time_field) or ""
+                if segment is None or self._needs_rotation(segment, time_value):
+                    if handle is not None:
+                        handle.close()
+                    segment = self._new_segment(manifest)
+                    path = self.directory / segment["file"]
+                    self.directory.mkdir(parents=True, exist_ok=True)
+                    handle = path.open("wb")
+                    written.append(path)
+                handle.write(line)
+                _update_stats(segment, [row], len(line), self.time_field)
+        finally:
+            if handle is not None:
+                handle.close()
+        self._save_manifest(manifest)
+        for path in old_paths:
+            if path not in written:
+                remove_segment_file(path)
+        return written
+
+
+def _update_stats(segment: Dict, rows: List[Dict], size: int, time_field: str) -> None:
+    segment["rows"] += len(rows)
+    segment["urls"] += len({row.get("url") for row in rows})
+    segment["bytes"] += size
+    times = [row.get(time_field) for row in rows if row.get(time_field)]
+    if times:
+        segment["min_time"] = min([segment["min_time"] or times[0], *times])
+        segment["max_time"] = max([segment["max_time"] or times[0], *times])
+
+
+def iter_lines(paths: Iterable[Path]) -> Iterator[Tuple[bytes, Dict]]:
+    """Yield ``(raw line, decoded row)`` for every non-empty row in ``paths``."""
+
+    for path in paths:
+        if not path.exists():
+            continue
+        with path.open("rb") as f:
+            for line in f:
+                if line.strip():
+                    yield line if line.endswith(b"\n") else line + b"\n", json.loads(line)
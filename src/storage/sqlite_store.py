@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List
+
+from src.storage.data_store import (
+    DEFAULT_DATA_DIR,
+    DataStore,
+    NormalizedDocument,
+    RawDocument,
+    Summary,
+    _batched,
+)
+from src.storage.records import record_hash
+
+SQLITE_FILENAME = "store.sqlite3"
+DEFAULT_BATCH_SIZE = 500
+BUSY_TIMEOUT_SECONDS = 30.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS raw_documents (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    content TEXT NOT NULL,
+    fetched_at TEXT NOT NULL,
+    channel TEXT,
+    content_hash TEXT,
+    version INTEGER NOT NULL DEFAULT 1
+);
+CREATE TABLE IF NOT EXISTS normalized_documents (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    content TEXT NOT NULL,
+    fetched_at TEXT NOT NULL,
+    channel TEXT,
+    language TEXT,
+    source TEXT,
+    normalized_at TEXT NOT NULL,
+    content_hash TEXT,
+    version INTEGER NOT NULL DEFAULT 1
+);
+CREATE TABLE IF NOT EXISTS summaries (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    bullet_points TEXT NOT NULL,
+    summarized_at TEXT NOT NULL,
+    content_hash TEXT,
+    version INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS raw_documents_fetched_at ON raw_documents (fetched_at);
+CREATE INDEX IF NOT EXISTS normalized_documents_fetched_at ON normalized_documents (fetched_at);
+CREATE INDEX IF NOT EXISTS summaries_summarized_at ON summaries (summarized_at);
+"""
+# Columns added after the first release; older databases get them on open.
+_VERSION_COLUMNS = (("content_hash", "TEXT"), ("version", "INTEGER NOT NULL DEFAULT 1"))
+
+_RAW_COLUMNS = ("url", "title", "content", "fetched_at", "channel")
+_NORMALIZED_COLUMNS = _RAW_COLUMNS + ("language", "source", "normalized_at")
+_SUMMARY_COLUMNS = ("url", "bullet_points", "summarized_at")
+_TABLES = {
+    "raw": ("raw_documents", _RAW_COLUMNS),
+    "normalized": ("normalized_documents", _NORMALIZED_COLUMNS),
+    "summary": ("summaries", _SUMMARY_COLUMNS),
+}
+
+
+def _where(**conditions: object) -> tuple[str, tuple]:
+    clauses: list[str] = []
+    params: list[object] = []
+    for column, value in conditions.items():
+        if isinstance(value, tuple):
+            since, until = value
+            if since is not None:
+                clauses.append(f"{column} >= ?")
+                params.append(since)
+            if until is not None:
+                clauses.append(f"{column} < ?")
+                params.append(until)
+        elif value is not None:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+    if not clauses:
+        return "", ()
+    return " WHERE " + " AND ".join(clauses), tuple(params)
+
+
+def _decode_row(collection: str, row: tuple) -> RawDocument | Summary:
+    if collection == "raw":
+        return RawDocument(*row)
+    if collection == "normalized":
+        return NormalizedDocument(*row)
+    url, points, summarized_at = row
+    return Summary(url=url, bullet_points=json.loads(points), summarized_at=summarized_at)
+
+
+def _raw_row(doc: RawDocument) -> tuple:
+    return (doc.url, doc.title, doc.content, doc.fetched_at, doc.channel)
+
+
+def _normalized_row(doc: NormalizedDocument) -> tuple:
+    return _raw_row(doc) + (doc.language, doc.source, doc.normalized_at)
+
+
+def _summary_row(summary: Summary) -> tuple:
+    return (summary.url, json.dumps(summary.bullet_points, ensure_ascii=False), summary.summarized_at)
+
+
+def _hashed(row: tuple, record: RawDocument | Summary) -> tuple:
+    return row + (record_hash(record),)
+
+
+class SQLiteDataStore:
+    """`DataStore`-compatible storage engine backed by a single SQLite file.
+
+    Every table carries a unique index on ``url`` so upserts happen inside
+    SQLite (``INSERT ... ON CONFLICT(url) DO UPDATE``) instead of by re-reading
+    the corpus: a known URL is rewritten, with ``version`` bumped, only when its
+    content hash changed. Inserts are committed in batched transactions on a
+    WAL-mode database.
+    """
+
+    engine = "sqlite"
+
+    def __init__(self, data_dir: Path = DEFAULT_DATA_DIR, batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+        self.data_dir = data_dir
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.batch_size = max(1, batch_size)
+        # Other processes may hold the write lock briefly; wait instead of failing.
+        self._conn = sqlite3.connect(str(self.db_file), timeout=BUSY_TIMEOUT_SECONDS, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._add_missing_columns()
+        self._conn.executescript(_SCHEMA)
+
+    def _add_missing_columns(self) -> None:
+        for table, _ in _TABLES.values():
+            existing = {row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")}
+            if not existing:
+                continue
+            for column, declaration in _VERSION_COLUMNS:
+                if column not in existing:
+                    self._conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {declaration}")
+
+    @property
+    def db_file(self) -> Path:
+        return self.data_dir / SQLITE_FILENAME
+
+    @property
+    def raw_file(self) -> Path:
+        return self.db_file
+
+    @property
+    def normalized_file(self) -> Path:
+        return self.db_file
+
+    @property
+    def summary_file(self) -> Path:
+        return self.db_file
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def _select(self, table: str, columns: tuple, where: str = "", params: tuple = ()) -> Iterator[tuple]:
+        cursor = self._conn.execute(f"SELECT {', '.join(columns)} FROM {table}{where} ORDER BY id", params)
+        while True:
+            rows = cursor.fetchmany(self.batch_size)
+            if not rows:
+                return
+            yield from rows
+
+    def _insert(self, table: str, columns: tuple, rows: Iterable[tuple], fsync: bool = False) -> int:
+        """Upsert ``rows`` (``columns`` values followed by the content hash).
+
+        A known URL is only rewritten, with its ``version`` bumped, when the
+        hash differs; rows stored before hashes existed compare by body.
+        """
+
+        body = "bullet_points" if table == "summaries" else "content"
+        placeholders = ", ".join("?" for _ in columns)
+        updates = ", ".join(f"{column} = excluded.{column}" for column in columns[1:])
+        statement = (
+            f"INSERT INTO {table} ({', '.join(columns)}, content_hash) VALUES ({placeholders}, ?) "
+            f"ON CONFLICT(url) DO UPDATE SET {updates}, content_hash = excluded.content_hash, version = version + 1 "
+            f"WHERE CASE WHEN content_hash IS NULL THEN {body} IS NOT excluded.{body} "
+            f"ELSE content_hash IS NOT excluded.content_hash END"
+        )
+        added = 0
+        for batch in _batched(rows, self.batch_size):
+            before = self._conn.total_changes
+            with self._conn:
+                self._conn.executemany(statement, batch)
+            added += self._conn.total_changes - before
+        if fsync:
+            self._conn.execute("PRAGMA wal_checkpoint(FULL)")
+        return added
+
+    def iter_raw_documents(
+        self,
+        *,
+        channel: str | None = None,
+        language: str | None = None,
+        since: str | None = None,
+        until: str | None = None,
+    ) -> Iterator[RawDocument]:
+        if language is not None:
+            return
+        where, params = _where(channel=channel, fetched_at=(since, until))
+        for row in self._select("raw_documents", _RAW_COLUMNS, where, params):
+            yield _decode_row("raw", row)
+
+    def iter_normalized_documents(
+        self,
+        *,
+        channel: str | None = None,
+        language: str | None = None,
+        since: str | None = None,
+        until: str | None = None,
+    ) -> Iterator[NormalizedDocument]:
+        where, params = _where(channel=channel, language=language, fetched_at=(since, until))
+        for row in self._select("normalized_documents", _NORMALIZED_COLUMNS, where, params):
+            yield _decode_row("normalized", row)
+
+    def iter_summaries(self, *, since: str | None = None, until: str | None = None) -> Iterator[Summary]:
+        where, params = _where(summarized_at=(since, until))
+        for row in self._select("summaries", _SUMMARY_COLUMNS, where, params):
+            yield _decode_row("summary", row)
+
+    def changed_since(self, since: str, collection: str = "normalized") -> Iterator[RawDocument | Summary]:
+        """Stream records that are new or whose content changed at or after ``since``."""
+
+        if collection == "summary":
+            return self.iter_summaries(since=since)
+        if collection == "raw":
+            return self.iter_raw_documents(since=since)
+        return self.iter_normalized_documents(since=since)
+
+    def load_raw_documents(self) -> List[RawDocument]:
+        return list(self.iter_raw_documents())
+
+    def load_normalized_documents(self) -> List[NormalizedDocument]:
+        return list(self.iter_normalized_documents())
+
+    def load_summaries(self) -> List[Summary]:
+        return list(self.iter_summaries())
+
+    def get_many(self, urls: Iterable[str], collection: str = "normalized") -> Dict[str, RawDocument | Summary]:
+        wanted = list(dict.fromkeys(urls))
+        table, columns = _TABLES[collection]
+        found: Dict[str, RawDocument | Summary] = {}
+        for batch in _batched(wanted, self.batch_size):
+            where = f" WHERE url IN ({', '.join('?' for _ in batch)})"
+            for row in self._select(table, columns, where, tuple(batch)):
+                found[row[0]] = _decode_row(collection, row)
+        return {url: found[url] for url in wanted if url in found}
+
+    def get_document(self, url: str, collection: str = "normalized") -> RawDocument | Summary | None:
+        return self.get_many([url], collection).get(url)
+
+    def add_raw_documents(self, docs: Iterable[RawDocument], fsync: bool = False) -> int:
+        return self._insert("raw_documents", _RAW_COLUMNS, (_hashed(_raw_row(doc), doc) for doc in docs), fsync)
+
+    def add_normalized_documents(self, docs: Iterable[NormalizedDocument], fsync: bool = False) -> int:
+        rows = (_hashed(_normalized_row(doc), doc) for doc in docs)
+        return self._insert("normalized_documents", _NORMALIZED_COLUMNS, rows, fsync)
+
+    def add_summaries(self, summaries: Iterable[Summary], fsync: bool = False) -> int:
+        rows = (_hashed(_summary_row(summary), summary) for summary in summaries)
+        return self._insert("summaries", _SUMMARY_COLUMNS, rows, fsync)
+
+
+def migrate_jsonl_to_sqlite(data_dir: Path, batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, int]:
+    """Copy ``raw``/``normalized``/``summary`` JSONL files into the SQLite engine.
+
+    The JSONL files are streamed line by line and left untouched; re-running the
+    migration is safe because rows are upserted by URL, so only rows whose
+    content changed since the last run are rewritten.
+    Once the database file exists, `open_data_store` selects it for the data dir.
+    """
+
+    source = DataStore(Path(data_dir))
+    store = SQLiteDataStore(source.data_dir, batch_size=batch_size)
+    try:
+        return {
+            "raw": store.add_raw_documents(source.iter_raw_documents()),
+            "normalized": store.add_normalized_documents(source.iter_normalized_documents()),
+            "summaries": store.add_summaries(source.iter_summaries()),
+        }
+    finally:
+        store.close()
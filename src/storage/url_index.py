@@ -0,0 +1,292 @@
+from __future__ import annotations
+
+import bisect
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Sequence, Set, Tuple
+
+# (url hash, byte offset, byte length) of each JSONL row, little-endian.
+_RECORD = struct.Struct("<QQI")
+# Byte offset of a row replaced by a later version of its URL.
+_OFFSET = struct.Struct("<Q")
+# Bumped whenever the sidecar layout changes; indexes written by other versions are rebuilt.
+INDEX_VERSION = 3
+# Unsorted tail entries tolerated before they are merged into the sorted region.
+MIN_TAIL_RECORDS = 1024
+
+Location = Tuple[int, int]
+
+
+def url_hash(url: str) -> int:
+    return int.from_bytes(hashlib.blake2b(url.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class _SortedHashes:
+    """Read-only view over the sorted region of an index file, for `bisect`."""
+
+    def __init__(self, buffer: mmap.mmap, count: int) -> None:
+        self._buffer = buffer
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, position: int) -> int:
+        return _RECORD.unpack_from(self._buffer, position * _RECORD.size)[0]
+
+    def records(self, position: int) -> Iterator[Tuple[int, int, int]]:
+        while position < self._count:
+            yield _RECORD.unpack_from(self._buffer, position * _RECORD.size)
+            position += 1
+
+
+class UrlIndex:
+    """Persisted URL index stored next to a JSONL file.
+
+    ``<file>.idx`` holds fixed-width ``(hash, offset, length)`` records: a
+    sorted region searched by bisection plus a short unsorted tail that appends
+    go to and that is merged back once it grows. ``<file>.idx.json`` records how
+    many bytes of the JSONL file the index covers; when the file has grown the
+    missing rows are indexed, and when it was rewritten the index is rebuilt
+    from scratch. Hash hits are confirmed against the JSONL row itself, so
+    collisions never drop or mix up a document.
+
+    ``<file>.stale`` lists the offsets of rows that writers replaced with a
+    newer version of the same URL. The meta's ``tracked`` flag says whether that
+    list is complete; rows indexed from outside writes clear it (see
+    `superseded_rows`).
+    """
+
+    def __init__(self, data_path: Path) -> None:
+        self.data_path = data_path
+        self.index_path = data_path.with_name(data_path.name + ".idx")
+        self.meta_path = data_path.with_name(data_path.name + ".idx.json")
+        self.stale_path = data_path.with_name(data_path.name + ".stale")
+        self._meta: Dict[str, int] | None = None
+
+    def _load_meta(self) -> Dict[str, int]:
+        if self._meta is None:
+            try:
+                self._meta = json.loads(self.meta_path.read_text())
+            except (OSError, ValueError):
+                self._meta = {"size": 0, "mtime_ns": 0, "sorted": 0, "tracked": True}
+        return self._meta
+
+    @property
+    def tracked(self) -> bool:
+        return bool(self._load_meta().get("tracked"))
+
+    def _write_meta(self, sorted_count: int, tracked: bool | None = None) -> None:
+        stat = self.data_path.stat() if self.data_path.exists() else None
+        if tracked is None:
+            tracked = self.tracked
+        self._meta = {
+            "version": INDEX_VERSION,
+            "size": stat.st_size if stat else 0,
+            "mtime_ns": stat.st_mtime_ns if stat else 0,
+            "sorted": sorted_count,
+            "tracked": tracked,
+        }
+        tmp_path = _tmp_path(self.meta_path)
+        tmp_path.write_text(json.dumps(self._meta))
+        os.replace(tmp_path, self.meta_path)
+
+    def _record_count(self) -> int:
+        if not self.index_path.exists():
+            return 0
+        return self.index_path.stat().st_size // _RECORD.size
+
+    def sync(self) -> None:
+        """Bring the index up to date with the JSONL file it covers."""
+
+        self._meta = None  # other writers may have advanced it since the last call
+        meta = self._load_meta()
+        if not self.data_path.exists():
+            if meta["size"] or self.index_path.exists():
+                self.index_path.unlink(missing_ok=True)
+                self.stale_path.unlink(missing_ok=True)
+                self._write_meta(0, tracked=True)
+            return
+        stat = self.data_path.stat()
+        current = meta.get("version") == INDEX_VERSION and self.index_path.exists()
+        if current and stat.st_size == meta["size"] and stat.st_mtime_ns == meta["mtime_ns"]:
+            return
+        # Rows written by someone else may replace earlier versions nobody recorded.
+        if current and stat.st_size > meta["size"] and self._ends_row(meta["size"]):
+            meta["tracked"] = False
+            self.append(list(_scan_rows(self.data_path, meta["size"])))
+            return
+        self.rebuild(tracked=False)
+
+    def _ends_row(self, size: int) -> bool:
+        if size == 0:
+            return True
+        with self.data_path.open("rb") as f:
+            f.seek(size - 1)
+            return f.read(1) == b"\n"
+
+    def rebuild(self, tracked: bool = True) -> None:
+        """Index the whole JSONL file again; ``tracked`` means it holds no superseded rows."""
+
+        records = sorted((url_hash(url), offset, length) for url, offset, length in _scan_rows(self.data_path, 0))
+        self.stale_path.unlink(missing_ok=True)
+        self._rewrite(records, tracked)
+
+    def _rewrite(self, records: List[Tuple[int, int, int]], tracked: bool | None = None) -> None:
+        tmp_path = _tmp_path(self.index_path)
+        with tmp_path.open("wb") as f:
+            for record in records:
+                f.write(_RECORD.pack(*record))
+        os.replace(tmp_path, self.index_path)
+        self._write_meta(len(records), tracked)
+
+    def append(self, entries: Iterable[Tuple[str, int, int]]) -> None:
+        """Record ``(url, offset, length)`` for rows just appended to the JSONL file."""
+
+        packed = b"".join(_RECORD.pack(url_hash(url), offset, length) for url, offset, length in entries)
+        with self.index_path.open("ab") as f:
+            f.write(packed)
+        sorted_count = self._load_meta()["sorted"]
+        tail = self._record_count() - sorted_count
+        if tail > max(MIN_TAIL_RECORDS, sorted_count // 4):
+            self._rewrite(sorted(self._read_records()))
+        else:
+            self._write_meta(sorted_count)
+
+    def mark_superseded(self, offsets: Iterable[int]) -> None:
+        """Record that the rows at ``offsets`` were replaced by newer versions."""
+
+        with self.stale_path.open("ab") as f:
+            f.write(b"".join(_OFFSET.pack(offset) for offset in offsets))
+
+    def superseded(self) -> Set[int]:
+        if not self.stale_path.exists():
+            return set()
+        return {offset for (offset,) in _OFFSET.iter_unpack(self.stale_path.read_bytes())}
+
+    def _read_records(self) -> List[Tuple[int, int, int]]:
+        return list(self._iter_records())
+
+    def _iter_records(self, chunk_records: int = 64 * 1024) -> Iterator[Tuple[int, int, int]]:
+        if not self.index_path.exists():
+            return
+        with self.index_path.open("rb") as f:
+            while chunk := f.read(chunk_records * _RECORD.size):
+                yield from _RECORD.iter_unpack(chunk)
+
+    def _candidates(self, wanted: Dict[int, set[str]]) -> Dict[int, List[Location]]:
+        candidates: Dict[int, List[Location]] = {}
+        sorted_count = self._load_meta()["sorted"]
+        with self.index_path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            hashes = _SortedHashes(buffer, sorted_count)
+            for hashed in wanted:
+                position = bisect.bisect_left(hashes, hashed)
+                for found, offset, length in hashes.records(position):
+                    if found != hashed:
+                        break
+                    candidates.setdefault(hashed, []).append((offset, length))
+            for found, offset, length in _RECORD.iter_unpack(buffer[sorted_count * _RECORD.size :]):
+                if found in wanted:
+                    candidates.setdefault(found, []).append((offset, length))
+        return candidates
+
+    def read_many(self, urls: Iterable[str]) -> Dict[str, Tuple[Location, dict]]:
+        """Return ``url -> ((offset, length), row)`` for the latest row of each known URL.
+
+        Rows are decoded straight from a memory map of the JSONL file, so only
+        the matching rows are touched.
+        """
+
+        self.sync()
+        wanted: Dict[int, set[str]] = {}
+        for url in urls:
+            wanted.setdefault(url_hash(url), set()).add(url)
+        if not wanted or self._record_count() == 0 or self.data_path.stat().st_size == 0:
+            return {}
+
+        matches: Dict[str, Tuple[Location, dict]] = {}
+        candidates = self._candidates(wanted)
+        with self.data_path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for hashed, locations in candidates.items():
+                for offset, length in sorted(locations, reverse=True):
+                    row = json.loads(data[offset : offset + length])
+                    if row.get("url") in wanted[hashed]:
+                        matches.setdefault(row["url"], ((offset, length), row))
+        return matches
+
+    def find_many(self, urls: Iterable[str]) -> Dict[str, Location]:
+        """Return ``url -> (offset, length)`` of the latest stored row for each known URL."""
+
+        return {url: location for url, (location, _) in self.read_many(urls).items()}
+
+
+def superseded_rows(paths: Sequence[Path]) -> Dict[Path, Set[int]]:
+    """Return ``path -> offsets`` of rows replaced by a later row for the same URL.
+
+    ``paths`` are the files of one collection in append order. Writers record
+    replaced rows as they append, so this normally reads just those short
+    lists; only files with rows from outside writers are scanned again.
+    """
+
+    indexes = [UrlIndex(path) for path in paths if path.exists()]
+    for index in indexes:
+        index.sync()
+    if not all(index.tracked for index in indexes):
+        _rescan_superseded(indexes)
+    stale: Dict[Path, Set[int]] = {}
+    for index in indexes:
+        offsets = index.superseded()
+        if offsets:
+            stale[index.data_path] = offsets
+    return stale
+
+
+def _rescan_superseded(indexes: Sequence[UrlIndex]) -> None:
+    """Recompute every file's superseded rows from the index sidecars and mark them tracked."""
+
+    seen: Set[int] = set()
+    repeated: Set[int] = set()
+    for index in indexes:
+        for hashed, _, _ in index._iter_records():
+            if hashed in seen:
+                repeated.add(hashed)
+            seen.add(hashed)
+
+    latest: Dict[str, Tuple[int, int]] = {}
+    stale: Dict[int, List[int]] = {}
+    for position, index in enumerate(indexes):
+        located = sorted((offset, length) for hashed, offset, length in index._iter_records() if hashed in repeated)
+        if not located:
+            continue
+        with index.data_path.open("rb") as f:
+            for offset, length in located:
+                f.seek(offset)
+                url = json.loads(f.read(length)).get("url", "")
+                if url in latest:
+                    previous, previous_offset = latest[url]
+                    stale.setdefault(previous, []).append(previous_offset)
+                latest[url] = (position, offset)
+    for position, index in enumerate(indexes):
+        index.stale_path.unlink(missing_ok=True)
+        if position in stale:
+            index.mark_superseded(stale[position])
+        index._write_meta(index._load_meta()["sorted"], tracked=True)
+
+
+def _tmp_path(path: Path) -> Path:
+    return path.with_name(path.name + f".{os.getpid()}.{threading.get_ident()}.tmp")
+
+
+def _scan_rows(path: Path, start: int) -> Iterator[Tuple[str, int, int]]:
+    with path.open("rb") as f:
+        f.seek(start)
+        offset = start
+        for line in f:
+            if line.strip():
+                yield json.loads(line).get("url", ""), offset, len(line)
+            offset += len(line)
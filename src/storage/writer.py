@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import queue
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+from src.storage.data_store import NormalizedDocument, RawDocument, Summary
+
+# Collection name -> store method that appends to it.
+_ADD_METHODS = {
+    "raw": "add_raw_documents",
+    "normalized": "add_normalized_documents",
+    "summary": "add_summaries",
+}
+
+
+class StoreWriter:
+    """Single writer thread that funnels batches from many producers into a store.
+
+    Producers hand records to ``add_*`` and return immediately. The writer
+    thread drains everything queued so far, merges it per collection and makes
+    one store call per collection, with a single fsync per drain when ``fsync``
+    is set. Only this thread touches the store, so producer threads never
+    contend on its locks or on a shared SQLite connection. ``on_written``, if
+    given, is called from the writer thread with the collection name and the
+    records of each store call once it has returned, so callers can tell
+    which records are durable.
+    """
+
+    def __init__(
+        self,
+        store: Any,
+        fsync: bool = True,
+        max_pending: int = 64,
+        on_written: Callable[[str, List[Any]], None] | None = None,
+    ) -> None:
+        self.store = store
+        self.fsync = fsync
+        self.on_written = on_written
+        self.added: Dict[str, int] = {name: 0 for name in _ADD_METHODS}
+        self._queue: "queue.Queue[Tuple[str, List[Any]] | None]" = queue.Queue(maxsize=max(1, max_pending))
+        self._error: BaseException | None = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="store-writer", daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> "StoreWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def add_raw_documents(self, docs: Iterable[RawDocument]) -> None:
+        self._put("raw", docs)
+
+    def add_normalized_documents(self, docs: Iterable[NormalizedDocument]) -> None:
+        self._put("normalized", docs)
+
+    def add_summaries(self, summaries: Iterable[Summary]) -> None:
+        self._put("summary", summaries)
+
+    def _put(self, name: str, records: Iterable[Any]) -> None:
+        if self._closed:
+            raise RuntimeError("StoreWriter is closed")
+        self._raise_pending_error()
+        batch = list(records)
+        if batch:
+            self._queue.put((name, batch))
+
+    def flush(self) -> None:
+        """Block until every batch queued so far has been written."""
+
+        self._queue.join()
+        self._raise_pending_error()
+
+    def close(self) -> Dict[str, int]:
+        """Write the remaining batches, stop the thread and return per-collection added counts."""
+
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+            self._thread.join()
+        self._raise_pending_error()
+        return dict(self.added)
+
+    def _raise_pending_error(self) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            items = [self._queue.get()]
+            while True:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            pending: Dict[str, List[Any]] = {}
+            for item in items:
+                if item is None:
+                    stopping = True
+                else:
+                    pending.setdefault(item[0], []).extend(item[1])
+            try:
+                for name, records in pending.items():
+                    self.added[name] += getattr(self.store, _ADD_METHODS[name])(records, fsync=self.fsync)
+                    if self.on_written is not None:
+                        self.on_written(name, records)
+            except BaseException as exc:  # surfaced to producers on their next call
+                self._error = exc
+            finally:
+                for _ in items:
+                    self._queue.task_done()
@@ -0,0 +1,95 @@
+import threading
+import time
+import urllib.error
+
+import pytest
+
+from src.collect.adaptive import AdaptiveConcurrency, AimdSettings, is_congestion
+from src.collect.fetch_strategy import FetchStrategy
+from src.collect.web_scraper import FetchContext, fetch_jobs
+from src.storage.data_store import RawDocument
+
+
+def _http_error(code):
+    return urllib.error.HTTPError("https://example.com", code, "error", {}, None)
+
+
+def test_congestion_signals():
+    assert is_congestion(_http_error(429)) and is_congestion(_http_error(503))
+    assert is_congestion(TimeoutError()) and is_congestion(urllib.error.URLError(TimeoutError()))
+    assert not is_congestion(_http_error(404)) and not is_congestion(ConnectionResetError())
+
+
+def test_limit_grows_additively_and_is_cut_once_per_burst():
+    now = [0.0]
+    controller = AdaptiveConcurrency(AimdSettings(initial=2, maximum=8), clock=lambda: now[0])
+
+    for _ in range(11):
+        assert controller.try_acquire("docs", 8)
+        controller.release("docs", now[0], latency=0.1, failed=False, congested=False)
+        now[0] += 1
+    assert controller.limits() == {"docs": 5}
+
+    # Three requests of one burst come back 429: only the first one cuts.
+    started = now[0]
+    for _ in range(3):
+        controller.try_acquire("docs", 8)
+    now[0] += 1
+    for _ in range(3):
+        controller.release("docs", started, latency=0.1, failed=True, congested=True)
+    assert controller.limits() == {"docs": 2}
+
+    # Slow answers hold the limit where it is.
+    controller.try_acquire("docs", 8)
+    controller.release("docs", now[0], latency=60.0, failed=False, congested=False)
+    assert controller.limits() == {"docs": 2}
+
+    trace = controller.summary()["channels"]["docs"]["trace"]
+    assert [(entry["limit"], entry["reason"]) for entry in trace] == [
+        (2, "start"),
+        (3, "increase"),
+        (4, "increase"),
+        (5, "increase"),
+        (2, "congestion"),
+    ]
+
+
+@pytest.mark.parametrize("engine", ["thread", "async"])
+def test_channels_get_their_own_limits(monkeypatch, engine):
+    in_flight = {"b2b": 0, "docs": 0}
+    peak = dict(in_flight)
+    lock = threading.Lock()
+
+    def fake_fetch(url, strategy, *args):
+        outcome = args[-1]
+        group = "b2b" if "analyst" in url else "docs"
+        with lock:
+            in_flight[group] += 1
+            peak[group] = max(peak[group], in_flight[group])
+        time.sleep(0.01)
+        with lock:
+            in_flight[group] -= 1
+        outcome.latency = 0.01
+        if group == "b2b":
+            outcome.errors.append(_http_error(429))
+            return None
+        return RawDocument(url=url, title="t", content="c", fetched_at="now")
+
+    async def fake_fetch_async(url, strategy, client, *args):
+        return fake_fetch(url, strategy, *args)
+
+    monkeypatch.setattr("src.collect.web_scraper._fetch_single", fake_fetch)
+    monkeypatch.setattr("src.collect.web_scraper._fetch_single_async", fake_fetch_async)
+    strategy = FetchStrategy(per_request_delay=0.0, engine=engine)
+    jobs = [(f"https://analyst{idx}.example.com/r", strategy) for idx in range(30)]
+    jobs += [(f"https://docs{idx}.example.com/p", strategy) for idx in range(60)]
+    groups = ["b2b" if "analyst" in url else "docs" for url, _ in jobs]
+    controller = AdaptiveConcurrency(AimdSettings(initial=2))
+
+    documents = fetch_jobs(jobs, strategy, concurrency=8, context=FetchContext(adaptive=controller), groups=groups)
+
+    assert sum(doc is not None for doc in documents) == 60
+    limits = controller.limits()
+    assert limits["b2b"] == 1 and limits["docs"] == 8
+    if engine == "thread":
+        assert peak["b2b"] <= 2 and peak["docs"] > 2
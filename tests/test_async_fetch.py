@@ -0,0 +1,102 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.collect.fetch_metrics import FetchMetrics
+from src.collect.fetch_strategy import FetchStrategy
+from src.collect.web_scraper import FetchContext, fetch_documents, fetch_jobs
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    connections = 0
+
+    def setup(self):
+        type(self).connections += 1
+        super().setup()
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.startswith("/slow/"):
+            time.sleep(0.2)
+        if self.path == "/redirect":
+            self.send_response(302)
+            self.send_header("Location", "/page/redirected")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        elif self.path == "/missing":
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        elif self.path == "/chunked":
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=gbk")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for chunk in ("<title>分块</title>".encode("gbk"), b"<p>body</p>"):
+                self.wfile.write(f"{len(chunk):x}\r\n".encode() + chunk + b"\r\n")
+            self.wfile.write(b"0\r\n\r\n")
+        else:
+            body = f"<html><title>{self.path}</title><body>content</body></html>".encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+
+@pytest.fixture()
+def server():
+    _Handler.connections = 0
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_async_engine_reuses_pooled_connections(server):
+    urls = [f"{server}/page/{i}" for i in range(30)]
+    strategy = FetchStrategy(engine="async", max_connections_per_host=2, max_retries=0)
+
+    docs = fetch_documents(urls, strategy=strategy, concurrency=10)
+
+    assert [doc.title for doc in docs] == [f"/page/{i}" for i in range(30)]
+    assert _Handler.connections <= 2
+
+
+def test_async_engine_handles_chunked_redirects_and_errors(server):
+    strategy = FetchStrategy(engine="async", max_retries=0, cache_ttl=None)
+    metrics = FetchMetrics()
+    urls = [f"{server}/chunked", f"{server}/redirect", f"{server}/missing"]
+
+    chunked, redirected, missing = fetch_jobs(
+        [(url, strategy) for url in urls], strategy, context=FetchContext(metrics=metrics)
+    )
+
+    assert (chunked.title, chunked.content) == ("分块", "分块 body")
+    assert redirected.title == "/page/redirected"
+    assert missing is None
+    assert metrics.summary()["channels"]["general"]["failures"] == {"http_404": 1}
+
+
+def test_async_engine_skips_failed_urls(server):
+    strategy = FetchStrategy(engine="async", max_retries=1, per_request_delay=0)
+    docs = fetch_documents([f"{server}/missing", f"{server}/page/ok"], strategy=strategy, concurrency=4)
+    assert [doc.url for doc in docs] == [f"{server}/page/ok"]
+
+
+def test_timeout_does_not_count_time_queued_for_a_connection(server):
+    # 16 requests of 0.2 s over 2 connections take 1.6 s; each must get its own 1 s once sent.
+    urls = [f"{server}/slow/{i}" for i in range(16)]
+    strategy = FetchStrategy(engine="async", max_connections_per_host=2, max_retries=0, timeout=1.0)
+
+    docs = fetch_documents(urls, strategy=strategy, concurrency=16)
+
+    assert len(docs) == 16
@@ -0,0 +1,107 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.collect.body_limits import BodyLimits, ResponseRejected
+from src.collect.fetch_strategy import FetchStrategy
+from src.collect.web_scraper import fetch_documents
+
+PAGE = b"<html><head><title>Preview</title></head><body>" + b"x" * 50_000 + b"</body></html>"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    requests = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        type(self).requests.append(self.path)
+        if self.path == "/video":
+            self.send_response(200)
+            self.send_header("Content-Type", "video/mp4")
+            self.send_header("Content-Length", str(500 * 1024 * 1024))
+            self.end_headers()
+            return
+        if self.path == "/endless":
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            chunk = b"y" * 8192
+            try:
+                for _ in range(64):
+                    self.wfile.write(f"{len(chunk):x}\r\n".encode() + chunk + b"\r\n")
+                self.wfile.write(b"0\r\n\r\n")
+            except OSError:
+                pass
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(PAGE)))
+        self.end_headers()
+        self.wfile.write(PAGE)
+
+
+class _Server(ThreadingHTTPServer):
+    def handle_error(self, request, client_address):
+        pass  # clients hang up on rejected responses by design
+
+
+@pytest.fixture()
+def server():
+    _Handler.requests = []
+    httpd = _Server(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_headers_are_checked_before_the_body():
+    limits = BodyLimits(max_bytes=1000)
+    limits.check_headers({"Content-Type": "text/html; charset=utf-8", "Content-Length": "999"})
+    with pytest.raises(ResponseRejected):
+        limits.check_headers({"Content-Type": "application/pdf"})
+    with pytest.raises(ResponseRejected):
+        limits.check_headers({"Content-Type": "text/html", "Content-Length": "1001"})
+
+
+def test_preview_stops_after_head_across_chunk_boundaries():
+    buffer = BodyLimits(max_bytes=None, preview_bytes=4).buffer()
+    assert not buffer.feed(b"<title>t</title></he")
+    assert not buffer.feed(b"AD><b")
+    assert buffer.feed(b"ody>and the rest")
+    assert buffer.getvalue() == b"<title>t</title></heAD><bod"
+
+
+def test_unbounded_body_is_aborted_once_over_max_bytes():
+    buffer = BodyLimits(max_bytes=10).buffer()
+    buffer.feed(b"0123456789")
+    with pytest.raises(ResponseRejected):
+        buffer.feed(b"!")
+
+
+@pytest.mark.parametrize("engine", ["thread", "async"])
+def test_fetch_rejects_non_html_and_oversized_pages_without_retrying(server, engine):
+    strategy = FetchStrategy(timeout=5.0, max_retries=2, per_request_delay=0.0, engine=engine, max_bytes=100_000)
+    urls = [f"{server}/video", f"{server}/endless", f"{server}/page"]
+
+    documents = fetch_documents(urls, strategy=strategy)
+
+    assert [doc.url for doc in documents] == [f"{server}/page"]
+    assert sorted(_Handler.requests) == ["/endless", "/page", "/video"]
+
+
+@pytest.mark.parametrize("engine", ["thread", "async"])
+def test_preview_fetch_keeps_the_title_and_drops_the_tail(server, engine):
+    strategy = FetchStrategy(timeout=5.0, max_retries=0, per_request_delay=0.0, engine=engine, preview_bytes=100)
+
+    [document] = fetch_documents([f"{server}/page"], strategy=strategy)
+
+    assert document.title == "Preview"
+    assert len(document.content) < 200
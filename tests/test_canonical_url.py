@@ -0,0 +1,25 @@
+import pytest
+
+from src.collect.canonical_url import canonicalize_url, canonicalize_urls
+
+
+@pytest.mark.parametrize(
+    ("url", "expected"),
+    [
+        ("HTTPS://Shop.JD.com:443/Item/1/?utm_source=x&id=7&gclid=abc#reviews", "https://shop.jd.com/Item/1?id=7"),
+        ("http://example.com", "http://example.com/"),
+        ("http://example.com:8080/a//", "http://example.com:8080/a"),
+        ("https://example.com/?spm=a.b&q=a%20b&UTM_Medium=m&page=", "https://example.com/?q=a%20b&page="),
+        ("https://user@[::1]:443/x/", "https://user@[::1]/x"),
+        ("mailto:Someone@Example.com", "mailto:Someone@Example.com"),
+        ("https://example.com:notaport/", "https://example.com:notaport/"),
+    ],
+)
+def test_canonicalize_url(url, expected):
+    assert canonicalize_url(url) == expected
+
+
+def test_spellings_of_one_page_collapse_in_first_seen_order():
+    urls = ["https://b.com/x", "https://A.com/p/#top", "https://a.com/p?utm_campaign=z", "https://b.com/x/"]
+
+    assert canonicalize_urls(urls) == ["https://b.com/x", "https://a.com/p"]
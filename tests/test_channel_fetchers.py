@@ -1,3 +1,4 @@
+import time
 import unittest
 from unittest import mock
 
@@ -36,7 +37,7 @@ class ChannelFetcherTests(unittest.TestCase):
 
         base_strategy = FetchStrategy(timeout=1.0, max_retries=1)
 
-        with mock.patch("src.collect.channel_fetchers.fetch_documents") as mock_fetch:
+        with mock.patch("src.collect.channel_fetchers.fetch_jobs") as mock_fetch:
             mock_fetch.return_value = [
                 RawDocument(url="https://example.com/page", title="t", content="c", fetched_at="now"),
             ]
@@ -50,10 +51,52 @@ class ChannelFetcherTests(unittest.TestCase):
 
         mock_fetch.assert_called_once()
         self.assertEqual(mock_fetch.call_args.kwargs["concurrency"], 4)
-        called_strategy = mock_fetch.call_args.kwargs["strategy"]
+        [(called_url, called_strategy)] = mock_fetch.call_args.args[0]
+        self.assertEqual(called_url, "https://example.com/page")
         self.assertEqual(called_strategy.timeout, 99.0)
         self.assertEqual(documents[0].channel, "special")
 
+    def test_channel_fetch_uses_its_strategy_on_the_shared_pool(self) -> None:
+        fetcher = ChannelFetcher(name="special", domains=("example.com",), default_strategy=FetchStrategy(timeout=99.0))
+
+        with mock.patch("src.collect.channel_fetchers.fetch_jobs") as mock_fetch:
+            mock_fetch.return_value = [
+                RawDocument(url="https://example.com/a", title="t", content="c", fetched_at="now"),
+                None,
+            ]
+            documents = fetcher.fetch(["https://example.com/a", "https://example.com/b"], FetchStrategy(timeout=1.0))
+
+        jobs = mock_fetch.call_args.args[0]
+        self.assertEqual([strategy.timeout for _, strategy in jobs], [99.0, 99.0])
+        self.assertEqual([(doc.url, doc.channel) for doc in documents], [("https://example.com/a", "special")])
+
+    def test_channels_share_one_worker_pool(self) -> None:
+        slow = ChannelFetcher(name="slow", domains=("slow.example",), default_strategy=FetchStrategy(max_retries=0))
+        fast = ChannelFetcher(name="fast", domains=("fast.example",), default_strategy=FetchStrategy(max_retries=0))
+        urls = [f"https://{host}.example/{idx}" for host in ("slow", "fast") for idx in range(2)]
+
+        def fake_fetch(url, _strategy, *_):  # noqa: ARG001
+            time.sleep(0.2)
+            return f"<title>{url}</title>"
+
+        started = time.monotonic()
+        with mock.patch("src.collect.web_scraper._fetch_html", side_effect=fake_fetch):
+            documents = collect_with_routing(urls, None, FetchStrategy(), fetchers=[slow, fast], concurrency=4)
+        elapsed = time.monotonic() - started
+
+        # One pool of four workers fetches both channels at once: ~0.2s, not 2 x 0.2s.
+        self.assertLess(elapsed, 0.35)
+        self.assertEqual([doc.channel for doc in documents], ["slow", "slow", "fast", "fast"])
+        self.assertEqual([doc.url for doc in documents], urls)
+
+    def test_channel_strategy_inherits_fetch_engine(self) -> None:
+        fetcher = ChannelFetcher(name="special", domains=("example.com",), default_strategy=FetchStrategy(timeout=99.0))
+
+        chosen = fetcher.choose_strategy(FetchStrategy(engine="async", max_connections_per_host=2))
+
+        self.assertEqual((chosen.timeout, chosen.engine, chosen.max_connections_per_host), (99.0, "async", 2))
+        self.assertEqual(fetcher.default_strategy.engine, "thread")
+
 
 if __name__ == "__main__":
     unittest.main()
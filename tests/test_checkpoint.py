@@ -0,0 +1,69 @@
+import pytest
+
+from src.collect.fetch_strategy import FetchStrategy
+from src.pipeline.checkpoint import FetchCheckpoint
+from src.pipeline.runtime import run_fetch
+from src.storage.data_store import RawDocument, open_data_store
+
+URLS = [f"https://example.com/{idx}" for idx in range(12)]
+
+
+def _fake_fetch(calls, stop_at=None, fail=()):
+    def fetch(url, strategy, *args):
+        if url == stop_at:
+            raise KeyboardInterrupt
+        calls.append(url)
+        if url in fail:
+            return None
+        return RawDocument(url=url, title=url, content="body", fetched_at="now")
+
+    return fetch
+
+
+def test_checkpoint_tracks_pending_urls_and_ignores_torn_lines(tmp_path):
+    checkpoint = FetchCheckpoint.for_data_dir(tmp_path)
+    checkpoint.start(["https://a.com/x", "https://a.com/xy", "https://b.com/"])
+    checkpoint.mark_done(["https://b.com/"])
+    checkpoint.close()
+    with checkpoint.done_path.open("a", encoding="utf-8") as handle:
+        handle.write("https://a.com/x")
+
+    assert FetchCheckpoint.for_data_dir(tmp_path).pending() == ["https://a.com/x", "https://a.com/xy"]
+
+    checkpoint.clear()
+    assert not checkpoint.exists()
+
+
+@pytest.mark.parametrize("engine", ["jsonl", "sqlite"])
+def test_resume_fetches_only_unfinished_urls(tmp_path, monkeypatch, engine):
+    monkeypatch.setattr("src.pipeline.runtime.FETCH_BATCH_SIZE", 3)
+    store = open_data_store(tmp_path, engine=engine)
+    strategy = FetchStrategy(per_request_delay=0.0)
+    calls = []
+
+    monkeypatch.setattr("src.collect.web_scraper._fetch_single", _fake_fetch(calls, stop_at=URLS[8], fail={URLS[1]}))
+    with pytest.raises(KeyboardInterrupt):
+        run_fetch(URLS, store, strategy)
+
+    # Everything fetched before the interruption was stored, including the partial batch.
+    stored = {doc.url for doc in store.iter_raw_documents()}
+    assert stored == set(URLS[:8]) - {URLS[1]}
+    assert FetchCheckpoint.for_data_dir(tmp_path).pending() == URLS[8:]
+
+    calls.clear()
+    monkeypatch.setattr("src.collect.web_scraper._fetch_single", _fake_fetch(calls))
+    run_fetch([], store, strategy, resume=True)
+
+    assert calls == URLS[8:]
+    assert {doc.url for doc in store.iter_raw_documents()} == set(URLS) - {URLS[1]}
+    assert not FetchCheckpoint.for_data_dir(tmp_path).exists()
+
+
+def test_resume_without_checkpoint_fetches_given_urls(tmp_path, monkeypatch):
+    store = open_data_store(tmp_path)
+    calls = []
+    monkeypatch.setattr("src.collect.web_scraper._fetch_single", _fake_fetch(calls))
+
+    run_fetch(URLS[:2], store, FetchStrategy(per_request_delay=0.0), resume=True)
+
+    assert calls == URLS[:2]
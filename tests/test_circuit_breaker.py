@@ -0,0 +1,105 @@
+import threading
+import time
+import urllib.error
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.collect.circuit_breaker import CircuitBreaker, is_host_failure
+from src.collect.fetch_strategy import FetchStrategy
+from src.collect.web_scraper import FetchContext, fetch_documents
+
+DEAD = "https://dead.example.com/page"
+
+
+def _http_error(code):
+    return urllib.error.HTTPError(DEAD, code, "error", {}, None)
+
+
+def test_host_failures():
+    assert is_host_failure(urllib.error.URLError("refused")) and is_host_failure(TimeoutError())
+    assert is_host_failure(_http_error(503)) and is_host_failure(_http_error(429))
+    assert not is_host_failure(_http_error(404)) and not is_host_failure(_http_error(304))
+    assert not is_host_failure(ValueError("Unsupported URL: ftp://example.com/"))
+
+
+def test_breaker_opens_probes_half_open_and_persists(tmp_path):
+    now = [1000.0]
+    breaker = CircuitBreaker(tmp_path / "breakers.json", failure_threshold=3, cooldown=60, clock=lambda: now[0])
+
+    for _ in range(3):
+        assert breaker.allow(DEAD)
+        breaker.record(DEAD, TimeoutError())
+    assert not breaker.allow(DEAD)
+    assert breaker.allow("https://alive.example.com/")
+    breaker.save()
+
+    # The next run picks the open breaker up from disk.
+    reloaded = CircuitBreaker(tmp_path / "breakers.json", cooldown=60, clock=lambda: now[0])
+    assert reloaded.open_hosts() == ["dead.example.com"]
+    assert not reloaded.allow(DEAD)
+
+    now[0] += 61
+    assert reloaded.allow(DEAD)  # the half-open probe
+    assert not reloaded.allow(DEAD)
+    reloaded.record(DEAD, _http_error(502))
+    assert not reloaded.allow(DEAD)
+
+    now[0] += 61
+    assert reloaded.allow(DEAD)
+    reloaded.record(DEAD, _http_error(404))
+    assert reloaded.allow(DEAD) and reloaded.open_hosts() == []
+
+
+def test_open_breaker_skips_a_dead_host_across_calls(monkeypatch):
+    attempts = []
+
+    def fake_fetch_html(url, strategy, *_):
+        attempts.append(url)
+        if "dead" in url:
+            raise urllib.error.URLError("connection refused")
+        return f"<title>{url}</title>"
+
+    monkeypatch.setattr("src.collect.web_scraper._fetch_html", fake_fetch_html)
+    strategy = FetchStrategy(max_retries=2, per_request_delay=0.0)
+    breaker = CircuitBreaker(failure_threshold=3)
+    urls = [f"https://dead.example.com/{idx}" for idx in range(20)] + ["https://alive.example.com/"]
+
+    documents = fetch_documents(urls, strategy=strategy, context=FetchContext(breaker=breaker))
+
+    assert [doc.url for doc in documents] == ["https://alive.example.com/"]
+    assert sum("dead" in url for url in attempts) == 3
+    attempts.clear()
+    assert fetch_documents(urls[:5], strategy=strategy, context=FetchContext(breaker=breaker)) == []
+    assert attempts == []
+
+
+class _SlowHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        time.sleep(0.2)
+        body = b"<title>slow</title>"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def test_waiting_for_a_connection_slot_does_not_trip_the_breaker():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _SlowHandler)
+    threading.Thread(target=httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+    try:
+        # The queue behind 2 connections is longer than the timeout; the host itself is healthy.
+        urls = [f"http://127.0.0.1:{httpd.server_address[1]}/{idx}" for idx in range(16)]
+        strategy = FetchStrategy(engine="async", max_connections_per_host=2, max_retries=0, timeout=1.0)
+        breaker = CircuitBreaker(failure_threshold=1)
+
+        documents = fetch_documents(urls, strategy=strategy, concurrency=16, context=FetchContext(breaker=breaker))
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+    assert len(documents) == 16
+    assert breaker.open_hosts() == [] and breaker.skipped == 0
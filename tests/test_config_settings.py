@@ -44,3 +44,31 @@ def test_load_app_config_with_defaults(tmp_path, monkeypatch):
     # falls back to defaults when missing
     assert task.product_type == "software"
     assert task.concurrency == 3  # falls back to default_concurrency
+
+
+def test_task_retention_settings(tmp_path):
+    config_path = tmp_path / "config.json"
+    config_path.write_text(
+        '{"tasks": [{"name": "t", "retention_max_age_days": 14, "retention_max_docs_per_channel": 500}, {"name": "u"}]}'
+    )
+
+    config = load_app_config(config_path)
+
+    assert config.tasks[0].retention_max_age_days == 14.0
+    assert config.tasks[0].retention_max_docs_per_channel == 500
+    assert config.tasks[0].retention_max_bytes is None
+    assert config.tasks[0].has_retention
+    assert not config.tasks[1].has_retention
+
+
+def test_task_adaptive_concurrency_settings(tmp_path):
+    config_path = tmp_path / "config.json"
+    config_path.write_text(
+        '{"tasks": [{"name": "empty", "adaptive_concurrency": {}}, {"name": "on", "adaptive_concurrency": true},'
+        ' {"name": "tuned", "adaptive_concurrency": {"maximum": 4}}, {"name": "off", "adaptive_concurrency": false},'
+        ' {"name": "unset"}]}'
+    )
+
+    tasks = {task.name: task.adaptive_concurrency for task in load_app_config(config_path).tasks}
+
+    assert tasks == {"empty": {}, "on": {}, "tuned": {"maximum": 4}, "off": None, "unset": None}
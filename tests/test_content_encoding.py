@@ -0,0 +1,116 @@
+import gzip
+import io
+import threading
+import tracemalloc
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.collect.body_limits import BodyLimits, ResponseRejected
+from src.collect.content_encoding import ContentDecoder, TransferStats, read_response
+from src.collect.fetch_strategy import FetchStrategy
+from src.collect.source_discovery import _http_get
+from src.collect.web_scraper import FetchContext, fetch_documents
+
+PAGE = ("<html><head><title>压缩</title></head><body>" + "repetitive text " * 2000 + "</body></html>").encode()
+
+
+def _raw_deflate(data: bytes) -> bytes:
+    compressor = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    accept_encodings = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        type(self).accept_encodings.append(self.headers.get("Accept-Encoding"))
+        encoding = self.path.strip("/")
+        body = {"gzip": gzip.compress(PAGE), "deflate": zlib.compress(PAGE), "raw-deflate": _raw_deflate(PAGE)}.get(
+            encoding, PAGE
+        )
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        if encoding != "identity":
+            self.send_header("Content-Encoding", "deflate" if encoding == "raw-deflate" else encoding)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture()
+def server():
+    _Handler.accept_encodings = []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "deflate", "raw-deflate", "identity"])
+def test_read_response_decodes_incrementally(encoding, monkeypatch):
+    monkeypatch.setattr("src.collect.content_encoding.CHUNK_SIZE", 512)
+    body = {"gzip": gzip.compress(PAGE), "deflate": zlib.compress(PAGE), "raw-deflate": _raw_deflate(PAGE)}.get(
+        encoding, PAGE
+    )
+
+    decoded, decoder = read_response(io.BytesIO(body), "deflate" if encoding == "raw-deflate" else encoding)
+
+    assert decoded == PAGE
+    assert (decoder.wire_bytes, decoder.decoded_bytes) == (len(body), len(PAGE))
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "deflate"])
+def test_decompression_bomb_is_rejected_within_the_body_limit(encoding):
+    zeros = b"\0" * (64 * 1024 * 1024)
+    bomb = gzip.compress(zeros) if encoding == "gzip" else zlib.compress(zeros)
+    del zeros
+    limits = BodyLimits(max_bytes=1024 * 1024, content_types=())
+
+    tracemalloc.start()
+    try:
+        with pytest.raises(ResponseRejected):
+            read_response(io.BytesIO(bomb), encoding, limits)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert peak < 8 * 1024 * 1024
+
+
+def test_unsupported_encoding_is_rejected():
+    with pytest.raises(ValueError):
+        ContentDecoder("br")
+
+
+@pytest.mark.parametrize("engine", ["thread", "async"])
+def test_fetch_negotiates_compression_and_records_sizes(server, engine):
+    strategy = FetchStrategy(timeout=5.0, max_retries=0, per_request_delay=0.0, engine=engine)
+    transfer = TransferStats()
+    urls = [f"{server}/gzip", f"{server}/deflate", f"{server}/identity"]
+
+    documents = fetch_documents(urls, strategy=strategy, context=FetchContext(transfer=transfer))
+
+    assert [doc.title for doc in documents] == ["压缩"] * 3
+    assert all("gzip" in accepted for accepted in _Handler.accept_encodings)
+    by_encoding = transfer.summary()["encodings"]
+    assert by_encoding["gzip"]["wire_bytes"] * 8 < by_encoding["gzip"]["decoded_bytes"] == len(PAGE)
+    assert by_encoding["identity"]["wire_bytes"] == len(PAGE)
+    assert transfer.requests == transfer.summary()["requests"] == 3
+
+
+def test_discovery_requests_are_compressed(server):
+    transfer = TransferStats()
+
+    html = _http_get(f"{server}/gzip", transfer=transfer)
+
+    assert "压缩" in html
+    assert transfer.wire_bytes < transfer.decoded_bytes
@@ -0,0 +1,113 @@
+import json
+
+import pytest
+
+from src.storage.data_store import DataStore, NormalizedDocument, RawDocument, Summary
+from src.storage.records import unread_content_ref
+
+
+def _normalized(url: str, channel: str, language: str, fetched_at: str) -> NormalizedDocument:
+    return NormalizedDocument(
+        url=url,
+        title=url,
+        content="c",
+        fetched_at=fetched_at,
+        channel=channel,
+        language=language,
+        normalized_at=fetched_at,
+    )
+
+
+def test_iterators_stream_with_filters(tmp_path):
+    store = DataStore(tmp_path)
+    store.add_normalized_documents(
+        [
+            _normalized("https://a", "docs", "en", "2025-02-01T00:00:00Z"),
+            _normalized("https://b", "github", "zh", "2025-02-05T00:00:00Z"),
+            _normalized("https://c", "docs", "zh", "2025-02-09T00:00:00Z"),
+        ]
+    )
+
+    assert [doc.url for doc in store.iter_normalized_documents(channel="docs")] == ["https://a", "https://c"]
+    assert [doc.url for doc in store.iter_normalized_documents(language="zh")] == ["https://b", "https://c"]
+    window = store.iter_normalized_documents(since="2025-02-05T00:00:00Z", until="2025-02-09T00:00:00Z")
+    assert [doc.url for doc in window] == ["https://b"]
+
+
+def test_add_consumes_generators_and_skips_duplicates(tmp_path):
+    store = DataStore(tmp_path)
+    docs = (RawDocument(url=url, title="t", content="c", fetched_at="now") for url in ["https://a", "https://a", "https://b"])
+
+    assert store.add_raw_documents(docs) == 2
+    assert store.add_raw_documents([]) == 0
+    assert store.add_summaries([Summary(url="https://a", bullet_points=["p"], summarized_at="2025-02-01Z")]) == 1
+    assert [s.url for s in store.iter_summaries(since="2025-01-01Z")] == ["https://a"]
+
+
+def test_blob_codec_stores_bodies_once_and_loads_lazily(tmp_path):
+    store = DataStore(tmp_path, blob_codec="lzma")
+    body = "同一正文 " * 200
+    store.add_raw_documents(
+        [
+            RawDocument(url="https://mirror-a", title="A", content=body, fetched_at="now"),
+            RawDocument(url="https://mirror-b", title="B", content=body, fetched_at="now"),
+        ]
+    )
+
+    rows = [json.loads(line) for line in store.raw_file.read_text().splitlines()]
+    assert all("content" not in row and row["content_ref"].startswith("lzma:") for row in rows)
+    assert len(list((tmp_path / "blobs").rglob("*.lzma"))) == 1
+
+    reopened = DataStore(tmp_path)
+    docs = list(reopened.iter_raw_documents())
+    assert unread_content_ref(docs[0], reopened.blobs) == rows[0]["content_ref"]
+    assert docs[0].content == body
+    assert unread_content_ref(docs[0], reopened.blobs) is None
+    assert isinstance(docs[1], RawDocument)
+
+
+def test_records_are_slotted_and_decode_fields_lazily(tmp_path):
+    store = DataStore(tmp_path)
+    store.add_raw_documents([RawDocument(url="https://a", title="A", content="body", fetched_at="now", channel="docs")])
+
+    doc = next(store.iter_raw_documents())
+
+    assert not hasattr(doc, "__dict__")
+    assert doc.channel == "docs"
+    with pytest.raises(AttributeError):
+        RawDocument.content.__get__(doc)
+    assert doc == RawDocument(url="https://a", title="A", content="body", fetched_at="now", channel="docs")
+    doc.title = "renamed"
+    assert doc.title == "renamed"
+
+
+@pytest.mark.parametrize("segment_max_bytes", [None, 256])
+def test_upserts_write_new_versions_only_when_content_changes(tmp_path, segment_max_bytes):
+    store = DataStore(tmp_path, segment_max_bytes=segment_max_bytes)
+    first = RawDocument(url="https://a", title="a", content="v1", fetched_at="2025-02-01T00:00:00Z")
+    other = RawDocument(url="https://b", title="b", content="b", fetched_at="2025-02-01T00:00:00Z")
+    assert store.add_raw_documents([first, other]) == 2
+
+    refetched = RawDocument(url="https://a", title="a", content="v1", fetched_at="2025-02-02T00:00:00Z")
+    changed = RawDocument(url="https://a", title="a", content="v2", fetched_at="2025-02-03T00:00:00Z")
+    assert store.add_raw_documents([refetched]) == 0
+    assert store.add_raw_documents([changed]) == 1
+
+    assert [(doc.url, doc.content) for doc in store.iter_raw_documents()] == [("https://b", "b"), ("https://a", "v2")]
+    assert store.get_document("https://a", collection="raw").content == "v2"
+    assert [doc.url for doc in store.changed_since("2025-02-02T00:00:00Z", collection="raw")] == ["https://a"]
+
+    rows = [json.loads(line) for path in store._paths("raw") for line in path.read_text().splitlines()]
+    assert [(row["url"], row["version"]) for row in rows] == [("https://a", 1), ("https://b", 1), ("https://a", 2)]
+    assert store.compact()["raw"]["rows_after"] == 2
+
+
+def test_upserts_compare_rows_written_before_content_hashes(tmp_path):
+    legacy = {"url": "https://a", "title": "a", "content": "same", "fetched_at": "2025-02-01T00:00:00Z"}
+    (tmp_path / "raw.jsonl").write_text(json.dumps(legacy) + "\n")
+    store = DataStore(tmp_path, blob_codec="zlib")
+
+    assert store.add_raw_documents([RawDocument(**{**legacy, "fetched_at": "2025-02-02T00:00:00Z"})]) == 0
+    assert store.add_raw_documents([RawDocument(**{**legacy, "content": "new"})]) == 1
+    assert store.add_raw_documents([RawDocument(**{**legacy, "content": "new"})]) == 0
+    assert [doc.content for doc in store.iter_raw_documents()] == ["new"]
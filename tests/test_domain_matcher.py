@@ -0,0 +1,51 @@
+import random
+
+from src.collect.channel_fetchers import ChannelFetcher, route_urls_by_channel
+from src.collect.domain_matcher import DomainMatcher, netloc_of
+
+
+def test_lowest_channel_index_wins_and_patterns_match_anywhere_in_the_host():
+    matcher = DomainMatcher([("jd.com", "taobao.com"), ("docs", "case-study"), ("com",)])
+
+    assert matcher.match("item.jd.com") == 0
+    assert matcher.match("docs.python.org") == 1
+    assert matcher.match("www.case-study.io") == 1
+    assert matcher.match("shop.example.com") == 2
+    assert matcher.match("example.org") == -1
+
+
+def test_overlapping_patterns_follow_failure_links():
+    matcher = DomainMatcher([("abcx",), ("bcd",), ("cd",)])
+
+    assert matcher.match("abcd") == 1
+    assert matcher.match("zcd") == 2
+
+
+def test_netloc_matches_urlparse():
+    assert netloc_of("HTTPS://User@Shop.JD.com:8443/a?b#c") == "user@shop.jd.com:8443"
+    assert netloc_of("//cdn.example.com/x") == "cdn.example.com"
+    assert netloc_of("mailto:someone@example.com") == ""
+    assert netloc_of(" http://spaced.example.com/") == "spaced.example.com"
+
+
+def test_routing_agrees_with_per_fetcher_matching():
+    rng = random.Random(3)
+    alphabet = "abcd.-"
+
+    def fragment(size):
+        return "".join(rng.choice(alphabet) for _ in range(size))
+
+    for _ in range(200):
+        fetchers = [
+            ChannelFetcher(name=f"c{idx}", domains=tuple(fragment(rng.randint(1, 4)) for _ in range(rng.randint(0, 3))))
+            for idx in range(rng.randint(1, 5))
+        ]
+        fetchers.append(ChannelFetcher(name="general", domains=(), is_default=True))
+        urls = [f"https://{fragment(rng.randint(0, 12))}/page" for _ in range(30)]
+
+        expected = {fetcher.name: [] for fetcher in fetchers}
+        for url in urls:
+            target = next((fetcher for fetcher in fetchers if fetcher.matches(url)), fetchers[-1])
+            expected[target.name].append(url)
+
+        assert route_urls_by_channel(urls, fetchers) == expected
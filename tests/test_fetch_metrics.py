@@ -0,0 +1,112 @@
+import json
+import socket
+import threading
+import urllib.error
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.collect.fetch_metrics import FetchMetrics, FetchRecord, failure_reason, percentiles
+from src.collect.fetch_strategy import FetchStrategy
+from src.collect.web_scraper import FetchContext, fetch_jobs
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if self.path == "/missing":
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.path == "/report.pdf":
+            self.send_response(200)
+            self.send_header("Content-Type", "application/pdf")
+            self.send_header("Content-Length", "4")
+            self.end_headers()
+            self.wfile.write(b"%PDF")
+            return
+        body = f"<html><title>{self.path}</title><body>content</body></html>".encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture()
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_percentiles_use_nearest_rank():
+    assert percentiles([]) == {}
+    assert percentiles(float(value) for value in range(1, 101)) == {"p50": 50.0, "p95": 95.0, "p99": 99.0}
+    assert percentiles([0.25]) == {"p50": 0.25, "p95": 0.25, "p99": 0.25}
+
+
+def test_failure_reasons():
+    missing = urllib.error.HTTPError("https://example.com", 404, "missing", {}, None)
+    assert failure_reason(missing) == "http_404"
+    assert failure_reason(urllib.error.URLError(socket.timeout())) == "timeout"
+    assert failure_reason(urllib.error.URLError("refused")) == "url_error"
+    assert failure_reason(ConnectionResetError()) == "ConnectionResetError"
+
+
+def test_channel_summary_counts_throughput():
+    metrics = FetchMetrics()
+    metrics.record(FetchRecord("https://a/1", "docs", True, status=200, wire_bytes=300, total=0.5), 0.0, 0.5)
+    metrics.record(FetchRecord("https://a/2", "docs", False, failure="http_503", retries=2, total=1.5), 0.5, 2.0)
+    metrics.record(FetchRecord("https://a/3", "docs", True, source="cache"), 2.0, 2.0)
+
+    docs = metrics.summary()["channels"]["docs"]
+    assert docs["requests"] == 3 and docs["documents"] == 2 and docs["retries"] == 2
+    assert docs["docs_per_sec"] == 1.0 and docs["bytes_per_sec"] == 150.0
+    assert docs["sources"] == {"cache": 1, "network": 2}
+    assert docs["failures"] == {"http_503": 1}
+    # Cache hits do not count towards the request latency percentiles.
+    assert docs["latency"]["total"] == {"p50": 0.5, "p95": 1.5, "p99": 1.5}
+
+
+@pytest.mark.parametrize("engine", ["thread", "async"])
+def test_fetch_jobs_records_every_url(server, tmp_path, engine):
+    strategy = FetchStrategy(engine=engine, max_retries=1, per_request_delay=0.0)
+    jobs = [(f"{server}/page/{idx}", strategy) for idx in range(4)]
+    jobs += [(f"{server}/missing", strategy), (f"{server}/report.pdf", strategy)]
+    groups = ["docs"] * 4 + ["b2b"] * 2
+    metrics = FetchMetrics(tmp_path / "metrics.jsonl")
+
+    documents = fetch_jobs(jobs, strategy, concurrency=2, context=FetchContext(metrics=metrics), groups=groups)
+    metrics.close()
+
+    assert sum(doc is not None for doc in documents) == 4
+    records = [json.loads(line) for line in (tmp_path / "metrics.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert len(records) == 6
+    missing = next(record for record in records if record["url"].endswith("/missing"))
+    assert not missing["ok"] and missing["status"] == 404 and missing["failure"] == "http_404"
+    assert missing["retries"] == 0  # a 404 is not retried
+    # Both engines report the status of a response refused by the body limits.
+    rejected = next(record for record in records if record["url"].endswith(".pdf"))
+    assert not rejected["ok"] and rejected["status"] == 200 and rejected["failure"] == "rejected"
+    page = next(record for record in records if record["ok"])
+    assert page["status"] == 200 and page["wire_bytes"] > 0 and page["decoded_bytes"] > 0
+    expected_phases = {"ttfb", "body", "parse"} | ({"dns", "connect"} if engine == "async" else set())
+    assert expected_phases <= set(page["phases"])
+
+    summary = metrics.summary()
+    assert summary["records"] == str(tmp_path / "metrics.jsonl")
+    docs = summary["channels"]["docs"]
+    assert docs["documents"] == 4 and docs["statuses"] == {"200": 4}
+    assert set(docs["latency"]["total"]) == {"p50", "p95", "p99"}
+    assert docs["docs_per_sec"] > 0 and docs["bytes_per_sec"] > 0
+    assert summary["channels"]["b2b"]["failures"] == {"http_404": 1, "rejected": 1}
+    assert summary["channels"]["b2b"]["statuses"] == {"200": 1, "404": 1}
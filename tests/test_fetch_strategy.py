@@ -28,7 +28,7 @@ class FetchStrategyTests(unittest.TestCase):
         strategy = FetchStrategy(max_retries=1, per_request_delay=0)
         calls = {"count": 0}
 
-        def fake_fetch(url, _strategy):  # noqa: ARG001
+        def fake_fetch(url, _strategy, *_):  # noqa: ARG001
             calls["count"] += 1
             if calls["count"] == 1:
                 raise ValueError("temporary failure")
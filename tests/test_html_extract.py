@@ -0,0 +1,50 @@
+from src.collect.html_extract import extract_html
+from src.collect.source_discovery import _parse_links
+from src.collect.web_scraper import _to_document
+
+PAGE = """<!DOCTYPE html>
+<html><head><title> Phone X &amp; Case </title>
+<style>p { color: red }</style>
+<script type="text/javascript">var tpl = '<p>not text</p>';</script>
+</head><body>
+<!-- navigation -->
+<div data-note="a > b"><p>Battery&nbsp;life <b>12h</b></p></div>
+<a href="/specs#battery">Specs</a> <a href='https://shop.example.com/x'>Buy</a>
+<A HREF=https://shop.example.com/x>Again</A> <a name="anchor">no href</a>
+1 < 2 and <SCRIPT>hidden()</SCRIPT > visible
+</body></html>"""
+
+
+def test_title_text_and_links_in_one_pass():
+    extracted = extract_html(PAGE, base_url="https://example.com/phone/")
+
+    assert extracted.title == "Phone X & Case"
+    assert extracted.text == "Phone X & Case Battery\xa0life 12h Specs Buy Again no href 1 < 2 and visible"
+    assert extracted.links == ["https://example.com/specs", "https://shop.example.com/x"]
+
+
+def test_relative_links_are_dropped_without_a_base_url():
+    assert extract_html(PAGE).links == ["https://shop.example.com/x"]
+
+
+def test_malformed_markup_stays_linear():
+    # The old `<script[\\s\\S]*?</script>` stripper rescanned to the end of the
+    # page for every unclosed script, taking minutes on input this size.
+    html = "<title>Broken</title><p>kept</p>" + "<script>x " * 50_000 + "<!-- open" + '<a href="' * 1000
+
+    extracted = extract_html(html)
+
+    assert extracted.title == "Broken"
+    assert extracted.text == "Broken kept"
+
+
+def test_missing_title_falls_back_to_url():
+    document = _to_document("https://example.com/a", "<p>body only</p>")
+
+    assert (document.title, document.content) == ("https://example.com/a", "body only")
+
+
+def test_discovery_links_skip_search_engine_redirects():
+    html = '<a href="https://duckduckgo.com/l/?u=1">r</a><a href="https://vendor.com/p#top">v</a><a href="/rel">x</a>'
+
+    assert _parse_links(html) == ["https://vendor.com/p"]
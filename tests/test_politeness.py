@@ -0,0 +1,65 @@
+import time
+from unittest import mock
+
+from src.collect.fetch_strategy import FetchStrategy
+from src.collect.politeness import HostRateLimiter, interleave_by_host
+from src.collect.web_scraper import fetch_documents
+
+
+def test_rate_limiter_books_slots_per_host():
+    now = [100.0]
+    limiter = HostRateLimiter(clock=lambda: now[0])
+
+    assert limiter.reserve("https://a.com/1", 1.0) == 0.0
+    assert limiter.reserve("https://a.com/2", 1.0) == 1.0
+    assert limiter.reserve("https://A.com/3", 1.0) == 2.0
+    assert limiter.reserve("https://b.com/1", 1.0) == 0.0
+    assert limiter.reserve("https://b.com/2", 0) == 0.0
+
+    now[0] = 110.0
+    assert limiter.reserve("https://a.com/4", 1.0) == 0.0
+
+
+def test_rate_limiter_allows_bursts():
+    limiter = HostRateLimiter(burst=2, clock=lambda: 0.0)
+    assert [limiter.reserve("https://a.com", 1.0) for _ in range(4)] == [0.0, 0.0, 1.0, 2.0]
+
+
+def test_interleave_by_host_round_robins():
+    urls = ["https://a.com/1", "https://a.com/2", "https://a.com/3", "https://b.com/1", "https://c.com/1"]
+    assert [urls[position] for position in interleave_by_host(urls)] == [
+        "https://a.com/1",
+        "https://b.com/1",
+        "https://c.com/1",
+        "https://a.com/2",
+        "https://a.com/3",
+    ]
+
+
+def test_fetch_documents_spaces_requests_per_host_across_workers():
+    calls = []
+
+    def fake_fetch(url, _strategy, *_):
+        calls.append((url.split("/")[2], time.monotonic()))
+        return "<title>t</title>"
+
+    urls = [f"https://{host}/{i}" for host in ("a.com", "b.com") for i in range(3)]
+    strategy = FetchStrategy(per_request_delay=0.05, max_retries=0)
+    with mock.patch("src.collect.web_scraper._fetch_html", side_effect=fake_fetch):
+        docs = fetch_documents(urls, strategy=strategy, concurrency=6)
+
+    assert [doc.url for doc in docs] == urls
+    for host in ("a.com", "b.com"):
+        times = sorted(at for name, at in calls if name == host)
+        assert all(later - earlier >= 0.045 for earlier, later in zip(times, times[1:]))
+
+
+def test_deferred_host_waits_even_without_a_rate():
+    now = [0.0]
+    limiter = HostRateLimiter(clock=lambda: now[0])
+    limiter.defer("https://a.com/1", 5.0)
+
+    assert limiter.reserve("https://a.com/2", 0) == 5.0
+    assert limiter.reserve("https://a.com/3", 1.0) == 5.0
+    assert limiter.reserve("https://a.com/4", 1.0) == 6.0
+    assert limiter.reserve("https://b.com/1", 1.0) == 0.0
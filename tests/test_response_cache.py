@@ -0,0 +1,100 @@
+from unittest import mock
+
+from src.collect.channel_fetchers import ECOMMERCE_FETCHER, DOCS_FETCHER
+from src.collect.fetch_strategy import FetchStrategy
+from src.collect.response_cache import ResponseCache
+from src.collect.web_scraper import FetchContext, fetch_documents
+
+HTML = "<html><title>Cached</title><body>content</body></html>"
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_entries_expire_after_ttl_and_persist(tmp_path):
+    clock = _Clock()
+    cache = ResponseCache(tmp_path, clock=clock)
+    cache.put("https://a.com/x", {}, HTML)
+    clock.now += 30
+
+    assert cache.get("https://a.com/x", {}, ttl=60).html == HTML
+    assert cache.get("https://a.com/x", {}, ttl=10) is None
+    assert cache.get("https://a.com/x", {"Accept-Language": "en"}, ttl=60) is None
+    cache.save()
+
+    reloaded = ResponseCache(tmp_path, clock=clock)
+    assert reloaded.get("https://a.com/x", {}, ttl=60).fetched_at.endswith("Z")
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    clock = _Clock()
+    cache = ResponseCache(tmp_path, max_bytes=len(HTML) * 2, clock=clock)
+    for name in ("a", "b"):
+        cache.put(f"https://a.com/{name}", {}, HTML)
+        clock.now += 1
+    cache.get("https://a.com/a", {}, ttl=60)
+    clock.now += 1
+
+    cache.put("https://a.com/c", {}, HTML)
+
+    assert len(cache) == 2
+    assert cache.total_bytes == len(HTML) * 2
+    assert cache.get("https://a.com/b", {}, ttl=60) is None
+    assert cache.get("https://a.com/a", {}, ttl=60) is not None
+    assert len(list(tmp_path.rglob("*.html"))) == 2
+
+
+def test_reloaded_index_keeps_least_recently_used_order(tmp_path):
+    clock = _Clock()
+    cache = ResponseCache(tmp_path, max_bytes=len(HTML) * 3, clock=clock)
+    for name in ("a", "b", "c"):
+        cache.put(f"https://a.com/{name}", {}, HTML)
+        clock.now += 1
+    cache.get("https://a.com/a", {}, ttl=60)
+    cache.save()
+
+    reloaded = ResponseCache(tmp_path, max_bytes=len(HTML) * 2, clock=clock)
+    reloaded.put("https://a.com/d", {}, HTML)
+
+    assert len(reloaded) == 2
+    assert reloaded.get("https://a.com/b", {}, ttl=60) is None
+    assert reloaded.get("https://a.com/c", {}, ttl=60) is None
+    assert reloaded.get("https://a.com/a", {}, ttl=60) is not None
+
+
+def test_fetch_documents_serves_fresh_entries_and_stores_downloads(tmp_path):
+    cache = ResponseCache(tmp_path)
+    strategy = FetchStrategy(per_request_delay=0, cache_ttl=60)
+
+    with mock.patch("src.collect.web_scraper._fetch_html", return_value=HTML) as fetch:
+        first = fetch_documents(["https://a.com/x"], strategy=strategy, context=FetchContext(cache=cache))
+        second = fetch_documents(["https://a.com/x"], strategy=strategy, context=FetchContext(cache=cache))
+
+    assert fetch.call_count == 1
+    assert [doc.title for doc in first + second] == ["Cached", "Cached"]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_offline_mode_replays_stale_entries_and_skips_the_network(tmp_path):
+    clock = _Clock()
+    online = ResponseCache(tmp_path, clock=clock)
+    online.put("https://a.com/x", {}, HTML)
+    online.save()
+    clock.now += 365 * 24 * 3600
+
+    offline = ResponseCache(tmp_path, offline=True, clock=clock)
+    with mock.patch("src.collect.web_scraper._fetch_html", side_effect=AssertionError("network")):
+        documents = fetch_documents(["https://a.com/x", "https://a.com/missing"], context=FetchContext(cache=offline))
+
+    assert [doc.url for doc in documents] == ["https://a.com/x"]
+
+
+def test_channels_use_their_own_ttls():
+    fallback = FetchStrategy()
+    assert ECOMMERCE_FETCHER.choose_strategy(fallback).cache_ttl < fallback.cache_ttl
+    assert DOCS_FETCHER.choose_strategy(fallback).cache_ttl > fallback.cache_ttl
@@ -0,0 +1,76 @@
+from datetime import datetime
+
+from src.storage.data_store import DataStore, RawDocument, Summary
+from src.storage.retention import RetentionPolicy, evicted_positions
+
+
+def _doc(url: str, channel: str, fetched_at: str, content: str = "c") -> RawDocument:
+    return RawDocument(url=url, title="t", content=content, fetched_at=fetched_at, channel=channel)
+
+
+def test_evicted_positions_apply_age_count_and_bytes():
+    now = datetime(2025, 3, 1)
+    entries = [
+        (0, "2025-01-01T00:00:00Z", "docs", 10),
+        (1, "2025-02-27T00:00:00Z", "docs", 10),
+        (2, "2025-02-28T00:00:00Z", "docs", 10),
+        (3, "2025-02-28T00:00:00Z", "github", 10),
+    ]
+
+    assert evicted_positions(entries, RetentionPolicy(max_age_days=7), now=now) == {0}
+    assert evicted_positions(entries, RetentionPolicy(max_docs_per_channel=1), now=now) == {0, 1}
+    assert evicted_positions(entries, RetentionPolicy(max_docs_per_channel=1), per_channel=False, now=now) == set()
+    assert evicted_positions(entries, RetentionPolicy(max_bytes=25), now=now) == {0, 1}
+
+
+def test_compaction_evicts_rows_outside_retention(tmp_path):
+    store = DataStore(tmp_path, retention=RetentionPolicy(max_docs_per_channel=2))
+    store.add_raw_documents(
+        [
+            _doc("https://a", "docs", "2025-02-01T00:00:00Z"),
+            _doc("https://b", "docs", "2025-02-02T00:00:00Z"),
+            _doc("https://c", "docs", "2025-02-03T00:00:00Z"),
+            _doc("https://d", "github", "2025-02-01T00:00:00Z"),
+        ]
+    )
+    store.add_summaries([Summary(url="https://a", bullet_points=["p"], summarized_at="2025-02-01T00:00:00Z")])
+    assert store.needs_compaction()
+
+    result = store.compact()
+
+    assert result["raw"] == {"rows_before": 4, "rows_after": 3, "evicted": 1, "segments": 1}
+    assert result["summary"]["evicted"] == 0
+    assert [doc.url for doc in store.iter_raw_documents()] == ["https://b", "https://c", "https://d"]
+    assert store.get_document("https://a", collection="raw") is None
+    assert not store.needs_compaction()
+
+
+def test_retention_by_age_uses_segment_time_ranges(tmp_path):
+    store = DataStore(tmp_path, segment_max_bytes=1024, retention=RetentionPolicy(max_age_days=30))
+    store.add_raw_documents([_doc("https://old", "docs", "2000-01-01T00:00:00Z")])
+    store.add_raw_documents([_doc("https://new", "docs", "2999-01-01T00:00:00Z")])
+    assert store.needs_compaction()
+
+    store.compact()
+
+    assert [doc.url for doc in store.iter_raw_documents()] == ["https://new"]
+    assert not store.needs_compaction()
+    assert not DataStore(tmp_path).needs_compaction()
+
+
+def test_compaction_deletes_blobs_of_dropped_rows(tmp_path):
+    store = DataStore(tmp_path, blob_codec="zlib", retention=RetentionPolicy(max_docs_per_channel=1))
+    store.add_raw_documents(
+        [
+            _doc("https://a", "docs", "2025-02-01T00:00:00Z", "first"),
+            _doc("https://b", "docs", "2025-02-02T00:00:00Z", "second"),
+        ]
+    )
+    store.add_raw_documents([_doc("https://b", "docs", "2025-02-03T00:00:00Z", "second, edited")])
+    assert len(list((tmp_path / "blobs").rglob("*.zlib"))) == 3
+
+    result = store.compact()
+
+    assert result["blobs"] == {"removed": 2}
+    assert len(list((tmp_path / "blobs").rglob("*.zlib"))) == 1
+    assert [doc.content for doc in store.iter_raw_documents()] == ["second, edited"]
@@ -0,0 +1,92 @@
+import urllib.error
+from datetime import datetime, timezone
+from email.message import Message
+from unittest import mock
+
+from src.collect.fetch_strategy import FetchStrategy
+from src.collect.politeness import HostRateLimiter
+from src.collect.retry import RetryBudget, RetryPolicy, retry_after_seconds
+from src.collect.web_scraper import FetchContext, fetch_documents
+
+
+def _http_error(code: int, retry_after: str | None = None) -> urllib.error.HTTPError:
+    headers = Message()
+    if retry_after is not None:
+        headers["Retry-After"] = retry_after
+    return urllib.error.HTTPError("https://a.com", code, "error", headers, None)
+
+
+def _counting_fetch(error):
+    calls = []
+
+    def fake_fetch(url, _strategy, *_):
+        calls.append(url)
+        raise error
+
+    return calls, fake_fetch
+
+
+def test_policy_classifies_errors_and_backs_off_exponentially():
+    policy = RetryPolicy(base_delay=1.0, max_delay=5.0, jitter=0)
+
+    assert not policy.is_retryable(_http_error(404))
+    assert policy.is_retryable(_http_error(429))
+    assert policy.is_retryable(_http_error(503))
+    assert policy.is_retryable(TimeoutError())
+    assert [policy.backoff(retry) for retry in range(4)] == [1.0, 2.0, 4.0, 5.0]
+    assert RetryPolicy(base_delay=0.3, jitter=0).backoff(1) == 0.6
+    assert 0 <= RetryPolicy(base_delay=1.0).backoff(2) <= 4.0
+
+
+def test_default_strategy_backs_off_without_a_politeness_delay():
+    strategy = FetchStrategy()
+    assert strategy.per_request_delay == 0.0
+    calls, fake_fetch = _counting_fetch(_http_error(503))
+    with mock.patch("src.collect.web_scraper._fetch_html", side_effect=fake_fetch), mock.patch(
+        "src.collect.retry.random.uniform", side_effect=lambda low, high: high
+    ), mock.patch("src.collect.web_scraper.time.sleep") as sleep:
+        assert fetch_documents(["https://a.com/x"], strategy=strategy) == []
+
+    assert len(calls) == 2
+    sleep.assert_called_once_with(0.5)
+
+
+def test_retry_after_accepts_seconds_and_http_dates():
+    now = datetime(2025, 2, 10, 12, 0, 0, tzinfo=timezone.utc)
+
+    assert retry_after_seconds(_http_error(429, "7")) == 7.0
+    assert retry_after_seconds(_http_error(503, "Mon, 10 Feb 2025 12:00:30 GMT"), now=now) == 30.0
+    assert retry_after_seconds(_http_error(503)) is None
+    assert retry_after_seconds(ValueError()) is None
+
+
+def test_permanent_client_errors_are_not_retried():
+    calls, fake_fetch = _counting_fetch(_http_error(404))
+    with mock.patch("src.collect.web_scraper._fetch_html", side_effect=fake_fetch):
+        assert fetch_documents(["https://a.com/x"], strategy=FetchStrategy(max_retries=3)) == []
+    assert len(calls) == 1
+
+
+def test_retry_after_defers_the_host_and_long_waits_give_up():
+    limiter = HostRateLimiter()
+    calls, fake_fetch = _counting_fetch(_http_error(429, "0"))
+    with mock.patch("src.collect.web_scraper._fetch_html", side_effect=fake_fetch):
+        fetch_documents(["https://a.com/x"], strategy=FetchStrategy(max_retries=2), context=FetchContext(limiter))
+    assert len(calls) == 3
+
+    calls, fake_fetch = _counting_fetch(_http_error(429, "3600"))
+    with mock.patch("src.collect.web_scraper._fetch_html", side_effect=fake_fetch):
+        fetch_documents(["https://a.com/x"], strategy=FetchStrategy(max_retries=2))
+    assert len(calls) == 1
+
+
+def test_retry_budget_is_shared_across_the_run():
+    budget = RetryBudget(2)
+    calls, fake_fetch = _counting_fetch(_http_error(503))
+    urls = [f"https://a.com/{i}" for i in range(3)]
+    with mock.patch("src.collect.web_scraper._fetch_html", side_effect=fake_fetch):
+        fetch_documents(urls, strategy=FetchStrategy(max_retries=3), concurrency=3, context=FetchContext(budget=budget))
+
+    assert len(calls) == 3 + 2
+    assert budget.used == 2
+    assert not budget.acquire()
@@ -0,0 +1,130 @@
+import json
+import math
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.collect.validators import ValidatorCache
+from src.collect.web_scraper import _to_document
+
+from src.collect.fetch_strategy import FetchStrategy
+from src.llm.client import LLMClient
+from src.pipeline.runtime import run_fetch, run_normalize, run_summarize
+from src.storage.data_store import RawDocument, open_data_store, utc_now_iso
+
+
+@pytest.mark.parametrize("engine", ["jsonl", "sqlite"])
+def test_normalize_and_summarize_stream_through_store(tmp_path, monkeypatch, engine):
+    monkeypatch.setattr("src.pipeline.runtime.STREAM_BATCH_SIZE", 2)
+    store = open_data_store(tmp_path, engine=engine)
+    store.add_raw_documents(
+        RawDocument(url=f"https://example.com/{idx}", title="t", content=f"Sentence {idx}. More.", fetched_at="now")
+        for idx in range(5)
+    )
+
+    run_normalize(store)
+    run_summarize(store)
+
+    assert len(list(store.iter_normalized_documents())) == 5
+    assert [s.url for s in store.iter_summaries()] == [f"https://example.com/{idx}" for idx in range(5)]
+
+
+
+class _RecordingClient(LLMClient):
+    def chat(self, prompt, **_):
+        self.transfer.record(120, 480, "gzip")
+        return "- point"
+
+
+def test_llm_summarize_reports_transfer(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr("src.pipeline.runtime.LLMClient", _RecordingClient)
+    store = open_data_store(tmp_path)
+    store.add_raw_documents(
+        RawDocument(url=f"https://example.com/{idx}", title="t", content="c", fetched_at="now") for idx in range(2)
+    )
+
+    run_summarize(store, use_llm=True)
+
+    printed = json.loads(capsys.readouterr().out)
+    assert printed["summarized"] == 2
+    assert printed["transfer"]["requests"] == 2 and printed["transfer"]["wire_bytes"] == 240
+
+def test_fetch_skips_stored_urls_within_refetch_window(tmp_path, monkeypatch):
+    store = open_data_store(tmp_path)
+    store.add_raw_documents(
+        [
+            RawDocument(url="https://example.com/fresh", title="t", content="c", fetched_at=utc_now_iso()),
+            RawDocument(url="https://example.com/stale", title="t", content="c", fetched_at="2020-01-01T00:00:00Z"),
+        ]
+    )
+    calls = []
+
+    def fake_fetch(url, strategy, *args):
+        calls.append(url)
+        return RawDocument(url=url, title="t", content="new", fetched_at=utc_now_iso())
+
+    monkeypatch.setattr("src.collect.web_scraper._fetch_single", fake_fetch)
+    urls = ["https://Example.com/fresh/?utm_source=feed", "https://example.com/stale", "https://example.com/new#top"]
+
+    summary = run_fetch(urls, store, FetchStrategy(per_request_delay=0.0), refetch_after_hours=24)
+    assert sorted(calls) == ["https://example.com/new", "https://example.com/stale"]
+    assert summary["metrics"]["channels"]["general"]["documents"] == 2
+    assert len((tmp_path / "fetch_metrics.jsonl").read_text(encoding="utf-8").splitlines()) == 2
+
+    calls.clear()
+    run_fetch(urls, store, FetchStrategy(per_request_delay=0.0), refetch_after_hours=math.inf)
+    assert calls == []
+
+
+UNCHANGED_PAGE = b"<html><title>same</title><body>unchanged page</body></html>"
+
+
+class _UnchangedHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    hits = 0
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        type(self).hits += 1
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(UNCHANGED_PAGE)))
+        self.send_header("ETag", '"v1"')
+        self.end_headers()
+        self.wfile.write(UNCHANGED_PAGE)
+
+
+@pytest.fixture()
+def unchanged_server():
+    _UnchangedHandler.hits = 0
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _UnchangedHandler)
+    threading.Thread(target=httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_unchanged_pages_count_as_fresh_once_checked(tmp_path, unchanged_server):
+    url = f"{unchanged_server}/page"
+    store = open_data_store(tmp_path)
+    store.add_raw_documents([_to_document(url, UNCHANGED_PAGE.decode(), fetched_at="2020-01-01T00:00:00Z")])
+    strategy = FetchStrategy(per_request_delay=0.0, cache_ttl=None)
+
+    # The page is stale, comes back unchanged and is not stored again, yet counts as just checked.
+    for _ in range(3):
+        run_fetch([url], store, strategy, refetch_after_hours=24)
+    assert _UnchangedHandler.hits == 1
+    assert store.get_document(url, "raw").fetched_at == "2020-01-01T00:00:00Z"
+
+    # A 304 moves the check time forward as well.
+    first_check = ValidatorCache.for_data_dir(tmp_path).checked_at(url)
+    run_fetch([url], store, strategy)
+    assert _UnchangedHandler.hits == 2
+    assert ValidatorCache.for_data_dir(tmp_path).checked_at(url) > first_check
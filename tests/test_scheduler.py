@@ -1,9 +1,16 @@
 import json
+import shutil
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from datetime import datetime, timedelta
 from pathlib import Path
 
-from src.config.settings import AppConfig
+from src.collect.response_cache import CACHE_DIRNAME
+from src.config.settings import AppConfig, TaskConfig
 from src.monitoring.monitor import PipelineMonitor
+from src.pipeline import runtime, scheduler
 from src.pipeline.scheduler import ScheduledRunner
+from src.storage import data_store
 
 
 def test_run_once_records_success(tmp_path):
@@ -78,3 +85,120 @@ def test_run_cycles_respects_max_cycles(tmp_path):
 
     assert calls == ["repeat", "repeat"]
     assert len(log_path.read_text().splitlines()) == 2
+
+
+def test_compact_data_dirs_records_compaction(tmp_path):
+    from src.storage.data_store import DataStore, RawDocument
+
+    data_dir = tmp_path / "data"
+    store = DataStore(data_dir, segment_max_bytes=10)
+    for idx in range(3):
+        store.add_raw_documents([RawDocument(url=f"https://{idx}", title="t", content="c", fetched_at="now")])
+    config_path = tmp_path / "config.json"
+    config_path.write_text(
+        json.dumps({"tasks": [{"name": "seg", "urls": ["u"], "data_dir": str(data_dir), "compact_min_segments": 2}]})
+    )
+    log_path = tmp_path / "logs" / "pipeline.log"
+    runner = ScheduledRunner(AppConfig.load(config_path), PipelineMonitor(log_path))
+
+    runner.compact_data_dirs(runner.config.tasks)
+
+    record = json.loads(log_path.read_text().splitlines()[0])
+    assert record["task"] == "seg:compact"
+    assert record["detail"]["compacted"]["raw"]["rows_after"] == 3
+
+
+class _ConditionalHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    requests: list = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        type(self).requests.append(self.headers.get("If-None-Match"))
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = b"<html><title>page</title><body>product page</body></html>"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", '"v1"')
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def test_scheduled_runs_recheck_stored_urls_after_one_interval(tmp_path):
+    _ConditionalHandler.requests = []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _ConditionalHandler)
+    threading.Thread(target=httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+    url = f"http://127.0.0.1:{httpd.server_address[1]}/page"
+    config_path = tmp_path / "config.json"
+    config_path.write_text(
+        json.dumps(
+            {
+                "default_data_dir": str(tmp_path / "data"),
+                "tasks": [
+                    {"name": "hourly", "urls": [url], "interval_minutes": 60},
+                    {"name": "recheck", "urls": [url], "interval_minutes": 0},
+                ],
+            }
+        )
+    )
+    config = AppConfig.load(config_path)
+    hourly, recheck = config.tasks
+    assert (hourly.refetch_after_hours, recheck.refetch_after_hours) == (None, None)
+    monitor = PipelineMonitor(tmp_path / "logs" / "pipeline.log")
+    try:
+        for task in (hourly, hourly, recheck):
+            # Go past the response cache so every recheck reaches the server.
+            shutil.rmtree(tmp_path / "data" / CACHE_DIRNAME, ignore_errors=True)
+            ScheduledRunner(AppConfig(tasks=[task], default_data_dir=tmp_path / "data"), monitor).run_once()
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+    # The page stays fresh for the hourly task's interval; the zero-interval task
+    # rechecks it with a conditional request.
+    assert _ConditionalHandler.requests == [None, '"v1"']
+
+
+class _Clock(datetime):
+    now = datetime(2025, 3, 1, 12, 0, 0)
+
+    @classmethod
+    def utcnow(cls):
+        return cls.now
+
+
+def test_pages_checked_after_the_cycle_start_are_rechecked_next_interval(tmp_path, monkeypatch):
+    for module in (scheduler, runtime, data_store):
+        monkeypatch.setattr(module, "datetime", _Clock)
+    _ConditionalHandler.requests = []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _ConditionalHandler)
+    threading.Thread(target=httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+    url = f"http://127.0.0.1:{httpd.server_address[1]}/page"
+    config = AppConfig(tasks=[TaskConfig(name="hourly", urls=[url])], default_data_dir=tmp_path / "data")
+    runner = ScheduledRunner(config, PipelineMonitor(tmp_path / "logs" / "pipeline.log"))
+
+    def late_pipeline(task, app_config):
+        # The run reaches the page ten minutes into the cycle.
+        _Clock.now += timedelta(minutes=10)
+        detail = runner._run_pipeline_task(task, app_config)
+        _Clock.now += timedelta(minutes=1)
+        return detail
+
+    def next_interval(_):
+        _Clock.now += timedelta(minutes=49)
+        shutil.rmtree(tmp_path / "data" / CACHE_DIRNAME, ignore_errors=True)
+
+    runner.pipeline_executor = late_pipeline
+    try:
+        runner.run(max_cycles=2, sleep_seconds=0, sleep_fn=next_interval)
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+    assert _ConditionalHandler.requests == [None, '"v1"']
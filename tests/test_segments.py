@@ -0,0 +1,63 @@
+import json
+
+from src.storage.data_store import DataStore, RawDocument
+
+
+def _doc(url: str, fetched_at: str) -> RawDocument:
+    return RawDocument(url=url, title="t", content="x" * 50, fetched_at=fetched_at)
+
+
+def test_segments_rotate_by_day_and_size_and_skip_by_time(tmp_path):
+    store = DataStore(tmp_path, segment_max_bytes=200)
+    store.add_raw_documents([_doc("https://a", "2025-02-01T01:00:00Z"), _doc("https://b", "2025-02-01T02:00:00Z")])
+    store.add_raw_documents([_doc("https://c", "2025-02-01T03:00:00Z")])
+    store.add_raw_documents([_doc("https://d", "2025-02-02T01:00:00Z")])
+    assert store.add_raw_documents([_doc("https://a", "2025-02-03T00:00:00Z")]) == 0
+
+    manifest = json.loads((tmp_path / "raw" / "manifest.json").read_text())
+    assert [segment["urls"] for segment in manifest["segments"]] == [2, 1, 1]
+    assert manifest["segments"][2]["min_time"] == "2025-02-02T01:00:00Z"
+    assert not (tmp_path / "raw.jsonl").exists()
+
+    opened: list[str] = []
+    original = DataStore._iter_lines
+
+    def tracking(self, paths, skip=None):
+        paths = list(paths)
+        opened.extend(path.name for path in paths)
+        return original(self, paths, skip)
+
+    reopened = DataStore(tmp_path)
+    reopened._iter_lines = tracking.__get__(reopened)
+    recent = [doc.url for doc in reopened.iter_raw_documents(since="2025-02-02T00:00:00Z")]
+    assert recent == ["https://d"]
+    assert opened == ["seg-000003.jsonl"]
+
+
+def test_compact_merges_segments_and_drops_superseded_rows(tmp_path):
+    store = DataStore(tmp_path, segment_max_bytes=120)
+    for idx in range(4):
+        store.add_raw_documents([_doc(f"https://{idx}", "2025-02-01T00:00:00Z")])
+    first_segment = tmp_path / "raw" / "seg-000001.jsonl"
+    with (tmp_path / "raw" / "seg-000004.jsonl").open("a", encoding="utf-8") as f:
+        f.write(json.dumps({"url": "https://0", "title": "newer", "content": "", "fetched_at": "2025-02-01T05:00:00Z"}) + "\n")
+
+    result = DataStore(tmp_path, segment_max_bytes=10_000).compact()
+
+    assert result["raw"] == {"rows_before": 5, "rows_after": 4, "evicted": 0, "segments": 1}
+    assert not first_segment.exists()
+    docs = list(DataStore(tmp_path).iter_raw_documents())
+    assert [doc.url for doc in docs] == ["https://1", "https://2", "https://3", "https://0"]
+    assert docs[-1].title == "newer"
+    assert DataStore(tmp_path).add_raw_documents([_doc("https://2", "2025-02-01T00:00:00Z")]) == 0
+
+
+def test_compact_converts_single_file_collections(tmp_path):
+    store = DataStore(tmp_path)
+    store.add_raw_documents([_doc("https://a", "2025-02-01T00:00:00Z"), _doc("https://b", "2025-02-02T00:00:00Z")])
+
+    store.compact(segmented=True)
+
+    assert not (tmp_path / "raw.jsonl").exists()
+    assert len(json.loads((tmp_path / "raw" / "manifest.json").read_text())["segments"]) == 2
+    assert [doc.url for doc in DataStore(tmp_path).iter_raw_documents()] == ["https://a", "https://b"]
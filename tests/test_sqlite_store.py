@@ -0,0 +1,54 @@
+import json
+
+from src.storage.data_store import DataStore, RawDocument, Summary, open_data_store
+from src.storage.sqlite_store import SQLiteDataStore, migrate_jsonl_to_sqlite
+
+
+def _doc(url: str, title: str = "t") -> RawDocument:
+    return RawDocument(url=url, title=title, content="c", fetched_at="2025-02-10T00:00:00Z", channel="docs")
+
+
+def test_sqlite_store_deduplicates_and_preserves_order(tmp_path):
+    store = SQLiteDataStore(tmp_path, batch_size=2)
+
+    assert store.add_raw_documents([_doc("https://a"), _doc("https://b"), _doc("https://a")]) == 2
+    assert store.add_raw_documents([_doc("https://c"), _doc("https://b")]) == 1
+    assert [doc.url for doc in store.load_raw_documents()] == ["https://a", "https://b", "https://c"]
+
+    store.add_summaries([Summary(url="https://a", bullet_points=["要点"], summarized_at="now")])
+    assert store.load_summaries()[0].bullet_points == ["要点"]
+    assert list(store.get_many(["https://c", "https://a", "https://x"], collection="raw")) == ["https://c", "https://a"]
+    assert store.get_document("https://a", collection="summary").bullet_points == ["要点"]
+    store.close()
+
+
+def test_migrate_jsonl_to_sqlite_and_engine_detection(tmp_path):
+    jsonl_store = DataStore(tmp_path)
+    jsonl_store.add_raw_documents([_doc("https://a"), _doc("https://b")])
+    jsonl_store.add_summaries([Summary(url="https://a", bullet_points=["p"], summarized_at="now")])
+    assert open_data_store(tmp_path).engine == "jsonl"
+
+    counts = migrate_jsonl_to_sqlite(tmp_path)
+    assert counts == {"raw": 2, "normalized": 0, "summaries": 1}
+    assert migrate_jsonl_to_sqlite(tmp_path)["raw"] == 0
+
+    store = open_data_store(tmp_path)
+    assert store.engine == "sqlite"
+    assert [doc.url for doc in store.load_raw_documents()] == ["https://a", "https://b"]
+    assert json.loads((tmp_path / "raw.jsonl").read_text().splitlines()[0])["url"] == "https://a"
+    store.close()
+
+
+def test_sqlite_upserts_bump_version_on_content_change(tmp_path):
+    store = SQLiteDataStore(tmp_path)
+    store.add_raw_documents([_doc("https://a"), _doc("https://b")])
+
+    changed = RawDocument(url="https://a", title="t", content="new", fetched_at="2025-02-12T00:00:00Z", channel="docs")
+    assert store.add_raw_documents([_doc("https://a")]) == 0
+    assert store.add_raw_documents([changed]) == 1
+
+    assert store.get_document("https://a", collection="raw").content == "new"
+    assert [doc.url for doc in store.changed_since("2025-02-11T00:00:00Z", collection="raw")] == ["https://a"]
+    versions = dict(store._conn.execute("SELECT url, version FROM raw_documents"))
+    assert versions == {"https://a": 2, "https://b": 1}
+    store.close()
@@ -0,0 +1,120 @@
+import json
+import threading
+
+from src.storage import url_index
+from src.storage.data_store import DataStore, RawDocument
+from src.storage.url_index import UrlIndex
+
+
+def _doc(url: str) -> RawDocument:
+    return RawDocument(url=url, title="t", content="c", fetched_at="now")
+
+
+def test_index_tracks_appends_and_merges_tail(tmp_path, monkeypatch):
+    monkeypatch.setattr(url_index, "MIN_TAIL_RECORDS", 2)
+    store = DataStore(tmp_path)
+    for idx in range(10):
+        assert store.add_raw_documents([_doc(f"https://example.com/{idx}")]) == 1
+
+    assert store.add_raw_documents([_doc("https://example.com/3"), _doc("https://example.com/new")]) == 1
+    index = UrlIndex(store.raw_file)
+    found = index.find_many(["https://example.com/0", "https://example.com/9", "https://missing"])
+    assert set(found) == {"https://example.com/0", "https://example.com/9"}
+    with store.raw_file.open("rb") as f:
+        f.seek(found["https://example.com/9"][0])
+        assert json.loads(f.readline())["url"] == "https://example.com/9"
+
+
+def test_index_catches_up_and_rebuilds_after_external_writes(tmp_path):
+    store = DataStore(tmp_path)
+    store.add_raw_documents([_doc("https://a")])
+    with store.raw_file.open("a", encoding="utf-8") as f:
+        f.write(json.dumps({"url": "https://b", "title": "", "content": "c", "fetched_at": ""}) + "\n")
+    assert store.add_raw_documents([_doc("https://b")]) == 0
+
+    store.raw_file.write_text(json.dumps({"url": "https://c"}) + "\n")
+    assert set(UrlIndex(store.raw_file).find_many(["https://a", "https://c"])) == {"https://c"}
+
+
+def test_hash_collisions_fall_back_to_exact_url_check(tmp_path, monkeypatch):
+    monkeypatch.setattr(url_index, "url_hash", lambda url: 42)
+    store = DataStore(tmp_path)
+
+    assert store.add_raw_documents([_doc("https://a")]) == 1
+    assert store.add_raw_documents([_doc("https://b"), _doc("https://a")]) == 1
+    assert [doc.url for doc in store.iter_raw_documents()] == ["https://a", "https://b"]
+
+
+def test_get_many_reads_latest_rows_across_segments(tmp_path):
+    store = DataStore(tmp_path, segment_max_bytes=10)
+    store.add_raw_documents([_doc("https://a"), _doc("https://b")])
+    store.add_raw_documents([_doc("https://c")])
+    with (tmp_path / "raw" / "seg-000002.jsonl").open("a", encoding="utf-8") as f:
+        f.write(json.dumps({"url": "https://a", "title": "refetched", "content": "", "fetched_at": "later"}) + "\n")
+
+    found = store.get_many(["https://c", "https://missing", "https://a"], collection="raw")
+
+    assert list(found) == ["https://c", "https://a"]
+    assert found["https://a"].title == "refetched"
+    assert store.get_document("https://b", collection="raw").url == "https://b"
+    assert store.get_document("https://b") is None
+
+
+def test_readers_and_a_writer_share_the_index(tmp_path, monkeypatch):
+    monkeypatch.setattr(url_index, "MIN_TAIL_RECORDS", 2)
+    store = DataStore(tmp_path)
+    errors = []
+    done = threading.Event()
+
+    def write():
+        try:
+            for idx in range(150):
+                store.add_raw_documents([_doc(f"https://example.com/{idx}")])
+        except Exception as exc:  # noqa: BLE001 - surfaced by the assertion below
+            errors.append(exc)
+        finally:
+            done.set()
+
+    def read():
+        try:
+            while not done.is_set():
+                store.get_document("https://example.com/0", "raw")
+                sum(1 for _ in store.iter_raw_documents())
+        except Exception as exc:  # noqa: BLE001 - surfaced by the assertion below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=write)] + [threading.Thread(target=read) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    found = store.get_many([f"https://example.com/{idx}" for idx in range(150)], "raw")
+    assert len(found) == 150
+
+
+def test_writers_record_superseded_rows_so_readers_skip_the_scan(tmp_path, monkeypatch):
+    store = DataStore(tmp_path, segment_max_bytes=10)
+    store.add_raw_documents([_doc("https://a"), _doc("https://b")])
+    changed = RawDocument(url="https://a", title="t", content="changed", fetched_at="now")
+    store.add_raw_documents([changed, _doc("https://c")])
+
+    def no_rescan(indexes):
+        raise AssertionError("superseded rows were rescanned")
+
+    monkeypatch.setattr(url_index, "_rescan_superseded", no_rescan)
+    docs = {doc.url: doc.content for doc in store.iter_raw_documents()}
+    assert docs == {"https://a": "changed", "https://b": "c", "https://c": "c"}
+    assert UrlIndex(tmp_path / "raw" / "seg-000001.jsonl").superseded() == {0}
+
+
+def test_rows_from_outside_writers_are_rescanned_once(tmp_path, monkeypatch):
+    store = DataStore(tmp_path)
+    store.add_raw_documents([_doc("https://a"), _doc("https://b")])
+    with store.raw_file.open("a", encoding="utf-8") as f:
+        f.write(json.dumps({"url": "https://a", "title": "", "content": "external", "fetched_at": ""}) + "\n")
+
+    assert {doc.url: doc.content for doc in store.iter_raw_documents()} == {"https://a": "external", "https://b": "c"}
+    monkeypatch.setattr(url_index, "_rescan_superseded", None)
+    assert [doc.url for doc in store.iter_raw_documents()] == ["https://b", "https://a"]
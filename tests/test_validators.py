@@ -0,0 +1,86 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.collect.fetch_strategy import FetchStrategy
+from src.collect.validators import ValidatorCache
+from src.collect.web_scraper import FetchContext, fetch_documents
+
+ETAG = '"v1"'
+LAST_MODIFIED = "Mon, 05 Oct 2026 08:00:00 GMT"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    requests = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        type(self).requests.append((self.path, self.headers.get("If-None-Match"), self.headers.get("If-Modified-Since")))
+        if self.path == "/etag" and self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+        if self.path == "/dated" and self.headers.get("If-Modified-Since") == LAST_MODIFIED:
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = f"<html><title>{self.path}</title><body>content</body></html>".encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        if self.path == "/etag":
+            self.send_header("ETag", ETAG)
+        elif self.path == "/dated":
+            self.send_header("Last-Modified", LAST_MODIFIED)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture()
+def server():
+    _Handler.requests = []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.mark.parametrize("engine", ["thread", "async"])
+def test_second_fetch_is_conditional_and_skips_unchanged(server, tmp_path, engine):
+    strategy = FetchStrategy(timeout=5.0, max_retries=1, per_request_delay=0.0, engine=engine)
+    urls = [f"{server}/etag", f"{server}/dated", f"{server}/plain"]
+
+    validators = ValidatorCache.for_data_dir(tmp_path)
+    first = fetch_documents(urls, strategy=strategy, context=FetchContext(validators=validators))
+    validators.save()
+    assert [doc.url for doc in first] == urls
+    assert validators.not_modified == 0
+
+    _Handler.requests = []
+    reloaded = ValidatorCache.for_data_dir(tmp_path)
+    second = fetch_documents(urls, strategy=strategy, context=FetchContext(validators=reloaded))
+
+    assert [doc.url for doc in second] == [f"{server}/plain"]
+    assert reloaded.not_modified == 2
+    sent = {path: (etag, since) for path, etag, since in _Handler.requests}
+    assert sent == {"/etag": (ETAG, None), "/dated": (None, LAST_MODIFIED), "/plain": (None, None)}
+
+
+def test_forget_forces_a_full_fetch(server, tmp_path):
+    strategy = FetchStrategy(timeout=5.0, max_retries=0, per_request_delay=0.0)
+    url = f"{server}/etag"
+    validators = ValidatorCache.for_data_dir(tmp_path)
+    fetch_documents([url], strategy=strategy, context=FetchContext(validators=validators))
+    assert validators.request_headers(url) == {"If-None-Match": ETAG}
+
+    validators.forget([url])
+
+    assert validators.request_headers(url) == {}
+    assert [doc.url for doc in fetch_documents([url], strategy=strategy, context=FetchContext(validators=validators))] == [url]
@@ -0,0 +1,70 @@
+import threading
+
+import pytest
+
+from src.storage.data_store import DataStore, RawDocument
+from src.storage.sqlite_store import SQLiteDataStore
+from src.storage.writer import StoreWriter
+
+
+def _doc(url: str) -> RawDocument:
+    return RawDocument(url=url, title="t", content="c", fetched_at="2025-02-10T00:00:00Z", channel="docs")
+
+
+@pytest.mark.parametrize("segment_max_bytes", [None, 512])
+def test_concurrent_stores_share_data_dir_without_duplicates(tmp_path, segment_max_bytes):
+    urls = [f"https://example.com/{i}" for i in range(60)]
+    errors = []
+
+    def write(offset: int) -> None:
+        store = DataStore(tmp_path, segment_max_bytes=segment_max_bytes)
+        rotated = urls[offset:] + urls[:offset]
+        try:
+            for start in range(0, len(rotated), 7):
+                store.add_raw_documents(_doc(url) for url in rotated[start : start + 7])
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=write, args=(offset,)) for offset in (0, 15, 30, 45)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    stored = [doc.url for doc in DataStore(tmp_path).iter_raw_documents()]
+    assert sorted(stored) == sorted(urls)
+
+
+@pytest.mark.parametrize("engine", ["jsonl", "sqlite"])
+def test_store_writer_merges_batches_from_producers(tmp_path, engine):
+    store = DataStore(tmp_path) if engine == "jsonl" else SQLiteDataStore(tmp_path)
+    writer = StoreWriter(store)
+
+    def produce(worker: int) -> None:
+        for i in range(10):
+            writer.add_raw_documents([_doc(f"https://example.com/{worker}/{i}"), _doc("https://example.com/shared")])
+
+    threads = [threading.Thread(target=produce, args=(worker,)) for worker in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    writer.flush()
+    assert len(list(store.iter_raw_documents())) == 41
+
+    assert writer.close() == {"raw": 41, "normalized": 0, "summary": 0}
+    with pytest.raises(RuntimeError):
+        writer.add_raw_documents([_doc("https://late")])
+
+
+def test_store_writer_reports_store_errors(tmp_path):
+    class Broken:
+        def add_raw_documents(self, docs, fsync=False):
+            raise OSError("disk full")
+
+    writer = StoreWriter(Broken())
+    writer.add_raw_documents([_doc("https://a")])
+    with pytest.raises(OSError):
+        writer.flush()
+    writer.close()